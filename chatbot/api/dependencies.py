@@ -38,6 +38,7 @@ _reasoning_llm_client: Optional[GroqClient] = None  # Reasoning model for comple
 _vector_store: Optional[Chroma] = None
 _intent_router: Optional[IntentRouter] = None
 _ctx_synthesis_strategy: Optional[BaseSynthesisStrategy] = None
+_semantic_cache = None
 
 
 def clear_vector_store_cache():
@@ -420,3 +421,42 @@ def get_ctx_synthesis_strategy(
         logger.info(f"✅ Context synthesis strategy '{strategy_name}' initialized")
     
     return _ctx_synthesis_strategy
+
+
+def get_semantic_cache():
+    """
+    Get or initialize the semantic answer cache (cached).
+
+    Disabled unless SEMANTIC_CACHE_SIZE is set to a positive number of entries. Questions are embedded with the
+    vector store's embedding model and the cache is persisted to SEMANTIC_CACHE_PATH (if set) on shutdown.
+
+    Returns:
+        SemanticCache instance, or None if the cache is disabled or could not be initialized
+    """
+    global _semantic_cache
+
+    max_entries = int(os.getenv("SEMANTIC_CACHE_SIZE", "0"))
+    if max_entries <= 0:
+        return None
+    if _semantic_cache is None:
+        try:
+            from bot.memory.semantic_cache import SemanticCache
+
+            _semantic_cache = SemanticCache(
+                embed=get_vector_store().embedding.embed_query,
+                threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")),
+                max_entries=max_entries,
+                path=os.getenv("SEMANTIC_CACHE_PATH") or None,
+            )
+            logger.info(f"✅ Semantic cache initialized ({max_entries} entries)")
+        except Exception as e:
+            logger.warning(f"Could not initialize semantic cache: {e}")
+            return None
+
+    return _semantic_cache
+
+
+def save_semantic_cache():
+    """Persist the semantic cache if it has been initialized."""
+    if _semantic_cache is not None:
+        _semantic_cache.save()
@@ -1,19 +1,22 @@
 """FastAPI application for RAG chatbot API."""
 
+import gc
 import os
 import re
 import json
 from pathlib import Path
-from typing import List, Optional, Dict, Any, TYPE_CHECKING
+from typing import List, Optional, Dict, Any, AsyncIterator, Sequence, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from entities.document import Document
 
 from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import iterate_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, FileResponse, Response, StreamingResponse
+from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse, Response, StreamingResponse
 import asyncio
+from contextlib import asynccontextmanager
 
 import sys
 from pathlib import Path
@@ -23,6 +26,8 @@ chatbot_dir = Path(__file__).parent.parent
 if str(chatbot_dir) not in sys.path:
     sys.path.insert(0, str(chatbot_dir))
 
+from bot.client.groq_client import GroqClient, GroqThrottledError
+from bot.conversation.chat_history import ChatHistory
 from bot.conversation.conversation_handler import answer_with_context, refine_question, extract_content_after_reasoning
 from bot.conversation.intent_router import IntentType
 from bot.conversation.refinement_handler import get_refinement_handler
@@ -43,17 +48,22 @@ from bot.conversation.fallback_handler import get_fallback_handler
 from bot.conversation.cottage_registry import get_cottage_registry
 from bot.conversation.query_complexity import get_complexity_classifier
 from bot.client.prompt import generate_slot_question_prompt
-from helpers.log import get_logger
+from helpers.log import SampledTracebackFilter, get_logger
 from helpers.prettier import prettify_source
 
 # Speech modules
 from speech import GroqSTT, GroqTTS, VoiceActivityDetector
 from entities.document import Document
 import tempfile
-import base64
 import asyncio
 import httpx
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - SSE frames fall back to the standard library encoder
+    orjson = None
+
 from .models import (
     ChatRequest,
     ChatResponse,
@@ -75,10 +85,71 @@ from .dependencies import (
     is_query_optimization_enabled,
     is_intent_filtering_enabled,
     clear_vector_store_cache,
+    get_semantic_cache,
+    save_semantic_cache,
 )
 
 logger = get_logger(__name__)
 
+# Per-turn voice errors repeat under upstream failures, so only a sample of them keep their traceback
+voice_logger = get_logger(f"{__name__}.voice")
+voice_logger.addFilter(SampledTracebackFilter(rate=100))
+
+
+def _sse_event(payload: Dict[str, Any]) -> bytes:
+    """
+    Encode a payload as a server-sent event frame.
+
+    Frames are returned as bytes so StreamingResponse can write them without re-encoding; orjson is
+    used when available since the token frames are encoded once per streamed chunk.
+    """
+    if orjson is not None:
+        return b"data: " + orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) + b"\n\n"
+    return b"data: " + json.dumps(payload).encode("utf-8") + b"\n\n"
+
+
+async def _aiter_tokens(streamer) -> AsyncIterator[Any]:
+    """
+    Iterate an answer streamer without blocking the event loop.
+
+    Async streamers (AsyncGroq) are read with `async for`; sync ones (the sync Groq and llama.cpp streamers)
+    are advanced in a worker thread, so their network or inference waits don't stall other requests.
+    """
+    if hasattr(streamer, "__aiter__"):
+        async for token in streamer:
+            yield token
+    else:
+        async for token in iterate_in_threadpool(streamer):
+            yield token
+
+
+def _dumps_json_text(payload: Dict[str, Any]) -> str:
+    """Serialize a payload to a compact JSON string, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can catch the latter either way
+_loads_json = orjson.loads if orjson is not None else json.loads
+
+
+async def _send_json(websocket: WebSocket, payload: Dict[str, Any]) -> None:
+    """
+    Send a JSON message as a websocket text frame.
+
+    Same wire format as `WebSocket.send_json`, but encoded with orjson when available. Messages must
+    stay text frames since the widget treats binary frames as audio.
+    """
+    await websocket.send_text(_dumps_json_text(payload))
+
+
+# Constant SSE frames, encoded once
+_SSE_DONE_NO_SOURCES = _sse_event({"type": "done", "sources": []})
+_SSE_TYPING = _sse_event({"type": "typing", "message": "Bot is typing..."})
+_SSE_SEARCHING = _sse_event({"type": "searching", "message": "Searching knowledge base..."})
+_SSE_HIDE_SEARCHING = _sse_event({"type": "hide_searching"})
+
 
 def generate_follow_up_actions(
     intent: IntentType,
@@ -645,11 +716,65 @@ def load_env():
 
 load_env()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build the STT and TTS modules once at startup and share them across voice websocket connections.
+
+    Constructing them per connection recreates the Groq clients on every reconnect. If a module cannot be
+    built here (e.g. missing API key), it is left as None and the websocket handler constructs it on demand
+    so the error is reported to that client. The VAD keeps per-speaker RMS history, so each connection
+    builds its own; building one here only loads the Silero model, which all detectors share.
+    """
+    for name, factory in (("stt", GroqSTT), ("tts", GroqTTS)):
+        try:
+            setattr(app.state, name, factory())
+        except Exception as e:
+            logger.warning(f"Could not initialize {factory.__name__} at startup: {e}")
+            setattr(app.state, name, None)
+    try:
+        VoiceActivityDetector()
+    except Exception as e:
+        logger.warning(f"Could not load the VAD model at startup: {e}")
+    # One pooled HTTP client for the voice loop's calls into the streaming chat endpoint, so each turn
+    # reuses a keep-alive connection instead of opening a new one
+    app.state.http = httpx.AsyncClient(
+        timeout=120.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    )
+    # Warm the Groq connection pools in the background so the first user request skips the TLS handshake
+    warm_up = asyncio.create_task(_warm_up_llm_clients())
+    # Move everything allocated during import and startup into the permanent generation so the
+    # cyclic GC no longer rescans it on every collection
+    gc.freeze()
+    try:
+        yield
+    finally:
+        warm_up.cancel()
+        await app.state.http.aclose()
+        save_semantic_cache()
+
+
+async def _warm_up_llm_clients() -> None:
+    """Create the cached LLM clients and open their Groq connections before the first request."""
+    clients = []
+    for factory in (get_fast_llm_client, get_reasoning_llm_client):
+        try:
+            clients.append(factory())
+        except Exception as e:
+            logger.warning(f"Could not initialize LLM client at startup: {e}")
+    await asyncio.gather(*(client.warm_up() for client in clients if isinstance(client, GroqClient)))
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="RAG Chatbot API",
     description="API for Swiss Cottages RAG Chatbot",
     version="1.0.0",
+    lifespan=lifespan,
+    # orjson serializes large answers/sources payloads several times faster than the stdlib encoder
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
 )
 
 # CORS configuration
@@ -971,9 +1096,20 @@ def get_cottage_images(cottage_number: str, root_folder: Path, max_images: int =
     return get_cottage_images_by_type(cottage_number, root_folder, image_type=None, max_images=max_images)
 
 
-def validate_and_fix_currency(answer: str, context: str = "") -> str:
+_DOLLAR_PRICE_RE = re.compile(r'\$(\d+(?:,\d+)?)')
+_DOLLAR_PRICE_PHRASE_RE = re.compile(r'\$(\d+(?:,\d+)?)\s+(?:for|per)')
+# Patterns: "8-12 lac PKR", "8 lac PKR", "800,000-1,200,000 PKR", "approximately 8-12 lac"
+_LAC_CONVERSION_RES = [
+    re.compile(r'(\d+)\s*-\s*(\d+)\s*(?:lac|lakh)\s*PKR', re.IGNORECASE),
+    re.compile(r'(\d+)\s*(?:lac|lakh)\s*PKR', re.IGNORECASE),
+    re.compile(r'(\d{1,3}(?:,\d{3}){2,})\s*-\s*(\d{1,3}(?:,\d{3}){2,})\s*PKR', re.IGNORECASE),  # 800,000-1,200,000 PKR
+    re.compile(r'approximately\s*(\d+)\s*-\s*(\d+)\s*(?:lac|lakh)', re.IGNORECASE),
+]
+
+
+def validate_and_fix_currency(answer: str) -> str:
     """
-    Validate that answer doesn't contain dollar prices when context has PKR prices.
+    Validate that answer doesn't contain dollar prices, since all prices are in PKR.
     Also detect and fix incorrect lac/lakh conversions.
     If dollar prices are found, convert them to PKR or remove them.
     """
@@ -983,8 +1119,7 @@ def validate_and_fix_currency(answer: str, context: str = "") -> str:
     converted_answer = answer
     
     # Check if answer contains dollar prices
-    dollar_pattern = r'\$(\d+(?:,\d+)?)'
-    dollar_matches = re.findall(dollar_pattern, answer)
+    dollar_matches = _DOLLAR_PRICE_RE.findall(answer)
     
     if dollar_matches:
         logger.error(
@@ -1007,24 +1142,14 @@ def validate_and_fix_currency(answer: str, context: str = "") -> str:
         
         # Also check for common dollar price patterns and replace
         # Pattern: "$400 for a weekday" -> "PKR 120,000 for a weekday"
-        converted_answer = re.sub(
-            r'\$(\d+(?:,\d+)?)\s+(?:for|per)',
+        converted_answer = _DOLLAR_PRICE_PHRASE_RE.sub(
             lambda m: f"PKR {int(m.group(1).replace(',', '')) * 300:,} ",
             converted_answer
         )
     
     # Check for lac/lakh conversions (WRONG - should use exact PKR values)
-    # Patterns: "8-12 lac PKR", "8 lac PKR", "800,000-1,200,000 PKR", "approximately 8-12 lac"
-    lac_patterns = [
-        r'(\d+)\s*-\s*(\d+)\s*(?:lac|lakh)\s*PKR',
-        r'(\d+)\s*(?:lac|lakh)\s*PKR',
-        r'(\d{1,3}(?:,\d{3}){2,})\s*-\s*(\d{1,3}(?:,\d{3}){2,})\s*PKR',  # 800,000-1,200,000 PKR
-        r'approximately\s*(\d+)\s*-\s*(\d+)\s*(?:lac|lakh)',
-    ]
-    
-    for pattern in lac_patterns:
-        matches = re.finditer(pattern, converted_answer, re.IGNORECASE)
-        for match in matches:
+    for pattern in _LAC_CONVERSION_RES:
+        for match in pattern.finditer(converted_answer):
             logger.error(
                 f"⚠️ CRITICAL: Answer contains lac/lakh conversion: '{match.group(0)}'\n"
                 f"This is WRONG - should use exact PKR values from context (e.g., PKR 32,000, PKR 38,000)\n"
@@ -1277,6 +1402,167 @@ def fix_incorrect_location_mentions(answer: str) -> str:
     return fixed_answer
 
 
+# Patterns used by clean_answer_text, compiled once at import instead of on every answer
+# Large reasoning blocks that span multiple lines, e.g. "We have the opportunity to refine..." with all its content
+_LARGE_REASONING_BLOCKS = [
+    # Pattern for "We have the opportunity to refine..." through "The refined answer remains..."
+    # Matches: "We have the opportunity..." + separator + "answer: ..." + separator + "Since the original query..." + "The refined answer remains..."
+    r"We have the opportunity to refine.*?(?:[-=]{3,}.*?)?(?:answer:.*?)?(?:[-=]{3,}.*?)?(?:Since the original query.*?)?(?:The refined answer (?:remains|is).*?\.?)\s*",
+    # Pattern for "To refine the existing answer..." through end
+    r"To refine the existing answer.*?(?:[-=]{3,}.*?)?(?:answer:.*?)?(?:[-=]{3,}.*?)?(?:Since.*?)?(?:The refined answer.*?\.?)\s*",
+    # Pattern for "Based on the existing answer and the new context..." through end
+    r"Based on the existing answer and the new context.*?(?:[-=]{3,}.*?)?(?:answer:.*?)?(?:[-=]{3,}.*?)?(?:Since.*?)?(?:The refined answer.*?\.?)\s*",
+    # Pattern for "Based on the context information provided above..." through end
+    r"Based on the context information provided above.*?(?:[-=]{3,}.*?)?(?:answer:.*?)?(?:[-=]{3,}.*?)?(?:The refined answer (?:remains|is).*?\.?)\s*",
+    # Pattern for "Considering..." through end
+    r"Considering.*?the refined answer.*?(?:[-=]{3,}.*?)?(?:answer:.*?)?(?:[-=]{3,}.*?)?(?:Since.*?)?(?:The refined answer.*?\.?)\s*",
+    # Pattern for "Since the original query is as follows:" through "The refined answer remains..."
+    r"Since the original query is as follows:.*?The refined answer (?:remains|is).*?\.?\s*",
+    # Pattern for separator lines with "answer:" in between (catches standalone answer blocks)
+    r"[-=]{3,}\s*answer:\s*.*?[-=]{3,}\s*",
+    # Pattern for "The refined answer remains the same" or similar endings
+    r"The refined answer (?:remains the same|is the same|remains unchanged).*?\.?\s*",
+    # Pattern for "Thank you for the additional context. I've refined the answer..." through "Here are..."
+    r"Thank you for the additional context\.\s*I've refined the answer.*?(?:Here are|Here is|The answer is|The facilities are|The amenities are)",
+    # Pattern for "I've refined the answer to provide more accurate information..."
+    r"I've refined the answer to provide more accurate information\.\s*(?:Since.*?limited.*?I'll stick to.*?\.\s*)?(?:Here are|Here is|The answer is)",
+    # Pattern for "Since specific details about X are limited, I'll stick to..."
+    r"Since specific details about.*?are limited.*?I'll stick to.*?\.\s*(?:Here are|Here is)",
+]
+_LARGE_REASONING_BLOCK_RES = [re.compile(p, re.IGNORECASE | re.DOTALL | re.MULTILINE) for p in _LARGE_REASONING_BLOCKS]
+
+_ANSWER_EXTRACTION_PATTERNS = [
+    # Pattern 1: Full block with separators
+    r"We have the opportunity to refine.*?[-=]{3,}\s*answer:\s*(.*?)\s*[-=]{3,}.*?Since the original query.*?The refined answer.*?\.?\s*",
+    # Pattern 2: Without "Since the original query" part
+    r"We have the opportunity to refine.*?[-=]{3,}\s*answer:\s*(.*?)\s*[-=]{3,}.*?The refined answer.*?\.?\s*",
+    # Pattern 3: More flexible - any "answer:" in reasoning block
+    r"(?:We have the opportunity|To refine|Based on the existing answer).*?answer:\s*(.*?)(?:[-=]{3,}.*?)?(?:Since.*?)?(?:The refined answer.*?\.?)\s*",
+]
+_ANSWER_EXTRACTION_RES = [re.compile(p, re.IGNORECASE | re.DOTALL) for p in _ANSWER_EXTRACTION_PATTERNS]
+
+_REASONING_PATTERNS = [
+    r"^.*?Let me (think|check|analyze|search|find|look|reason|consider).*?\n",
+    r"^.*?I (need|should|will|can|must) (think|check|analyze|search|find|look|reason|consider).*?\n",
+    r"^.*?Based on.*?context.*?\n",
+    r"^.*?According to.*?context.*?\n",
+    r"^.*?Looking at.*?context.*?\n",
+    r"^.*?From the.*?context.*?\n",
+    r"^.*?The context.*?shows.*?\n",
+    r"^.*?In the.*?context.*?\n",
+    r"^.*?Thinking.*?\n",
+    r"^.*?Analyzing.*?\n",
+    r"^.*?Reasoning.*?\n",
+    r"^.*?Step \d+.*?\n",
+    r"^.*?First.*?then.*?\n",
+    r"However, there seems to be missing context.*?\.\s*",
+    r"Since the original context is now provided.*?\.\s*",
+    r"The new context is as follows:.*?---\s*",
+    r"Since the question and the answer already match.*?\.\s*",
+    r"Therefore, I'll leave the answer as it is\.\s*",
+    r"Refined Answer:\s*",
+    r"Refined answer:\s*",
+    r"Answer:\s*",
+    r"Based on the provided context.*?\.\s*",
+    r"Given the context.*?\.\s*",
+    r"Based on the existing answer and the new context.*?\.\s*",
+    r"We have the opportunity to refine.*?\.\s*",
+    r"To refine the existing answer.*?\.\s*",
+    r"Considering.*?the refined answer.*?\.\s*",
+    # Specific patterns from user examples
+    r"Based on the context information provided above.*?\.\s*",
+    r"Based on the context information provided above.*?:\s*",
+    r"We have the opportunity to refine the existing answer with.*?\.\s*",
+    r"We have the opportunity to refine the existing answer with.*?:\s*",
+    r"The refined answer is:?\s*",
+    r"The refined answer remains:?\s*",
+    r"Based on the context information provided above, the refined answer is:?\s*",
+    r"Based on the context information provided above, the refined answer remains:?\s*",
+    # Patterns for "Thank you for the additional context" reasoning
+    r"^Thank you for the additional context\.\s*I've refined the answer.*?\.\s*",
+    r"^I've refined the answer to provide more accurate information\.\s*",
+    r"^Since specific details about.*?are limited.*?I'll stick to.*?\.\s*",
+]
+_REASONING_LINE_RES = [re.compile(p, re.IGNORECASE | re.DOTALL) for p in _REASONING_PATTERNS]
+
+_TEMPLATE_START_PATTERNS = [
+    r"^⚠️\s*GENERAL.*?\n",
+    r"^⚠️\s*⚠️\s*⚠️.*?\n",
+    r"^🚨\s*🚨\s*🚨.*?\n",
+    r"^GENERAL PRICING QUERY DETECTED.*?\n",
+]
+_TEMPLATE_START_RES = [re.compile(p, re.IGNORECASE | re.MULTILINE) for p in _TEMPLATE_START_PATTERNS]
+
+# Markers indicating a pricing/capacity template has ended and the real answer begins
+_ANSWER_START_MARKERS = [
+    r"For \d+ nights?",
+    r"The total cost",
+    r"Total cost",
+    r"For cottage",
+    r"Cottage \d+",
+    r"PKR \d+",
+    r"pricing for",
+    r"cost is",
+]
+_ANSWER_START_MARKER_RES = [re.compile(p, re.IGNORECASE) for p in _ANSWER_START_MARKERS]
+
+_PRICING_TEMPLATE_PATTERNS = [
+    r"🚨\s*CRITICAL PRICING INFORMATION.*?⚠️\s*MANDATORY INSTRUCTIONS FOR LLM.*?(?=\n\n|\Z)",
+    r"STRUCTURED PRICING ANALYSIS FOR COTTAGE.*?⚠️\s*MANDATORY INSTRUCTIONS FOR LLM.*?(?=\n\n|\Z)",
+    r"ALL PRICES ARE IN PKR.*?⚠️\s*MANDATORY INSTRUCTIONS FOR LLM.*?(?=\n\n|\Z)",
+    r"⚠️\s*MANDATORY INSTRUCTIONS FOR LLM.*?(?=\n\n|\Z)",
+    r"You MUST use ONLY these PKR prices.*?(?=\n\n|\Z)",
+    r"DO NOT convert to dollars.*?(?=\n\n|\Z)",
+    r"Your answer MUST include.*?Total cost.*?(?=\n\n|\Z)",
+    r"🎯\s*TOTAL COST FOR.*?🎯\s*",
+    # Capacity analysis templates
+    r"STRUCTURED CAPACITY ANALYSIS.*?DIRECT ANSWER.*?(?=\n\n|\Z)",
+    r"CRITICAL CAPACITY INFORMATION.*?YOU MUST include.*?(?=\n\n|\Z)",
+    r"CRITICAL CAPACITY INFORMATION FOR COTTAGE.*?YOU MUST include.*?(?=\n\n|\Z)",
+]
+_PRICING_TEMPLATE_RES = [re.compile(p, re.IGNORECASE | re.DOTALL | re.MULTILINE) for p in _PRICING_TEMPLATE_PATTERNS]
+
+_START_REASONING_PATTERNS = [
+    r"^(?:We have the opportunity to refine|Based on the context information provided above|Based on the provided context|Given the context|Since the original query).*?:\s*",
+    r"^(?:The refined answer is|The refined answer remains|Refined Answer|Answer):\s*",
+]
+_START_REASONING_RES = [re.compile(p, re.IGNORECASE | re.MULTILINE) for p in _START_REASONING_PATTERNS]
+
+_PLACEHOLDER_URL_PATTERNS = [
+    r"https?://(www\.)?example\.com[^\s\)]*",  # example.com URLs
+    r"https?://example\.com[^\s\)]*",  # example.com without www
+    r"https?://(www\.)?example\.org[^\s\)]*",  # example.org URLs
+    r"https?://(www\.)?placeholder\.com[^\s\)]*",  # placeholder.com URLs
+    r"https?://(www\.)?test\.com[^\s\)]*",  # test.com URLs
+    r"https?://(www\.)?sample\.com[^\s\)]*",  # sample.com URLs
+]
+_PLACEHOLDER_URL_RES = [re.compile(p, re.IGNORECASE) for p in _PLACEHOLDER_URL_PATTERNS]
+
+_PLACEHOLDER_TEXT_PATTERNS = [
+    r"^Take a look at our photo gallery:\s*$",
+    r"^Visit our photo gallery:\s*$",
+    r"^Check out our photo gallery:\s*$",
+    r"^See our photo gallery:\s*$",
+    r"^View our photo gallery:\s*$",
+    r"^Take a look at our photo gallery:\s*https?://example\.com",  # With example.com URL
+]
+_PLACEHOLDER_TEXT_RES = [re.compile(p, re.IGNORECASE) for p in _PLACEHOLDER_TEXT_PATTERNS]
+
+_REASONING_INDICATORS = (
+    "let me", "i need to", "i should", "i will", "i can", "i must",
+    "based on", "according to", "looking at", "from the", "the context",
+    "in the context", "thinking", "analyzing", "checking", "searching",
+    "finding", "reasoning", "process", "step", "first", "then", "next",
+    "to answer", "to find", "to check", "to determine", "to understand",
+    "the new context is", "since the original", "however, there seems",
+    "to refine the existing", "we have the opportunity", "considering the",
+    "since the original query", "the refined answer remains", "the refined answer is",
+    "refined answer remains", "refined answer is", "answer remains the same",
+    "based on the context information provided above", "we have the opportunity to refine",
+    "based on the context information", "the context information provided above",
+)
+
+
 def clean_answer_text(answer: str) -> str:
     """
     Remove LLM reasoning and process text from answer.
@@ -1285,121 +1571,35 @@ def clean_answer_text(answer: str) -> str:
     if not answer:
         return answer
     
-    # First, remove large reasoning blocks that span multiple lines
-    # This catches the "We have the opportunity to refine..." pattern with all its content
-    large_reasoning_blocks = [
-        # Pattern for "We have the opportunity to refine..." through "The refined answer remains..."
-        # Matches: "We have the opportunity..." + separator + "answer: ..." + separator + "Since the original query..." + "The refined answer remains..."
-        r"We have the opportunity to refine.*?(?:[-=]{3,}.*?)?(?:answer:.*?)?(?:[-=]{3,}.*?)?(?:Since the original query.*?)?(?:The refined answer (?:remains|is).*?\.?)\s*",
-        # Pattern for "To refine the existing answer..." through end
-        r"To refine the existing answer.*?(?:[-=]{3,}.*?)?(?:answer:.*?)?(?:[-=]{3,}.*?)?(?:Since.*?)?(?:The refined answer.*?\.?)\s*",
-        # Pattern for "Based on the existing answer and the new context..." through end
-        r"Based on the existing answer and the new context.*?(?:[-=]{3,}.*?)?(?:answer:.*?)?(?:[-=]{3,}.*?)?(?:Since.*?)?(?:The refined answer.*?\.?)\s*",
-        # Pattern for "Based on the context information provided above..." through end
-        r"Based on the context information provided above.*?(?:[-=]{3,}.*?)?(?:answer:.*?)?(?:[-=]{3,}.*?)?(?:The refined answer (?:remains|is).*?\.?)\s*",
-        # Pattern for "Considering..." through end
-        r"Considering.*?the refined answer.*?(?:[-=]{3,}.*?)?(?:answer:.*?)?(?:[-=]{3,}.*?)?(?:Since.*?)?(?:The refined answer.*?\.?)\s*",
-        # Pattern for "Since the original query is as follows:" through "The refined answer remains..."
-        r"Since the original query is as follows:.*?The refined answer (?:remains|is).*?\.?\s*",
-        # Pattern for separator lines with "answer:" in between (catches standalone answer blocks)
-        r"[-=]{3,}\s*answer:\s*.*?[-=]{3,}\s*",
-        # Pattern for "The refined answer remains the same" or similar endings
-        r"The refined answer (?:remains the same|is the same|remains unchanged).*?\.?\s*",
-        # Pattern for "Thank you for the additional context. I've refined the answer..." through "Here are..."
-        r"Thank you for the additional context\.\s*I've refined the answer.*?(?:Here are|Here is|The answer is|The facilities are|The amenities are)",
-        # Pattern for "I've refined the answer to provide more accurate information..."
-        r"I've refined the answer to provide more accurate information\.\s*(?:Since.*?limited.*?I'll stick to.*?\.\s*)?(?:Here are|Here is|The answer is)",
-        # Pattern for "Since specific details about X are limited, I'll stick to..."
-        r"Since specific details about.*?are limited.*?I'll stick to.*?\.\s*(?:Here are|Here is)",
-    ]
-    
     cleaned = answer
     
     # First, try to extract the actual answer from reasoning blocks
     # Pattern: "We have the opportunity... answer: [ACTUAL ANSWER] ... Since the original query..."
     # Extract just the answer part
-    answer_extraction_patterns = [
-        # Pattern 1: Full block with separators
-        r"We have the opportunity to refine.*?[-=]{3,}\s*answer:\s*(.*?)\s*[-=]{3,}.*?Since the original query.*?The refined answer.*?\.?\s*",
-        # Pattern 2: Without "Since the original query" part
-        r"We have the opportunity to refine.*?[-=]{3,}\s*answer:\s*(.*?)\s*[-=]{3,}.*?The refined answer.*?\.?\s*",
-        # Pattern 3: More flexible - any "answer:" in reasoning block
-        r"(?:We have the opportunity|To refine|Based on the existing answer).*?answer:\s*(.*?)(?:[-=]{3,}.*?)?(?:Since.*?)?(?:The refined answer.*?\.?)\s*",
-    ]
-    
-    for pattern in answer_extraction_patterns:
-        match = re.search(pattern, cleaned, flags=re.IGNORECASE | re.DOTALL)
+    for pattern in _ANSWER_EXTRACTION_RES:
+        match = pattern.search(cleaned)
         if match:
             # Replace the entire reasoning block with just the extracted answer
             actual_answer = match.group(1).strip()
             # Only replace if we found a meaningful answer (not empty, not just reasoning text)
             if actual_answer and len(actual_answer) > 10 and not re.match(r"^(yes|no|the|a|an)\s*$", actual_answer, re.IGNORECASE):
-                cleaned = re.sub(pattern, actual_answer + "\n", cleaned, flags=re.IGNORECASE | re.DOTALL)
+                cleaned = pattern.sub(actual_answer + "\n", cleaned)
                 break  # Only use the first successful match
     
     # Then remove remaining large reasoning blocks
-    for pattern in large_reasoning_blocks:
-        cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE | re.DOTALL | re.MULTILINE)
+    for pattern in _LARGE_REASONING_BLOCK_RES:
+        cleaned = pattern.sub("", cleaned)
     
     # Remove common reasoning prefixes and process text (single line patterns)
-    reasoning_patterns = [
-        r"^.*?Let me (think|check|analyze|search|find|look|reason|consider).*?\n",
-        r"^.*?I (need|should|will|can|must) (think|check|analyze|search|find|look|reason|consider).*?\n",
-        r"^.*?Based on.*?context.*?\n",
-        r"^.*?According to.*?context.*?\n",
-        r"^.*?Looking at.*?context.*?\n",
-        r"^.*?From the.*?context.*?\n",
-        r"^.*?The context.*?shows.*?\n",
-        r"^.*?In the.*?context.*?\n",
-        r"^.*?Thinking.*?\n",
-        r"^.*?Analyzing.*?\n",
-        r"^.*?Reasoning.*?\n",
-        r"^.*?Step \d+.*?\n",
-        r"^.*?First.*?then.*?\n",
-        r"However, there seems to be missing context.*?\.\s*",
-        r"Since the original context is now provided.*?\.\s*",
-        r"The new context is as follows:.*?---\s*",
-        r"Since the question and the answer already match.*?\.\s*",
-        r"Therefore, I'll leave the answer as it is\.\s*",
-        r"Refined Answer:\s*",
-        r"Refined answer:\s*",
-        r"Answer:\s*",
-        r"Based on the provided context.*?\.\s*",
-        r"Given the context.*?\.\s*",
-        r"Based on the existing answer and the new context.*?\.\s*",
-        r"We have the opportunity to refine.*?\.\s*",
-        r"To refine the existing answer.*?\.\s*",
-        r"Considering.*?the refined answer.*?\.\s*",
-        # Specific patterns from user examples
-        r"Based on the context information provided above.*?\.\s*",
-        r"Based on the context information provided above.*?:\s*",
-        r"We have the opportunity to refine the existing answer with.*?\.\s*",
-        r"We have the opportunity to refine the existing answer with.*?:\s*",
-        r"The refined answer is:?\s*",
-        r"The refined answer remains:?\s*",
-        r"Based on the context information provided above, the refined answer is:?\s*",
-        r"Based on the context information provided above, the refined answer remains:?\s*",
-        # Patterns for "Thank you for the additional context" reasoning
-        r"^Thank you for the additional context\.\s*I've refined the answer.*?\.\s*",
-        r"^I've refined the answer to provide more accurate information\.\s*",
-        r"^Since specific details about.*?are limited.*?I'll stick to.*?\.\s*",
-    ]
-    
-    for pattern in reasoning_patterns:
-        cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE | re.DOTALL)
+    for pattern in _REASONING_LINE_RES:
+        cleaned = pattern.sub("", cleaned)
     
     # Remove structured pricing analysis templates (internal instructions that shouldn't be shown to users)
     # This is CRITICAL - the entire template must be removed before showing to users
     
     # Remove template markers that LLM might output at the start
-    template_start_patterns = [
-        r"^⚠️\s*GENERAL.*?\n",
-        r"^⚠️\s*⚠️\s*⚠️.*?\n",
-        r"^🚨\s*🚨\s*🚨.*?\n",
-        r"^GENERAL PRICING QUERY DETECTED.*?\n",
-    ]
-    for pattern in template_start_patterns:
-        cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE | re.MULTILINE)
+    for pattern in _TEMPLATE_START_RES:
+        cleaned = pattern.sub("", cleaned)
     
     # Quick check: If answer starts with template markers, find where actual answer begins
     # Enhanced to catch capacity templates too
@@ -1447,19 +1647,6 @@ def clean_answer_text(answer: str) -> str:
                 ]
             ) and not l.strip().startswith(('🚨', '⚠️', '🎯'))]).strip()
     
-    # First, try to find where the actual answer starts (after the template)
-    # Look for patterns that indicate the template has ended and real answer begins
-    answer_start_markers = [
-        r"For \d+ nights?",
-        r"The total cost",
-        r"Total cost",
-        r"For cottage",
-        r"Cottage \d+",
-        r"PKR \d+",
-        r"pricing for",
-        r"cost is",
-    ]
-    
     # Split into lines for more precise filtering
     lines = cleaned.split('\n')
     filtered_lines = []
@@ -1519,13 +1706,13 @@ def clean_answer_text(answer: str) -> str:
             if not line_stripped:
                 # Check next few lines to see if answer starts
                 next_lines = [l.strip() for l in lines[i+1:i+4] if l.strip()]
-                if any(re.search(marker, ' '.join(next_lines), re.IGNORECASE) for marker in answer_start_markers):
+                if any(marker.search(' '.join(next_lines)) for marker in _ANSWER_START_MARKER_RES):
                     template_ended = True
                     in_template = False
                     # Include this line and continue
                 else:
                     continue
-            elif any(re.search(marker, line_stripped, re.IGNORECASE) for marker in answer_start_markers):
+            elif any(marker.search(line_stripped) for marker in _ANSWER_START_MARKER_RES):
                 # Found actual answer content
                 template_ended = True
                 in_template = False
@@ -1541,23 +1728,8 @@ def clean_answer_text(answer: str) -> str:
     
     # Also use regex as fallback to catch any remaining template fragments
     # Enhanced to catch ALL internal instruction patterns including capacity templates
-    pricing_template_patterns = [
-        r"🚨\s*CRITICAL PRICING INFORMATION.*?⚠️\s*MANDATORY INSTRUCTIONS FOR LLM.*?(?=\n\n|\Z)",
-        r"STRUCTURED PRICING ANALYSIS FOR COTTAGE.*?⚠️\s*MANDATORY INSTRUCTIONS FOR LLM.*?(?=\n\n|\Z)",
-        r"ALL PRICES ARE IN PKR.*?⚠️\s*MANDATORY INSTRUCTIONS FOR LLM.*?(?=\n\n|\Z)",
-        r"⚠️\s*MANDATORY INSTRUCTIONS FOR LLM.*?(?=\n\n|\Z)",
-        r"You MUST use ONLY these PKR prices.*?(?=\n\n|\Z)",
-        r"DO NOT convert to dollars.*?(?=\n\n|\Z)",
-        r"Your answer MUST include.*?Total cost.*?(?=\n\n|\Z)",
-        r"🎯\s*TOTAL COST FOR.*?🎯\s*",
-        # Capacity analysis templates
-        r"STRUCTURED CAPACITY ANALYSIS.*?DIRECT ANSWER.*?(?=\n\n|\Z)",
-        r"CRITICAL CAPACITY INFORMATION.*?YOU MUST include.*?(?=\n\n|\Z)",
-        r"CRITICAL CAPACITY INFORMATION FOR COTTAGE.*?YOU MUST include.*?(?=\n\n|\Z)",
-    ]
-    
-    for pattern in pricing_template_patterns:
-        cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE | re.DOTALL | re.MULTILINE)
+    for pattern in _PRICING_TEMPLATE_RES:
+        cleaned = pattern.sub("", cleaned)
     
     # Remove markdown code blocks that might contain reasoning
     cleaned = re.sub(r"```.*?```", "", cleaned, flags=re.DOTALL)
@@ -1569,23 +1741,8 @@ def clean_answer_text(answer: str) -> str:
     
     for i, line in enumerate(lines):
         line_lower = line.lower().strip()
-        # Skip reasoning lines - more comprehensive patterns
-        reasoning_indicators = [
-            "let me", "i need to", "i should", "i will", "i can", "i must",
-            "based on", "according to", "looking at", "from the", "the context",
-            "in the context", "thinking", "analyzing", "checking", "searching",
-            "finding", "reasoning", "process", "step", "first", "then", "next",
-            "to answer", "to find", "to check", "to determine", "to understand",
-            "the new context is", "since the original", "however, there seems",
-            "to refine the existing", "we have the opportunity", "considering the",
-            "since the original query", "the refined answer remains", "the refined answer is",
-            "refined answer remains", "refined answer is", "answer remains the same",
-            "based on the context information provided above", "we have the opportunity to refine",
-            "based on the context information", "the context information provided above",
-        ]
-        
         # Check if line contains reasoning indicators
-        is_reasoning_line = any(indicator in line_lower for indicator in reasoning_indicators)
+        is_reasoning_line = any(indicator in line_lower for indicator in _REASONING_INDICATORS)
         
         # Also check for lines that are just "answer:" followed by content (reasoning pattern)
         if re.match(r"^\s*answer:\s*", line_lower) and len(line) < 300:
@@ -1607,56 +1764,33 @@ def clean_answer_text(answer: str) -> str:
     
     # Remove reasoning text that appears at the start of the answer
     # This catches patterns like "Based on the context information provided above, the refined answer is: [answer]"
-    start_reasoning_patterns = [
-        r"^(?:We have the opportunity to refine|Based on the context information provided above|Based on the provided context|Given the context|Since the original query).*?:\s*",
-        r"^(?:The refined answer is|The refined answer remains|Refined Answer|Answer):\s*",
-    ]
-    
-    for pattern in start_reasoning_patterns:
-        cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE | re.MULTILINE)
+    for pattern in _START_REASONING_RES:
+        cleaned = pattern.sub("", cleaned)
     
     # CRITICAL: Remove example/placeholder URLs that are from training data, not from FAQ documents
     # These are common placeholder URLs that LLMs generate from training data
-    placeholder_url_patterns = [
-        r"https?://(www\.)?example\.com[^\s\)]*",  # example.com URLs
-        r"https?://example\.com[^\s\)]*",  # example.com without www
-        r"https?://(www\.)?example\.org[^\s\)]*",  # example.org URLs
-        r"https?://(www\.)?placeholder\.com[^\s\)]*",  # placeholder.com URLs
-        r"https?://(www\.)?test\.com[^\s\)]*",  # test.com URLs
-        r"https?://(www\.)?sample\.com[^\s\)]*",  # sample.com URLs
-    ]
-    
-    for pattern in placeholder_url_patterns:
+    for pattern in _PLACEHOLDER_URL_RES:
         # Remove the entire line if it contains a placeholder URL
         lines = cleaned.split('\n')
         filtered_lines = []
         for line in lines:
-            if not re.search(pattern, line, flags=re.IGNORECASE):
+            if not pattern.search(line):
                 filtered_lines.append(line)
             else:
                 logger.warning(f"Removed line with placeholder URL: {line[:100]}")
         cleaned = '\n'.join(filtered_lines)
         
         # Also remove the URL itself if it appears in the middle of a line
-        cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE)
+        cleaned = pattern.sub("", cleaned)
     
     # Remove lines that only contain placeholder text like "Take a look at our photo gallery:" without real URLs
     # This catches cases where LLM generates example text from training data
-    placeholder_text_patterns = [
-        r"^Take a look at our photo gallery:\s*$",
-        r"^Visit our photo gallery:\s*$",
-        r"^Check out our photo gallery:\s*$",
-        r"^See our photo gallery:\s*$",
-        r"^View our photo gallery:\s*$",
-        r"^Take a look at our photo gallery:\s*https?://example\.com",  # With example.com URL
-    ]
-    
     lines = cleaned.split('\n')
     filtered_lines = []
     for line in lines:
         is_placeholder = False
-        for pattern in placeholder_text_patterns:
-            if re.match(pattern, line, flags=re.IGNORECASE):
+        for pattern in _PLACEHOLDER_TEXT_RES:
+            if pattern.match(line):
                 is_placeholder = True
                 logger.warning(f"Removed placeholder text line: {line}")
                 break
@@ -1671,6 +1805,7 @@ def clean_answer_text(answer: str) -> str:
     return cleaned
 
 
+
 def preprocess_context_for_location_clarity(
     retrieved_contents: List["Document"]
 ) -> List["Document"]:
@@ -2103,14 +2238,13 @@ def check_document_relevance(query: str, documents: list) -> tuple[bool, str]:
     return True, ""
 
 
-def was_asking_if_want_to_know_more(session_id: str, session_mgr) -> bool:
+def was_asking_if_want_to_know_more(chat_history: ChatHistory) -> bool:
     """Check if the last assistant message in a session was asking if user wants to know more."""
-    chat_history = session_manager.get_or_create_session(session_id)
     if chat_history and len(chat_history) > 0:
         # Get last assistant message from chat history
-        for entry in reversed(chat_history):
-            if "answer:" in str(entry):
-                content = str(entry).split("answer:", 1)[1].strip().lower()
+        for _, answer in reversed(chat_history):
+            if answer:
+                content = answer.strip().lower()
                 asking_patterns = [
                     "is there anything else",
                     "anything else you'd like",
@@ -2598,7 +2732,7 @@ async def chat(
                 )
         
         # Get or create chat history (same as Streamlit - total_length=2)
-        chat_history = session_manager.get_or_create_session(request.session_id, total_length=2)
+        chat_history = await session_manager.async_get_or_create_session(request.session_id, total_length=2)
         
         # Get synthesis strategy
         strategy_name = request.synthesis_strategy or "create-and-refine"
@@ -2653,7 +2787,7 @@ async def chat(
             )
             # Generate follow-up actions for help
             # Convert chat_history to list format for recommendations
-            chat_history_list = list(chat_history) if chat_history else []
+            chat_history_list = chat_history.messages() if chat_history else []
             follow_up_actions = generate_follow_up_actions(
                 intent,
                 slot_manager.get_slots(),
@@ -2672,7 +2806,7 @@ async def chat(
             )
         
         elif intent == IntentType.AFFIRMATIVE:
-            if was_asking_if_want_to_know_more(request.session_id, session_manager):
+            if was_asking_if_want_to_know_more(chat_history):
                 answer = (
                     "Great! What would you like to know about Swiss Cottages Bhurban?\n\n"
                     "I can help you with:\n"
@@ -2699,7 +2833,7 @@ async def chat(
             )
         
         elif intent == IntentType.NEGATIVE:
-            if was_asking_if_want_to_know_more(request.session_id, session_manager):
+            if was_asking_if_want_to_know_more(chat_history):
                 answer = "Great! Feel free to reach out if you have any questions about Swiss Cottages Bhurban. Have a wonderful day! 😊"
             else:
                 answer = "No problem! If you need any information about Swiss Cottages Bhurban in the future, just ask. Have a great day! 😊"
@@ -2811,49 +2945,36 @@ async def chat(
         if chat_history and len(chat_history) > 0:
             # Look through recent messages for slot information that might not be in current query
             date_extractor = get_date_extractor()
-            for message in reversed(list(chat_history)[-3:]):  # Check last 3 messages
-                if isinstance(message, str) and "question:" in message:
-                    # Extract question from chat history format: "question: ..., answer: ..."
-                    parts = message.split("question:", 1)
-                    if len(parts) > 1:
-                        full_message = parts[1]
-                        # Split into question and answer
-                        if "answer:" in full_message:
-                            prev_query = full_message.split("answer:")[0].strip()
-                            prev_answer = full_message.split("answer:")[1].strip() if "answer:" in full_message else ""
-                        else:
-                            prev_query = full_message.strip()
-                            prev_answer = ""
-                        
-                        if prev_query and prev_query != request.question:
-                            # Try to extract slots from previous questions
-                            prev_slots = slot_manager.extract_slots(prev_query, intent)
-                            # Merge previous slots that aren't in current extraction
-                            for key, value in prev_slots.items():
-                                if key not in extracted_slots and value is not None:
-                                    # Only add if slot is not already set in slot_manager
-                                    if key not in slot_manager.slots or slot_manager.slots[key] is None:
-                                        extracted_slots[key] = value
-                                        logger.info(f"Retrieved {key}={value} from chat history question: '{prev_query[:50]}...'")
-                            
-                            # CRITICAL: Also extract dates from previous QUESTIONS (not just answers)
-                            # This handles cases like "we are planning from 13 feb to 19 feb"
-                            if "dates" not in extracted_slots:
-                                date_range = date_extractor.extract_date_range(prev_query)
-                                if date_range:
-                                    extracted_slots["dates"] = date_range
-                                    logger.info(f"✅ Extracted dates from chat history question: {date_range.get('start_date')} to {date_range.get('end_date')}, {date_range.get('nights')} nights")
-                                    logger.info(f"   Source text: '{prev_query[:100]}...'")
-                        
-                        # CRITICAL: Also extract dates from previous ANSWERS (bot responses)
-                        # This handles cases where bot mentioned dates like "February 11, 2026, to February 15, 2026"
-                        if prev_answer and "dates" not in extracted_slots:
-                            # Try to extract dates from the answer text
-                            date_range = date_extractor.extract_date_range(prev_answer)
-                            if date_range:
-                                extracted_slots["dates"] = date_range
-                                logger.info(f"✅ Extracted dates from chat history answer: {date_range.get('start_date')} to {date_range.get('end_date')}, {date_range.get('nights')} nights")
-                                logger.info(f"   Source text: '{prev_answer[:100]}...'")
+            for prev_query, prev_answer in reversed(list(chat_history)[-3:]):  # Check last 3 turns
+                if prev_query and prev_query != request.question:
+                    # Try to extract slots from previous questions
+                    prev_slots = slot_manager.extract_slots(prev_query, intent)
+                    # Merge previous slots that aren't in current extraction
+                    for key, value in prev_slots.items():
+                        if key not in extracted_slots and value is not None:
+                            # Only add if slot is not already set in slot_manager
+                            if key not in slot_manager.slots or slot_manager.slots[key] is None:
+                                extracted_slots[key] = value
+                                logger.info(f"Retrieved {key}={value} from chat history question: '{prev_query[:50]}...'")
+                    
+                    # CRITICAL: Also extract dates from previous QUESTIONS (not just answers)
+                    # This handles cases like "we are planning from 13 feb to 19 feb"
+                    if "dates" not in extracted_slots:
+                        date_range = date_extractor.extract_date_range(prev_query)
+                        if date_range:
+                            extracted_slots["dates"] = date_range
+                            logger.info(f"✅ Extracted dates from chat history question: {date_range.get('start_date')} to {date_range.get('end_date')}, {date_range.get('nights')} nights")
+                            logger.info(f"   Source text: '{prev_query[:100]}...'")
+                
+                # CRITICAL: Also extract dates from previous ANSWERS (bot responses)
+                # This handles cases where bot mentioned dates like "February 11, 2026, to February 15, 2026"
+                if prev_answer and "dates" not in extracted_slots:
+                    # Try to extract dates from the answer text
+                    date_range = date_extractor.extract_date_range(prev_answer)
+                    if date_range:
+                        extracted_slots["dates"] = date_range
+                        logger.info(f"✅ Extracted dates from chat history answer: {date_range.get('start_date')} to {date_range.get('end_date')}, {date_range.get('nights')} nights")
+                        logger.info(f"   Source text: '{prev_answer[:100]}...'")
         
         slot_manager.update_slots(extracted_slots)
         
@@ -2978,7 +3099,8 @@ async def chat(
                         answer_text += f"\n\nNote: {errors[0]}"
                     
                     # Update chat history
-                    chat_history.append(f"question: {request.question}, answer: {answer_text}")
+                    chat_history.append((request.question, answer_text))
+                    await session_manager.async_save_session(request.session_id)
                     
                     return ChatResponse(
                         answer=answer_text,
@@ -3732,6 +3854,7 @@ CONTACT INFORMATION:
                         max_new_tokens,
                         use_simple_prompt=use_simple_prompt,
                         intent=intent_type if is_intent_filtering_enabled() else None,  # Pass intent for intent-specific prompts (if enabled)
+                        semantic_cache=get_semantic_cache(),
                     )
                 except Exception as e:
                     error_msg = str(e)
@@ -3753,6 +3876,7 @@ CONTACT INFORMATION:
                                 max_new_tokens,
                                 use_simple_prompt=False,
                                 intent=intent_type if is_intent_filtering_enabled() else None,  # Pass intent for intent-specific prompts (if enabled)
+                                semantic_cache=get_semantic_cache(),
                             )
                             logger.info("Fallback to reasoning model succeeded")
                         else:
@@ -3764,10 +3888,13 @@ CONTACT INFORMATION:
                 answer_text = ""
                 answer_buffer = ""
                 inside_reasoning = False
-                reasoning_start_tag = llm.model_settings.reasoning_start_tag if llm.model_settings.reasoning else None
-                reasoning_stop_tag = llm.model_settings.reasoning_stop_tag if llm.model_settings.reasoning else None
+                # Bind reasoning settings once so the token loop doesn't re-resolve them per token
+                model_settings = llm.model_settings
+                reasoning = model_settings.reasoning
+                reasoning_start_tag = model_settings.reasoning_start_tag if reasoning else None
+                reasoning_stop_tag = model_settings.reasoning_stop_tag if reasoning else None
                 
-                for token in streamer:
+                async for token in _aiter_tokens(streamer):
                     parsed_token = llm.parse_token(token)
                     if not parsed_token:
                         continue
@@ -3775,7 +3902,7 @@ CONTACT INFORMATION:
                     answer_text += parsed_token  # Keep full text for fallback
                     
                     # Filter reasoning tags during collection
-                    if llm.model_settings.reasoning:
+                    if reasoning:
                         stripped_token = parsed_token.strip()
                         
                         if reasoning_start_tag and reasoning_start_tag in stripped_token:
@@ -3795,7 +3922,7 @@ CONTACT INFORMATION:
                 # Use answer_buffer (without reasoning) if available, otherwise extract from full text
                 if answer_buffer:
                     answer_text = answer_buffer
-                elif llm.model_settings.reasoning:
+                elif reasoning:
                     # Fallback: extract reasoning if buffer is empty
                     answer_text = extract_content_after_reasoning(
                         answer_text, reasoning_stop_tag
@@ -3884,9 +4011,8 @@ CONTACT INFORMATION:
                                 answer_text = '\n'.join(lines[idx:]).strip()
                                 break
                 
-                # Validate currency - check if answer has dollar prices when context has PKR
-                context_text = "\n".join([doc.page_content for doc in retrieved_contents[:3]])  # Get context from top 3 docs
-                answer_text = validate_and_fix_currency(answer_text, context_text)
+                # Validate currency - check if answer has dollar prices
+                answer_text = validate_and_fix_currency(answer_text)
                 
                 # Filter out generic requests for group size when it's already known from capacity query
                 if capacity_result and capacity_result.get("group_size") is not None:
@@ -4022,7 +4148,7 @@ CONTACT INFORMATION:
                                     intent=intent_type if is_intent_filtering_enabled() else None,  # Pass intent for intent-specific prompts (if enabled)
                                 )
                                 answer_text = ""
-                                for token in streamer:
+                                async for token in _aiter_tokens(streamer):
                                     parsed_token = llm.parse_token(token)
                                     answer_text += parsed_token
                                 
@@ -4106,8 +4232,8 @@ CONTACT INFORMATION:
                 # Check if last bot message was a recommendation
                 last_bot_message = None
                 if chat_history and len(chat_history) > 0:
-                    last_message = chat_history[-1]
-                    if isinstance(last_message, str) and "recommend" in last_message.lower():
+                    last_message = chat_history.get_last_message()
+                    if "recommend" in last_message.lower():
                         last_bot_message = last_message
                 
                 # Suppress follow-up if user is responding affirmatively to recommendation
@@ -4138,16 +4264,12 @@ CONTACT INFORMATION:
                                 
                                 # Also check chat history for cottage mentions
                                 if not cottage_mentioned and chat_history:
-                                    for message in reversed(list(chat_history)[-3:]):  # Check last 3 messages
-                                        if isinstance(message, str):
-                                            # Extract question from chat history format
-                                            if "question:" in message:
-                                                prev_query = message.split("question:")[1].split("answer:")[0].strip()
-                                                if prev_query:
-                                                    cottage_mentioned = cottage_extractor.extract_cottage_number(prev_query)
-                                                    if cottage_mentioned:
-                                                        logger.info(f"Cottage {cottage_mentioned} mentioned in chat history, skipping cottage_id question")
-                                                        break
+                                    for prev_query, _ in reversed(list(chat_history)[-3:]):  # Check last 3 turns
+                                        if prev_query:
+                                            cottage_mentioned = cottage_extractor.extract_cottage_number(prev_query)
+                                            if cottage_mentioned:
+                                                logger.info(f"Cottage {cottage_mentioned} mentioned in chat history, skipping cottage_id question")
+                                                break
                                 
                                 if cottage_mentioned:
                                     logger.info(f"Cottage {cottage_mentioned} mentioned in query or history, skipping cottage_id question")
@@ -4361,7 +4483,8 @@ CONTACT INFORMATION:
                 answer_text = sentiment_analyzer.adjust_tone(answer_text, sentiment)
                 
                 # Update chat history (same as Streamlit - uses refined_question)
-                chat_history.append(f"question: {refined_question}, answer: {answer_text}")
+                chat_history.append((refined_question, answer_text))
+                await session_manager.async_save_session(request.session_id)
                 
                 # Format sources (show all retrieved sources, up to effective_k)
                 source_infos = [
@@ -4430,7 +4553,7 @@ CONTACT INFORMATION:
                 
                 # Generate follow-up actions
                 # Convert chat_history to list format for recommendations
-                chat_history_list = list(chat_history) if chat_history else []
+                chat_history_list = chat_history.messages() if chat_history else []
                 follow_up_actions = generate_follow_up_actions(
                     intent,
                     slot_manager.get_slots(),
@@ -4487,6 +4610,9 @@ CONTACT INFORMATION:
                     session_id=request.session_id,
                 )
     
+    except GroqThrottledError as e:
+        logger.warning(f"Chat request throttled: {e}")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         logger.error(f"Error in chat endpoint: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -4593,14 +4719,14 @@ async def chat_stream(
                     total_images = sum(len(imgs) for imgs in cottage_images_dict.values())
                     logger.info(f"Returning {total_images} image URLs grouped by cottage: {list(cottage_images_dict.keys())} in stream")
                     
-                    yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                    yield f"data: {json.dumps({'type': 'done', 'sources': [], 'cottage_images': cottage_images_dict})}\n\n"
+                    yield _sse_event({'type': 'token', 'chunk': answer})
+                    yield _sse_event({'type': 'done', 'sources': [], 'cottage_images': cottage_images_dict})
                     return
                 else:
                     # No images found, provide helpful message
                     answer = "I'm sorry, I couldn't find images for the requested cottages. Please contact us for more information."
-                    yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                    yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                    yield _sse_event({'type': 'token', 'chunk': answer})
+                    yield _SSE_DONE_NO_SOURCES
                     return
             
             # Pre-processing: Check for manager contact queries
@@ -4624,8 +4750,8 @@ async def chat_stream(
                     "- General assistance before or during your stay\n\n"
                     "Feel free to reach out for personalized assistance! 🏡"
                 )
-                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                yield _sse_event({'type': 'token', 'chunk': answer})
+                yield _SSE_DONE_NO_SOURCES
                 return
             
             # Pre-processing: Check for single room/person queries
@@ -4650,8 +4776,8 @@ async def chat_stream(
                     "- Which cottage would be best for you\n"
                     "- Availability and booking information"
                 )
-                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                yield _sse_event({'type': 'token', 'chunk': answer})
+                yield _SSE_DONE_NO_SOURCES
                 return
             
             # Pre-processing: Check for cottage listing queries
@@ -4666,8 +4792,8 @@ async def chat_stream(
             if any(pattern in query_lower for pattern in total_cottages_patterns):
                 registry = get_cottage_registry()
                 answer = registry.format_total_cottages_response()
-                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                yield _sse_event({'type': 'token', 'chunk': answer})
+                yield _SSE_DONE_NO_SOURCES
                 return
             
             # Check for capacity queries BEFORE cottage listing handler
@@ -4739,8 +4865,8 @@ async def chat_stream(
                         "- Which cottage is best for your group size\n"
                         "- Availability and booking information"
                     )
-                    yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                    yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                    yield _sse_event({'type': 'token', 'chunk': answer})
+                    yield _SSE_DONE_NO_SOURCES
                     return
             
             # Handle 2-bedroom queries (will show Cottage 7)
@@ -4754,8 +4880,8 @@ async def chat_stream(
                         answer += f"- Base capacity: Up to {cottage.base_capacity} guests\n"
                         answer += f"- Maximum capacity: {cottage.max_capacity} guests\n\n"
                     answer += "Would you like to know about pricing or availability?"
-                    yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                    yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                    yield _sse_event({'type': 'token', 'chunk': answer})
+                    yield _SSE_DONE_NO_SOURCES
                     return
             
             # Handle 3-bedroom queries (will show Cottages 9 and 11)
@@ -4769,12 +4895,12 @@ async def chat_stream(
                         answer += f"- Base capacity: Up to {cottage.base_capacity} guests\n"
                         answer += f"- Maximum capacity: {cottage.max_capacity} guests\n\n"
                     answer += "Would you like to know about pricing or availability?"
-                    yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                    yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                    yield _sse_event({'type': 'token', 'chunk': answer})
+                    yield _SSE_DONE_NO_SOURCES
                     return
             
             # Get or create chat history
-            chat_history = session_manager.get_or_create_session(request.session_id, total_length=2)
+            chat_history = await session_manager.async_get_or_create_session(request.session_id, total_length=2)
             
             # Get synthesis strategy
             strategy_name = request.synthesis_strategy or "create-and-refine"
@@ -4810,8 +4936,8 @@ async def chat_stream(
                     "- Booking and payment information\n\n"
                     "What would you like to know?"
                 )
-                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                yield _sse_event({'type': 'token', 'chunk': answer})
+                yield _SSE_DONE_NO_SOURCES
                 return
             
             elif intent == IntentType.HELP:
@@ -4824,8 +4950,8 @@ async def chat_stream(
                     "- **Booking & Payment**: Get details about how to book and payment methods\n\n"
                     "What would you like to know more about?"
                 )
-                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                yield _sse_event({'type': 'token', 'chunk': answer})
+                yield _SSE_DONE_NO_SOURCES
                 return
             
             elif intent == IntentType.AFFIRMATIVE:
@@ -4838,14 +4964,14 @@ async def chat_stream(
                     "- **Booking & Payment**: How to book and payment methods\n\n"
                     "Just ask me any question, and I'll find the information for you!"
                 )
-                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                yield _sse_event({'type': 'token', 'chunk': answer})
+                yield _SSE_DONE_NO_SOURCES
                 return
             
             elif intent == IntentType.NEGATIVE:
                 answer = "Great! Feel free to reach out if you have any questions about Swiss Cottages Bhurban. Have a wonderful day! 😊"
-                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                yield _sse_event({'type': 'token', 'chunk': answer})
+                yield _SSE_DONE_NO_SOURCES
                 return
             
             elif intent == IntentType.STATEMENT:
@@ -4856,15 +4982,15 @@ async def chat_stream(
                     'we are', 'we have', 'we need', 'we want', 'which cottage', 'what cottage'
                 ]):
                     answer = "You're welcome! 😊\n\nIs there anything else you'd like to know about Swiss Cottages Bhurban?"
-                    yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                    yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                    yield _sse_event({'type': 'token', 'chunk': answer})
+                    yield _SSE_DONE_NO_SOURCES
                     return
             
             elif intent == IntentType.CLARIFICATION_NEEDED:
                 clar_question = intent_router.get_clarification_question(request.question)
                 answer = f"To give you the most accurate answer, could you please clarify: **{clar_question}**"
-                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                yield _sse_event({'type': 'token', 'chunk': answer})
+                yield _SSE_DONE_NO_SOURCES
                 return
             
             # Track intent in context (slot_manager and context_tracker already created above)
@@ -4891,36 +5017,24 @@ async def chat_stream(
             # Improve context retention: Check chat history for previous slot values
             if chat_history and len(chat_history) > 0:
                 date_extractor = get_date_extractor()
-                for message in reversed(list(chat_history)[-3:]):  # Check last 3 messages
-                    if isinstance(message, str) and "question:" in message:
-                        parts = message.split("question:", 1)
-                        if len(parts) > 1:
-                            full_message = parts[1]
-                            # Split into question and answer
-                            if "answer:" in full_message:
-                                prev_query = full_message.split("answer:")[0].strip()
-                                prev_answer = full_message.split("answer:")[1].strip() if "answer:" in full_message else ""
-                            else:
-                                prev_query = full_message.strip()
-                                prev_answer = ""
-                            
-                            if prev_query and prev_query != request.question:
-                                prev_slots = slot_manager.extract_slots(prev_query, intent)
-                                for key, value in prev_slots.items():
-                                    if key not in extracted_slots and value is not None:
-                                        if key not in slot_manager.slots or slot_manager.slots[key] is None:
-                                            extracted_slots[key] = value
-                                            logger.info(f"Retrieved {key}={value} from chat history in stream endpoint")
-                            
-                            # CRITICAL: Also extract dates from previous ANSWERS (bot responses)
-                            # This handles cases where bot mentioned dates like "February 11, 2026, to February 15, 2026"
-                            if prev_answer and "dates" not in extracted_slots:
-                                # Try to extract dates from the answer text
-                                date_range = date_extractor.extract_date_range(prev_answer)
-                                if date_range:
-                                    extracted_slots["dates"] = date_range
-                                    logger.info(f"✅ Extracted dates from chat history answer in stream: {date_range.get('start_date')} to {date_range.get('end_date')}, {date_range.get('nights')} nights")
-                                    logger.info(f"   Source text: '{prev_answer[:100]}...'")
+                for prev_query, prev_answer in reversed(list(chat_history)[-3:]):  # Check last 3 turns
+                    if prev_query and prev_query != request.question:
+                        prev_slots = slot_manager.extract_slots(prev_query, intent)
+                        for key, value in prev_slots.items():
+                            if key not in extracted_slots and value is not None:
+                                if key not in slot_manager.slots or slot_manager.slots[key] is None:
+                                    extracted_slots[key] = value
+                                    logger.info(f"Retrieved {key}={value} from chat history in stream endpoint")
+                    
+                    # CRITICAL: Also extract dates from previous ANSWERS (bot responses)
+                    # This handles cases where bot mentioned dates like "February 11, 2026, to February 15, 2026"
+                    if prev_answer and "dates" not in extracted_slots:
+                        # Try to extract dates from the answer text
+                        date_range = date_extractor.extract_date_range(prev_answer)
+                        if date_range:
+                            extracted_slots["dates"] = date_range
+                            logger.info(f"✅ Extracted dates from chat history answer in stream: {date_range.get('start_date')} to {date_range.get('end_date')}, {date_range.get('nights')} nights")
+                            logger.info(f"   Source text: '{prev_answer[:100]}...'")
             
             slot_manager.update_slots(extracted_slots)
             
@@ -4935,8 +5049,8 @@ async def chat_stream(
             if intent not in [IntentType.FAQ_QUESTION, IntentType.UNKNOWN, IntentType.REFINEMENT] + manager_intents:
                 # This intent doesn't need RAG, return early
                 answer = "I'm not sure how to help with that. Could you please ask about Swiss Cottages Bhurban?"
-                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                yield _sse_event({'type': 'token', 'chunk': answer})
+                yield _SSE_DONE_NO_SOURCES
                 return
             
             # Analyze sentiment
@@ -5058,7 +5172,7 @@ async def chat_stream(
             # is_capacity_query is already set earlier, no need to check again
             
             # Send searching status (only if we're going to search)
-            yield f"data: {json.dumps({'type': 'searching', 'message': 'Searching knowledge base...'})}\n\n"
+            yield _SSE_SEARCHING
             await asyncio.sleep(0.05)
             
             # Retrieve documents
@@ -5341,7 +5455,7 @@ To book {booking_cottages}:
             
             # Send sources found status
             if sources and len(sources) > 0:
-                yield f"data: {json.dumps({'type': 'sources_found', 'sources': sources[:effective_k]})}\n\n"
+                yield _sse_event({'type': 'sources_found', 'sources': sources[:effective_k]})
                 await asyncio.sleep(0.05)
             
             # Check if we have pricing/capacity results even if no documents retrieved
@@ -5366,7 +5480,7 @@ To book {booking_cottages}:
             if not retrieved_contents:
                 logger.warning(f"No documents retrieved after all attempts for query: '{request.question}'")
                 # Hide searching message before showing fallback
-                yield f"data: {json.dumps({'type': 'hide_searching'})}\n\n"
+                yield _SSE_HIDE_SEARCHING
                 await asyncio.sleep(0.05)
                 
                 answer = (
@@ -5378,8 +5492,8 @@ To book {booking_cottages}:
                     "**Note:** I only answer questions based on the provided FAQ documents about Swiss Cottages Bhurban. "
                     "I cannot answer questions from general knowledge or about other locations.\n"
                 )
-                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                yield _sse_event({'type': 'token', 'chunk': answer})
+                yield _SSE_DONE_NO_SOURCES
                 return
             
             # Check relevance
@@ -5392,12 +5506,12 @@ To book {booking_cottages}:
                     f"**Issue:** {reason}\n\n"
                     "💡 **Note:** I only have information about Swiss Cottages Bhurban (in Pakistan).\n"
                 )
-                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                yield f"data: {json.dumps({'type': 'done', 'sources': []})}\n\n"
+                yield _sse_event({'type': 'token', 'chunk': answer})
+                yield _SSE_DONE_NO_SOURCES
                 return
             
             # Send typing indicator
-            yield f"data: {json.dumps({'type': 'typing', 'message': 'Bot is typing...'})}\n\n"
+            yield _SSE_TYPING
             await asyncio.sleep(0.05)
             
             # Generate answer with streaming
@@ -5538,8 +5652,8 @@ To book {booking_cottages}:
                     for src in sources[:effective_k]:
                         if isinstance(src, dict):
                             error_sources.append(src)
-                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                yield f"data: {json.dumps({'type': 'done', 'sources': error_sources})}\n\n"
+                yield _sse_event({'type': 'token', 'chunk': answer})
+                yield _sse_event({'type': 'done', 'sources': error_sources})
                 return
             
             if not ctx_synthesis_strategy:
@@ -5550,8 +5664,8 @@ To book {booking_cottages}:
                     for src in sources[:effective_k]:
                         if isinstance(src, dict):
                             error_sources.append(src)
-                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                yield f"data: {json.dumps({'type': 'done', 'sources': error_sources})}\n\n"
+                yield _sse_event({'type': 'token', 'chunk': answer})
+                yield _sse_event({'type': 'done', 'sources': error_sources})
                 return
             
             try:
@@ -5568,6 +5682,7 @@ To book {booking_cottages}:
                     max_new_tokens,
                     use_simple_prompt=use_simple_prompt,
                     intent=intent_type_str,  # Pass intent for intent-specific prompts
+                    semantic_cache=get_semantic_cache(),
                 )
                 logger.info(f"answer_with_context returned successfully, streamer type: {type(streamer)}")
             except Exception as e:
@@ -5591,6 +5706,7 @@ To book {booking_cottages}:
                                 max_new_tokens,
                                 use_simple_prompt=True,  # Use simple prompt to reduce size
                                 intent=intent_type_str if is_intent_filtering_enabled() else None,  # Pass intent for intent-specific prompts (if enabled)
+                                semantic_cache=get_semantic_cache(),
                             )
                             logger.info("Retry with simple prompt succeeded")
                         except Exception as retry_e:
@@ -5621,6 +5737,7 @@ To book {booking_cottages}:
                                 max_new_tokens,
                                 use_simple_prompt=True,  # Use simple prompt to reduce size
                                 intent=intent_type_str if is_intent_filtering_enabled() else None,  # Pass intent for intent-specific prompts (if enabled)
+                                semantic_cache=get_semantic_cache(),
                             )
                             logger.info("Retry with simple prompt succeeded")
                             # Continue with streaming instead of returning error
@@ -5644,6 +5761,7 @@ To book {booking_cottages}:
                                         max_new_tokens,
                                         use_simple_prompt=True,  # Still use simple prompt
                                         intent=intent_type_str if is_intent_filtering_enabled() else None,  # Pass intent for intent-specific prompts (if enabled)
+                                        semantic_cache=get_semantic_cache(),
                                     )
                                     logger.info("Fallback to reasoning model with simple prompt succeeded")
                                     # Continue with streaming instead of returning error
@@ -5655,8 +5773,8 @@ To book {booking_cottages}:
                                         for src in sources[:effective_k]:
                                             if isinstance(src, dict):
                                                 error_sources.append(src)
-                                    yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                                    yield f"data: {json.dumps({'type': 'done', 'sources': error_sources})}\n\n"
+                                    yield _sse_event({'type': 'token', 'chunk': answer})
+                                    yield _sse_event({'type': 'done', 'sources': error_sources})
                                     return
                             else:
                                 # Already using reasoning model, give up
@@ -5666,8 +5784,8 @@ To book {booking_cottages}:
                                     for src in sources[:effective_k]:
                                         if isinstance(src, dict):
                                             error_sources.append(src)
-                                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                                yield f"data: {json.dumps({'type': 'done', 'sources': error_sources})}\n\n"
+                                yield _sse_event({'type': 'token', 'chunk': answer})
+                                yield _sse_event({'type': 'done', 'sources': error_sources})
                                 return
                     else:
                         # Already using simple prompt, try reasoning model if not already using it
@@ -5699,8 +5817,8 @@ To book {booking_cottages}:
                                     for src in sources[:effective_k]:
                                         if isinstance(src, dict):
                                             error_sources.append(src)
-                                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                                yield f"data: {json.dumps({'type': 'done', 'sources': error_sources})}\n\n"
+                                yield _sse_event({'type': 'token', 'chunk': answer})
+                                yield _sse_event({'type': 'done', 'sources': error_sources})
                                 return
                         else:
                             # Already using reasoning model with simple prompt, give up
@@ -5710,8 +5828,8 @@ To book {booking_cottages}:
                                 for src in sources[:effective_k]:
                                     if isinstance(src, dict):
                                         error_sources.append(src)
-                        yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                        yield f"data: {json.dumps({'type': 'done', 'sources': error_sources})}\n\n"
+                        yield _sse_event({'type': 'token', 'chunk': answer})
+                        yield _sse_event({'type': 'done', 'sources': error_sources})
                         return
                 else:
                     # For debugging, include error type in response
@@ -5721,8 +5839,8 @@ To book {booking_cottages}:
                         for src in sources[:effective_k]:
                             if isinstance(src, dict):
                                 error_sources.append(src)
-                    yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                    yield f"data: {json.dumps({'type': 'done', 'sources': error_sources})}\n\n"
+                    yield _sse_event({'type': 'token', 'chunk': answer})
+                    yield _sse_event({'type': 'done', 'sources': error_sources})
                     return
             
             if not streamer:
@@ -5734,23 +5852,26 @@ To book {booking_cottages}:
                     for src in sources[:effective_k]:
                         if isinstance(src, dict):
                             error_sources.append(src)
-                yield f"data: {json.dumps({'type': 'token', 'chunk': answer})}\n\n"
-                yield f"data: {json.dumps({'type': 'done', 'sources': error_sources})}\n\n"
+                yield _sse_event({'type': 'token', 'chunk': answer})
+                yield _sse_event({'type': 'done', 'sources': error_sources})
                 return
             
-            # Stream tokens
-            full_answer = ""
+            # Stream tokens; pieces are collected in lists and joined once the stream ends
+            full_answer_parts = []
             token_count = 0
             total_estimated_tokens = max_new_tokens  # Estimate for progress
             inside_reasoning = False
-            reasoning_start_tag = selected_llm.model_settings.reasoning_start_tag if selected_llm.model_settings.reasoning else None
-            reasoning_stop_tag = selected_llm.model_settings.reasoning_stop_tag if selected_llm.model_settings.reasoning else None
-            answer_buffer = ""  # Buffer for answer content (excluding reasoning)
+            # Bind reasoning settings once so the token loop doesn't re-resolve them per token
+            model_settings = selected_llm.model_settings
+            reasoning = model_settings.reasoning
+            reasoning_start_tag = model_settings.reasoning_start_tag if reasoning else None
+            reasoning_stop_tag = model_settings.reasoning_stop_tag if reasoning else None
+            answer_parts = []  # Answer content (excluding reasoning)
             
             try:
                 logger.info(f"Starting to iterate over streamer, type: {type(streamer)}")
                 token_iter_count = 0
-                for token in streamer:
+                async for token in _aiter_tokens(streamer):
                     token_iter_count += 1
                     if token_iter_count == 1:
                         logger.info(f"First token received: {type(token)}, value: {str(token)[:100] if token else 'None'}")
@@ -5763,7 +5884,7 @@ To book {booking_cottages}:
                         continue
                     
                     # Check for reasoning tags
-                    if selected_llm.model_settings.reasoning:
+                    if reasoning:
                         stripped_token = parsed_token.strip()
                         
                         # Check if we're entering reasoning mode
@@ -5781,21 +5902,21 @@ To book {booking_cottages}:
                         # Skip tokens that are part of reasoning
                         if inside_reasoning:
                             # Still accumulate for full_answer but don't stream
-                            full_answer += parsed_token
+                            full_answer_parts.append(parsed_token)
                             continue
                     
                     # This is actual answer content
-                    full_answer += parsed_token
-                    answer_buffer += parsed_token
+                    full_answer_parts.append(parsed_token)
+                    answer_parts.append(parsed_token)
                     token_count += 1
                     
                     # Send token to client
-                    yield f"data: {json.dumps({'type': 'token', 'chunk': parsed_token})}\n\n"
+                    yield _sse_event({'type': 'token', 'chunk': parsed_token})
                     
                     # Send progress update every 10 tokens
                     if token_count % 10 == 0:
                         progress = min(100, int((token_count / total_estimated_tokens) * 100))
-                        yield f"data: {json.dumps({'type': 'progress', 'progress': progress, 'tokens': token_count})}\n\n"
+                        yield _sse_event({'type': 'progress', 'progress': progress, 'tokens': token_count})
                     
                     await asyncio.sleep(0.01)  # Small delay for smooth streaming
                 
@@ -5805,6 +5926,8 @@ To book {booking_cottages}:
                 elif 'token_iter_count' in locals() and token_count == 0 and token_iter_count > 0:
                     logger.warning(f"Streamer yielded {token_iter_count} tokens but none were accumulated (all filtered out or empty)")
                 
+                full_answer = "".join(full_answer_parts)
+                answer_buffer = "".join(answer_parts)
                 # Check for incomplete responses (cut off mid-sentence) in streaming
                 if full_answer and not full_answer.strip().endswith(('.', '!', '?', ':', ';')):
                     last_char = full_answer.strip()[-1] if full_answer.strip() else ''
@@ -5820,6 +5943,8 @@ To book {booking_cottages}:
                 logger.error(f"Error during token streaming: {stream_error}", exc_info=True)
                 logger.error(f"Token iteration count before error: {token_iter_count if 'token_iter_count' in locals() else 'not initialized'}")
                 # If streaming fails, try to send what we have
+                full_answer = "".join(full_answer_parts)
+                answer_buffer = "".join(answer_parts)
                 if not answer_buffer and not full_answer:
                     full_answer = "I encountered an error while generating the response. Please try again."
                 else:
@@ -5827,7 +5952,7 @@ To book {booking_cottages}:
                     full_answer = answer_buffer if answer_buffer else full_answer
             
             # Final reasoning extraction as fallback (in case tags weren't detected during streaming)
-            if selected_llm.model_settings.reasoning and not answer_buffer:
+            if reasoning and not answer_buffer:
                 try:
                     full_answer = extract_content_after_reasoning(
                         full_answer, reasoning_stop_tag
@@ -5920,8 +6045,7 @@ To book {booking_cottages}:
             
             # Validate currency
             try:
-                context_text = "\n".join([doc.page_content for doc in retrieved_contents[:3]])
-                validated = validate_and_fix_currency(full_answer, context_text)
+                validated = validate_and_fix_currency(full_answer)
                 if validated:  # Only use validated version if it's not empty
                     full_answer = validated
                 else:
@@ -6072,11 +6196,12 @@ To book {booking_cottages}:
                     full_answer += f"\n\n{nudge}"
             
             # Update chat history
-            chat_history.append(f"question: {refined_question}, answer: {full_answer}")
+            chat_history.append((refined_question, full_answer))
+            await session_manager.async_save_session(request.session_id)
             
             # Generate follow-up actions
             # Convert chat_history to list format for recommendations
-            chat_history_list = list(chat_history) if chat_history else []
+            chat_history_list = chat_history.messages() if chat_history else []
             follow_up_actions = generate_follow_up_actions(
                 intent,
                 slot_manager.get_slots(),
@@ -6095,14 +6220,17 @@ To book {booking_cottages}:
                 'cottage_images': cottage_image_urls,
                 'follow_up_actions': follow_up_actions
             }
-            yield f"data: {json.dumps(completion_data)}\n\n"
+            yield _sse_event(completion_data)
             
+        except GroqThrottledError as e:
+            logger.warning(f"Streaming request throttled: {e}")
+            yield _sse_event({'type': 'error', 'code': 'rate_limited', 'retry_after': e.retry_after, 'message': str(e)})
         except Exception as e:
             logger.error(f"Error in streaming endpoint: {e}", exc_info=True)
             import traceback
             error_details = traceback.format_exc()
             logger.error(f"Full traceback: {error_details}")
-            yield f"data: {json.dumps({'type': 'error', 'message': f'An error occurred: {str(e)}'})}\n\n"
+            yield _sse_event({'type': 'error', 'message': f'An error occurred: {str(e)}'})
     
     return StreamingResponse(generate(), media_type="text/event-stream")
 
@@ -6111,7 +6239,7 @@ To book {booking_cottages}:
 async def clear_session(request: ClearSessionRequest):
     """Clear chat history for a session."""
     try:
-        cleared = session_manager.clear_session(request.session_id)
+        cleared = await asyncio.to_thread(session_manager.clear_session, request.session_id)
         if cleared:
             return ClearSessionResponse(
                 status="success",
@@ -6271,46 +6399,221 @@ async def root():
     }
 
 
+# Pending fire-and-forget websocket sends; holding a reference keeps them from being garbage collected
+_background_tasks: set = set()
+
+
+def _notify(websocket: WebSocket, payload: Dict[str, Any]) -> asyncio.Task:
+    """
+    Send an informational message over the websocket without waiting for the write to drain.
+
+    Only use this for messages where ordering is not critical (e.g. "status"); answers, errors and
+    "ready" should still be awaited directly.
+
+    Args:
+        websocket: The websocket connection.
+        payload: The JSON payload to send.
+
+    Returns:
+        asyncio.Task: The scheduled send task.
+    """
+    task = asyncio.create_task(_send_json(websocket, payload))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+# Phrases marking a short "no information" answer, matched in one case-insensitive pass
+_NO_INFO_PHRASES = (
+    "i don't know",
+    "i cannot",
+    "i'm not able",
+    "i don't have",
+    "no information",
+    "couldn't find",
+)
+_NO_INFO_RE = re.compile("|".join(re.escape(phrase) for phrase in _NO_INFO_PHRASES), re.IGNORECASE)
+
+# Transcriptions Whisper commonly produces from silence/noise, compared case-insensitively
+_STT_FALSE_POSITIVES = frozenset(["thank you", "thanks", "ok", "okay", "yes", "no", "uh", "um", "ah", "hmm"])
+
+# Sentence boundaries used to cut answers into pieces that are synthesized independently
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _split_for_tts(text: str, min_chars: int = 120) -> List[str]:
+    """
+    Split an answer into groups of whole sentences for incremental speech synthesis.
+
+    Sentences are merged until a group reaches `min_chars` so short sentences ("Yes.") don't each
+    cost a separate TTS request.
+
+    Args:
+        text: The answer text.
+        min_chars: Minimum length of a group before a new one is started.
+
+    Returns:
+        List[str]: The sentence groups, in order.
+    """
+    chunks = []
+    current = ""
+    for sentence in _SENTENCE_SPLIT_RE.split(text.strip()):
+        if not sentence:
+            continue
+        current = f"{current} {sentence}" if current else sentence
+        if len(current) >= min_chars:
+            chunks.append(current)
+            current = ""
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def _stream_tts_audio(
+    websocket: WebSocket, tts: GroqTTS, text: str, prefetched: Sequence[asyncio.Task] = ()
+) -> None:
+    """
+    Synthesize an answer sentence group by sentence group and send each piece as soon as it is ready.
+
+    Synthesis runs in a worker thread so the event loop keeps serving other sessions, and a producer
+    task keeps synthesizing the next group while the current one is being sent. Each piece is sent as
+    an "answer_chunk" message followed by a binary frame with the raw audio, and an "answer_end"
+    message is sent once all audio has been sent.
+
+    Args:
+        websocket: The websocket connection.
+        tts: The TTS client.
+        text: The answer text to speak.
+        prefetched: Synthesis tasks for text preceding `text`, sent first and in order.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+
+    async def produce():
+        try:
+            for task in prefetched:
+                await queue.put(await task)
+            for chunk in _split_for_tts(text):
+                await queue.put(await asyncio.to_thread(tts.synthesize, chunk))
+        finally:
+            await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    sent = 0
+    try:
+        while (audio_bytes := await queue.get()) is not None:
+            # Raw audio goes in the binary frame right after its metadata, avoiding base64 overhead
+            await _send_json(websocket, {
+                "type": "answer_chunk",
+                "index": sent,
+                "audio_bytes": len(audio_bytes),
+            })
+            await websocket.send_bytes(audio_bytes)
+            sent += 1
+        # Surface synthesis errors from the producer
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+        for task in prefetched:
+            task.cancel()
+        await _send_json(websocket, {"type": "answer_end", "chunks": sent})
+
+
+class _SpeculativeTTS:
+    """
+    Start synthesizing the leading sentence groups of an answer while the rest is still being generated.
+
+    Streamed tokens are fed in as they arrive and each complete group of at least `min_chars` characters
+    is synthesized in a worker thread right away. Nothing is sent until the final answer is known: the
+    chat pipeline cleans the answer after streaming, so `speak` only reuses the prefetched audio when
+    the final answer still starts with the synthesized text, and otherwise starts over.
+    """
+
+    # Later groups are synthesized by _stream_tts_audio while earlier ones are being sent
+    max_prefetch = 2
+
+    def __init__(self, tts: GroqTTS, min_chars: int = 120):
+        self._tts = tts
+        self._min_chars = min_chars
+        self._pending = ""
+        self._synthesized = ""
+        self._tasks: List[asyncio.Task] = []
+
+    def feed(self, chunk: str) -> None:
+        """Add streamed text, starting synthesis of the next sentence group once it is complete."""
+        if len(self._tasks) >= self.max_prefetch:
+            return
+        self._pending += chunk
+        match = _SENTENCE_SPLIT_RE.search(self._pending, self._min_chars)
+        if match is None:
+            return
+        text = self._pending[:match.start()]
+        self._synthesized += self._pending[:match.end()]
+        self._pending = self._pending[match.end():]
+        task = asyncio.create_task(asyncio.to_thread(self._tts.synthesize, text))
+        # Discarded tasks may fail unobserved; retrieve their exception so it isn't reported as lost
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._tasks.append(task)
+
+    def cancel(self) -> None:
+        """Drop any prefetched audio (e.g. when the answer turns out not to be spoken)."""
+        for task in self._tasks:
+            task.cancel()
+
+    async def speak(self, websocket: WebSocket, answer: str) -> None:
+        """Send the audio for the final answer, reusing prefetched audio where it still matches."""
+        synthesized = self._synthesized.strip()
+        if not self._tasks or not answer.startswith(synthesized):
+            self.cancel()
+            await _stream_tts_audio(websocket, self._tts, answer)
+            return
+        await _stream_tts_audio(websocket, self._tts, answer[len(synthesized):], prefetched=self._tasks)
+
+
 @app.websocket("/ws/voice")
 async def websocket_voice_conversation(websocket: WebSocket):
     """WebSocket endpoint for voice conversation."""
     await websocket.accept()
     
     try:
-        # Send connected message immediately
-        await websocket.send_json({"type": "connected", "message": "WebSocket connected"})
+        # Send connected/status messages in the background so they overlap with initialization
+        status_tasks = [_notify(websocket, {"type": "connected", "message": "WebSocket connected"})]
         
         # Initialize speech modules and LLM dependencies asynchronously
         logger.info("Initializing speech modules...")
-        await websocket.send_json({"type": "status", "message": "Initializing speech modules..."})
+        status_tasks.append(_notify(websocket, {"type": "status", "message": "Initializing speech modules..."}))
         
-        # Initialize STT, TTS, and VAD
-        stt = GroqSTT()
-        tts = GroqTTS()
+        # Reuse the STT and TTS built at startup; fall back to building them for this connection. The VAD
+        # tracks this speaker's RMS history, so it is per connection (the Silero model itself is shared).
+        app_state = websocket.app.state
+        stt = getattr(app_state, "stt", None) or GroqSTT()
+        tts = getattr(app_state, "tts", None) or GroqTTS()
         vad = VoiceActivityDetector()
         
-        await websocket.send_json({"type": "status", "message": "Speech modules initialized"})
+        status_tasks.append(_notify(websocket, {"type": "status", "message": "Speech modules initialized"}))
         
         # Initialize LLM and vector store
         logger.info("Initializing LLM and vector store...")
-        await websocket.send_json({"type": "status", "message": "Initializing LLM and vector store..."})
+        status_tasks.append(_notify(websocket, {"type": "status", "message": "Initializing LLM and vector store..."}))
         
         llm = get_llm_client()
         vector_store = get_vector_store()
         intent_router = get_intent_router()
         ctx_synthesis_strategy = get_ctx_synthesis_strategy("create-and-refine")
         
-        await websocket.send_json({"type": "ready", "message": "All dependencies initialized"})
+        # Make sure every status message has been written before "ready" so the client sees them in order
+        await asyncio.gather(*status_tasks)
+        await _send_json(websocket, {"type": "ready", "message": "All dependencies initialized"})
         logger.info("All dependencies initialized, ready for voice conversation")
         
         # Wait for init message from client
-        init_data = await websocket.receive_json()
+        init_data = _loads_json(await websocket.receive_text())
         if init_data.get("type") != "init":
-            await websocket.send_json({"type": "error", "message": "Expected init message"})
+            await _send_json(websocket, {"type": "error", "message": "Expected init message"})
             return
         
         session_id = init_data.get("session_id", "default_session")
-        chat_history = session_manager.get_or_create_session(session_id, total_length=2)
+        chat_history = await session_manager.async_get_or_create_session(session_id, total_length=2)
         # Initialize slot manager for voice endpoint (same as text endpoint)
         slot_manager = session_manager.get_or_create_slot_manager(session_id, llm)
         
@@ -6330,7 +6633,7 @@ async def websocket_voice_conversation(websocket: WebSocket):
                         try:
                             # Validate audio bytes before processing
                             if not audio_bytes or len(audio_bytes) < 100:
-                                await websocket.send_json({
+                                await _send_json(websocket, {
                                     "type": "error",
                                     "message": "Invalid audio data - please try speaking again"
                                 })
@@ -6342,7 +6645,7 @@ async def websocket_voice_conversation(websocket: WebSocket):
                             
                             # Verify file was written correctly
                             if not os.path.exists(tmp_audio_path) or os.path.getsize(tmp_audio_path) == 0:
-                                await websocket.send_json({
+                                await _send_json(websocket, {
                                     "type": "error",
                                     "message": "Failed to process audio - please try speaking again"
                                 })
@@ -6386,7 +6689,7 @@ async def websocket_voice_conversation(websocket: WebSocket):
                                         confidence = min(audio_rms / vad.energy_threshold, 1.0)  # Recalculate confidence
                                     else:
                                         logger.warning(f"Rejecting - VAD detected no voice and RMS too low. RMS: {audio_rms:.4f}, Confidence: {confidence:.2f}")
-                                        await websocket.send_json({
+                                        await _send_json(websocket, {
                                             "type": "error",
                                             "message": "No human speech detected in audio - please try speaking again"
                                         })
@@ -6401,7 +6704,7 @@ async def websocket_voice_conversation(websocket: WebSocket):
                                         logger.info(f"Recalculated confidence from RMS: {confidence:.2f}")
                                     else:
                                         logger.warning(f"Rejecting - VAD confidence too low: {confidence:.2f} (minimum: 0.1) and RMS too low: {audio_rms:.4f}")
-                                        await websocket.send_json({
+                                        await _send_json(websocket, {
                                             "type": "error",
                                             "message": "Speech quality too low - please speak more clearly"
                                         })
@@ -6420,35 +6723,29 @@ async def websocket_voice_conversation(websocket: WebSocket):
                         except Exception as file_error:
                             # Catch any file-related errors
                             logger.error(f"Error processing audio file: {file_error}")
-                            await websocket.send_json({
+                            await _send_json(websocket, {
                                 "type": "error",
                                 "message": "Error processing audio - please try speaking again"
                             })
                             continue
                         finally:
-                            # Clean up temporary file
-                            if tmp_audio_path and os.path.exists(tmp_audio_path):
-                                try:
-                                    os.unlink(tmp_audio_path)
-                                except Exception:
-                                    pass
+                            # Clean up temporary file (single syscall, no error if it is already gone)
+                            if tmp_audio_path:
+                                Path(tmp_audio_path).unlink(missing_ok=True)
                         
                         # Validate transcription - reject very short or common false positives
                         transcribed_text_clean = transcribed_text.strip().lower() if transcribed_text else ""
                         
-                        # Reject common false positives from silence/noise
-                        false_positives = ["thank you", "thanks", "ok", "okay", "yes", "no", "uh", "um", "ah", "hmm"]
-                        
-                        if not transcribed_text or len(transcribed_text.strip()) < 3:
-                            await websocket.send_json({
+                        if len(transcribed_text_clean) < 3:
+                            await _send_json(websocket, {
                                 "type": "error",
                                 "message": "No speech detected in audio"
                             })
                             continue
                         
                         # Reject if transcription is just a false positive (likely noise/silence)
-                        if transcribed_text_clean in false_positives:
-                            await websocket.send_json({
+                        if transcribed_text_clean in _STT_FALSE_POSITIVES:
+                            await _send_json(websocket, {
                                 "type": "error",
                                 "message": "No meaningful speech detected (likely background noise)"
                             })
@@ -6458,6 +6755,8 @@ async def websocket_voice_conversation(websocket: WebSocket):
                         # This ensures voice uses the same logic as text chat
                         logger.info(f"📤 Sending transcribed text to streaming chat API: {transcribed_text}")
                         
+                        # Synthesizes the first sentences while the rest of the answer is generated
+                        speculative_tts = _SpeculativeTTS(tts)
                         try:
                             # Get base URL from environment or use default
                             base_url = os.getenv("API_BASE_URL", "http://localhost:8002")
@@ -6471,71 +6770,67 @@ async def websocket_voice_conversation(websocket: WebSocket):
                                 "k": 3
                             }
                             
-                            # Call the streaming chat endpoint
-                            async with httpx.AsyncClient(timeout=120.0) as client:
-                                async with client.stream("POST", stream_url, json=chat_request_data) as response:
-                                    if response.status_code != 200:
-                                        error_text = await response.aread()
-                                        raise Exception(f"Chat API returned {response.status_code}: {error_text.decode()}")
+                            # Call the streaming chat endpoint over the pooled client created in the app lifespan
+                            client = websocket.app.state.http
+                            async with client.stream("POST", stream_url, json=chat_request_data) as response:
+                                if response.status_code != 200:
+                                    error_text = await response.aread()
+                                    raise Exception(f"Chat API returned {response.status_code}: {error_text.decode()}")
                                     
-                                    # Collect streaming response
-                                    full_answer = ""
-                                    sources_list = []
-                                    cottage_images = {}
-                                    follow_up_actions = None
+                                # Collect streaming response
+                                full_answer = ""
+                                sources_list = []
+                                cottage_images = {}
+                                follow_up_actions = None
                                     
-                                    async for line in response.aiter_lines():
-                                        if not line.startswith("data: "):
-                                            continue
+                                async for line in response.aiter_lines():
+                                    if not line.startswith("data: "):
+                                        continue
                                         
-                                        try:
-                                            data = json.loads(line[6:])  # Remove "data: " prefix
+                                    try:
+                                        data = _loads_json(line[6:])  # Remove "data: " prefix
                                             
-                                            if data.get("type") == "token":
-                                                # Accumulate tokens as they stream
-                                                full_answer += data.get("chunk", "")
+                                        if data.get("type") == "token":
+                                            # Accumulate tokens as they stream
+                                            chunk = data.get("chunk", "")
+                                            full_answer += chunk
+                                            speculative_tts.feed(chunk)
                                             
-                                            elif data.get("type") == "done":
-                                                # Final response with complete answer
-                                                full_answer = data.get("answer", full_answer)
-                                                sources_list = data.get("sources", [])
-                                                cottage_images = data.get("cottage_images", {})
-                                                follow_up_actions = data.get("follow_up_actions")
-                                                break
+                                        elif data.get("type") == "done":
+                                            # Final response with complete answer
+                                            full_answer = data.get("answer", full_answer)
+                                            sources_list = data.get("sources", [])
+                                            cottage_images = data.get("cottage_images", {})
+                                            follow_up_actions = data.get("follow_up_actions")
+                                            break
                                             
-                                            elif data.get("type") == "error":
-                                                raise Exception(data.get("message", "Error from chat API"))
+                                        elif data.get("type") == "error":
+                                            if data.get("code") == "rate_limited":
+                                                raise GroqThrottledError(data.get("retry_after", 0))
+                                            raise Exception(data.get("message", "Error from chat API"))
                                         
-                                        except json.JSONDecodeError as e:
-                                            logger.warning(f"Failed to parse SSE data: {line[:100]}, error: {e}")
-                                            continue
+                                    except json.JSONDecodeError as e:
+                                        logger.warning(f"Failed to parse SSE data: {line[:100]}, error: {e}")
+                                        continue
                             
                             logger.info(f"✅ Received answer from streaming API: {full_answer[:200]}...")
                             
                             # Update chat history
                             if full_answer:
-                                chat_history.append(f"question: {transcribed_text}, answer: {full_answer}")
+                                chat_history.append((transcribed_text, full_answer))
+                                await session_manager.async_save_session(session_id)
                             
                             # Validate answer before TTS
                             if not full_answer or len(full_answer.strip()) < 10:
-                                await websocket.send_json({
+                                await _send_json(websocket, {
                                     "type": "error",
                                     "message": "Answer too short, skipping TTS"
                                 })
                                 continue
                             
-                            # Check for "no information" indicators
-                            answer_lower = full_answer.lower().strip()
-                            no_info_phrases = [
-                                "i don't know",
-                                "i cannot",
-                                "i'm not able",
-                                "i don't have",
-                                "no information",
-                                "couldn't find"
-                            ]
-                            if any(phrase in answer_lower for phrase in no_info_phrases) and len(full_answer) < 50:
-                                await websocket.send_json({
+                            # Check for "no information" indicators (only short answers are scanned)
+                            if len(full_answer) < 50 and _NO_INFO_RE.search(full_answer):
+                                await _send_json(websocket, {
                                     "type": "answer",
                                     "text": full_answer,
                                     "question": transcribed_text,
@@ -6545,72 +6840,75 @@ async def websocket_voice_conversation(websocket: WebSocket):
                                 })
                                 continue
                             
-                            # Generate TTS audio from the streamed answer
-                            print(f"🔊 Generating TTS audio for answer...")
-                            tts_audio_bytes = tts.synthesize(full_answer)
-                            
-                            # Send answer text and audio
-                            audio_base64 = base64.b64encode(tts_audio_bytes).decode('utf-8')
-                            await websocket.send_json({
+                            # Send the answer text right away; its audio follows as "answer_chunk" messages
+                            await _send_json(websocket, {
                                 "type": "answer",
                                 "text": full_answer,
-                                "audio": audio_base64,
+                                "audio_streaming": True,
                                 "question": transcribed_text,
                                 "sources": sources_list,
                                 "cottage_images": cottage_images,
                                 "follow_up_actions": follow_up_actions
                             })
+                            
+                            # Generate TTS audio from the streamed answer, one sentence group at a time
+                            print(f"🔊 Generating TTS audio for answer...")
+                            await speculative_tts.speak(websocket, full_answer)
                         
                         except httpx.TimeoutException:
                             logger.error("Timeout calling streaming chat API")
-                            await websocket.send_json({
+                            await _send_json(websocket, {
                                 "type": "error",
                                 "message": "Request timed out. Please try again."
                             })
                             continue
                         
+                        except GroqThrottledError as e:
+                            logger.warning(f"Voice turn throttled: {e}")
+                            await _send_json(websocket, {
+                                "type": "error",
+                                "code": "rate_limited",
+                                "message": str(e)
+                            })
+                            continue
+                        
                         except Exception as e:
-                            logger.error(f"Error calling streaming chat API: {e}", exc_info=True)
-                            await websocket.send_json({
+                            voice_logger.error(f"Error calling streaming chat API: {e}", exc_info=True)
+                            await _send_json(websocket, {
                                 "type": "error",
-                                "message": f"Error processing question: {str(e)}"
+                                "code": "chat_failed",
+                                "message": "Error processing question. Please try again."
                             })
                             continue
                         
+                        finally:
+                            # No-op once the audio was sent; drops prefetched audio on skipped or failed turns
+                            speculative_tts.cancel()
+                        
                     except Exception as e:
-                        logger.error(f"Error processing voice input: {e}", exc_info=True)
-                        await websocket.send_json({
+                        voice_logger.error(f"Error processing voice input: {e}", exc_info=True)
+                        await _send_json(websocket, {
                             "type": "error",
-                            "message": f"Error processing audio: {str(e)}"
+                            "code": "audio_failed",
+                            "message": "Error processing audio - please try speaking again"
                         })
-                    finally:
-                        # Clean up temporary files if they were created
-                        cleanup_paths = []
-                        if 'tmp_audio_path' in locals() and tmp_audio_path:
-                            cleanup_paths.append(tmp_audio_path)
-                        
-                        for path in cleanup_paths:
-                            try:
-                                if path and os.path.exists(path):
-                                    os.unlink(path)
-                            except Exception:
-                                pass
                 
                 elif "text" in data:
                     # Text message (for control messages)
-                    message = json.loads(data["text"])
+                    message = _loads_json(data["text"])
                     if message.get("type") == "cancel":
                         # Client requested cancellation
-                        await websocket.send_json({"type": "cancelled"})
+                        await _send_json(websocket, {"type": "cancelled"})
                 
             except WebSocketDisconnect:
                 logger.info("WebSocket disconnected")
                 break
             except Exception as e:
-                logger.error(f"Error in WebSocket loop: {e}", exc_info=True)
-                await websocket.send_json({
+                voice_logger.error(f"Error in WebSocket loop: {e}", exc_info=True)
+                await _send_json(websocket, {
                     "type": "error",
-                    "message": f"Internal error: {str(e)}"
+                    "code": "internal_error",
+                    "message": "Internal error. Please try again."
                 })
     
     except WebSocketDisconnect:
@@ -6618,7 +6916,7 @@ async def websocket_voice_conversation(websocket: WebSocket):
     except Exception as e:
         logger.error(f"Error in WebSocket endpoint: {e}", exc_info=True)
         try:
-            await websocket.send_json({
+            await _send_json(websocket, {
                 "type": "error",
                 "message": f"Initialization error: {str(e)}"
             })
@@ -1,7 +1,10 @@
 """Pydantic models for FastAPI request/response schemas."""
 
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any, Union
+from pydantic import BaseModel, ConfigDict, Field
+
+# Response models are built once per response and never mutated, so they are frozen
+RESPONSE_MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True)
 
 
 class ChatRequest(BaseModel):
@@ -18,17 +21,23 @@ class ChatRequest(BaseModel):
 class SourceInfo(BaseModel):
     """Source document information."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     document: str = Field(..., description="Source document name")
     score: Optional[str] = Field(None, description="Relevance score")
     content_preview: Optional[str] = Field(None, description="Preview of document content")
     
     @classmethod
     def from_dict(cls, src: dict) -> "SourceInfo":
-        """Create SourceInfo from dictionary, converting score to string if needed."""
+        """
+        Create SourceInfo from dictionary, converting score to string if needed.
+
+        Sources are built internally from retrieved documents, so validation is skipped.
+        """
         score = src.get("score")
         if score is not None and not isinstance(score, str):
             score = str(score)
-        return cls(
+        return cls.model_construct(
             document=src.get("document", "unknown"),
             score=score,
             content_preview=src.get("content_preview", ""),
@@ -38,6 +47,8 @@ class SourceInfo(BaseModel):
 class FollowUpAction(BaseModel):
     """Follow-up action button model."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     text: str = Field(..., description="Button text")
     action: str = Field(..., description="Action type (booking, contact, pricing, etc.)")
     type: str = Field(default="button", description="Action type: button or suggestion")
@@ -46,17 +57,21 @@ class FollowUpAction(BaseModel):
 class ChatResponse(BaseModel):
     """Response model for chat endpoint."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     answer: str = Field(..., description="Generated answer")
     sources: List[SourceInfo] = Field(default_factory=list, description="Retrieved source documents")
     intent: str = Field(..., description="Detected intent type")
     session_id: str = Field(..., description="Session ID")
-    cottage_images: Optional[Any] = Field(None, description="Cottage image URLs if requested. Can be List[str] for single cottage or Dict[str, List[str]] for multiple cottages grouped by cottage number")
+    cottage_images: Optional[Union[List[str], Dict[str, List[str]]]] = Field(None, description="Cottage image URLs if requested. Can be List[str] for single cottage or Dict[str, List[str]] for multiple cottages grouped by cottage number")
     follow_up_actions: Optional[Dict[str, Any]] = Field(None, description="Follow-up actions with quick_actions (buttons) and suggestions (text chips)")
 
 
 class HealthResponse(BaseModel):
     """Response model for health check endpoint."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     status: str = Field(..., description="Status message")
     vector_store_loaded: bool = Field(..., description="Whether vector store is loaded")
     model_loaded: bool = Field(..., description="Whether LLM model is loaded")
@@ -71,6 +86,8 @@ class ClearSessionRequest(BaseModel):
 class ClearSessionResponse(BaseModel):
     """Response model for clear session endpoint."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     status: str = Field(..., description="Status message")
     message: str = Field(..., description="Detailed message")
 
@@ -78,4 +95,20 @@ class ClearSessionResponse(BaseModel):
 class ImagesResponse(BaseModel):
     """Response model for images endpoint."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     images: List[str] = Field(..., description="List of image URLs")
+
+
+# Resolve every schema at import time so no request pays for a deferred build
+for _model in (
+    ChatRequest,
+    SourceInfo,
+    FollowUpAction,
+    ChatResponse,
+    HealthResponse,
+    ClearSessionRequest,
+    ClearSessionResponse,
+    ImagesResponse,
+):
+    _model.model_rebuild(force=True)
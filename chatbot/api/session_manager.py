@@ -1,10 +1,21 @@
 """Session manager for handling chat history per session."""
 
+import asyncio
+import json
+import os
 import sys
 import threading
 from pathlib import Path
 from typing import Dict, Optional, TYPE_CHECKING, Union, Any
 
+from cachetools import TTLCache
+
+try:
+    import redis
+except ImportError:
+    # redis is optional - sessions stay process-local without it
+    redis = None
+
 # Add chatbot directory to path
 chatbot_dir = Path(__file__).parent.parent
 if str(chatbot_dir) not in sys.path:
@@ -13,22 +24,125 @@ if str(chatbot_dir) not in sys.path:
 from bot.conversation.chat_history import ChatHistory
 from bot.conversation.slot_manager import SlotManager
 from bot.conversation.context_tracker import ContextTracker
+from helpers.log import get_logger
+
+logger = get_logger(__name__)
 
 if TYPE_CHECKING:
     from bot.client.lama_cpp_client import LamaCppClient
     from bot.client.groq_client import GroqClient
 
+# Number of lock shards; must be a power of two so a shard can be picked with a bit mask
+_LOCK_SHARDS = 16
+
+
+class RedisSessionBackend:
+    """
+    Stores each session's chat history in Redis so it can be shared between workers and survives restarts.
+
+    Only the (question, answer) turns are stored. Slot managers, context trackers and session data stay in the
+    memory of the worker that created them, so a session that moves to another worker keeps its history but
+    starts with empty slots and context. Keys expire after `ttl` seconds without a write, so abandoned sessions
+    are evicted by Redis itself.
+    """
+
+    def __init__(self, url: str, ttl: int = 3600, prefix: str = "session:"):
+        """
+        Initialize the Redis backend.
+
+        Args:
+            url: Redis connection URL (e.g. redis://localhost:6379/0)
+            ttl: Expiry of a session in seconds, refreshed on every write
+            prefix: Prefix for the Redis keys
+        """
+        if redis is None:
+            raise ImportError("redis package is required. Install with: pip install redis")
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, session_id: str) -> Optional[bytes]:
+        """Return the stored state for a session, or None if there is none."""
+        return self.client.get(self.prefix + session_id)
+
+    def set(self, session_id: str, value: bytes) -> None:
+        """Store the state for a session and refresh its expiry."""
+        self.client.set(self.prefix + session_id, value, ex=self.ttl)
+
+    def delete(self, session_id: str) -> None:
+        """Remove the stored state for a session."""
+        self.client.delete(self.prefix + session_id)
+
+
+def create_session_backend() -> Optional[RedisSessionBackend]:
+    """
+    Create the session backend configured via environment variables.
+
+    Sessions are shared through Redis when REDIS_URL is set (with SESSION_TTL_SECONDS as the expiry,
+    default 3600). Otherwise None is returned and sessions are kept in process memory only.
+
+    Returns:
+        RedisSessionBackend or None
+    """
+    url = os.getenv("REDIS_URL")
+    if not url:
+        return None
+    try:
+        return RedisSessionBackend(url, ttl=int(os.getenv("SESSION_TTL_SECONDS", "3600")))
+    except Exception as e:
+        logger.warning(f"Could not set up Redis session backend, keeping sessions in memory: {e}")
+        return None
+
+
+class _SessionShard:
+    """
+    The state of every session that hashes to one shard, guarded by that shard's lock.
+
+    Each store is a TTLCache, so idle sessions expire and the number of sessions kept in memory is
+    bounded. TTLCache is not thread-safe and even reads reorder it, so it is only touched under `lock`.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.lock = threading.Lock()
+        self.sessions: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.slot_managers: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.context_trackers: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.session_data: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)  # Store additional session data
+
+    def stores(self) -> tuple:
+        return self.sessions, self.slot_managers, self.context_trackers, self.session_data
+
+
+def _touch(cache: TTLCache, session_id: str) -> Any:
+    """Return a cached entry (or None), re-inserting it so its expiry counts from this access."""
+    value = cache.get(session_id)
+    if value is not None:
+        cache[session_id] = value
+    return value
+
 
 class SessionManager:
     """Manages chat sessions and their associated chat history, slots, and context."""
     
-    def __init__(self):
-        """Initialize the session manager."""
-        self._sessions: Dict[str, ChatHistory] = {}
-        self._slot_managers: Dict[str, SlotManager] = {}
-        self._context_trackers: Dict[str, ContextTracker] = {}
-        self._session_data: Dict[str, Dict[str, Any]] = {}  # Store additional session data
-        self._lock = threading.Lock()
+    def __init__(self, backend: Optional[RedisSessionBackend] = None, max_sessions: int = 10000, ttl: int = 3600):
+        """
+        Initialize the session manager.
+
+        Args:
+            backend: Optional shared store for chat histories. The history is re-read from it on every
+                `get_or_create_session`, so turns saved by other workers are seen without sticky sessions.
+                Slots, context and session data are not shared (see RedisSessionBackend). Async callers
+                should use the `async_` methods, which do the backend I/O in a worker thread.
+            max_sessions: Maximum number of sessions kept in memory; the least recently used are evicted.
+            ttl: Seconds after its last use before an idle session is evicted from memory.
+        """
+        self._backend = backend
+        # Sessions are spread over lock shards so different sessions don't serialize on one lock
+        self._shards = [_SessionShard(max(1, max_sessions // _LOCK_SHARDS), ttl) for _ in range(_LOCK_SHARDS)]
+    
+    def _shard_for(self, session_id: str) -> _SessionShard:
+        """Return the shard holding the given session."""
+        return self._shards[hash(session_id) & (_LOCK_SHARDS - 1)]
     
     def get_or_create_session(self, session_id: str, total_length: int = 2) -> ChatHistory:
         """
@@ -41,10 +155,80 @@ class SessionManager:
         Returns:
             ChatHistory: The chat history for this session
         """
-        with self._lock:
-            if session_id not in self._sessions:
-                self._sessions[session_id] = ChatHistory(total_length=total_length)
-            return self._sessions[session_id]
+        # Read the backend outside the lock; without one this is None and the in-memory history is used as is
+        return self._attach_turns(session_id, self._load_turns(session_id), total_length)
+    
+    async def async_get_or_create_session(self, session_id: str, total_length: int = 2) -> ChatHistory:
+        """
+        Async counterpart of get_or_create_session that reads the backend without blocking the event loop.
+        
+        Args:
+            session_id: Unique session identifier
+            total_length: Maximum number of messages to keep in history
+            
+        Returns:
+            ChatHistory: The chat history for this session
+        """
+        turns = await asyncio.to_thread(self._load_turns, session_id) if self._backend is not None else None
+        return self._attach_turns(session_id, turns, total_length)
+    
+    def _attach_turns(self, session_id: str, turns: Optional[list], total_length: int) -> ChatHistory:
+        """Return the session's in-memory chat history, created or refreshed from the backend's turns."""
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            chat_history = _touch(shard.sessions, session_id)
+            if chat_history is None:
+                chat_history = shard.sessions[session_id] = ChatHistory(turns, total_length=total_length)
+            elif turns is not None:
+                # Another worker may have saved turns since this one last saw the session; refresh in place so
+                # holders of this ChatHistory see them too
+                chat_history.clear()
+                chat_history.extend(turns)
+            return chat_history
+    
+    def _load_turns(self, session_id: str) -> Optional[list]:
+        """Load a session's chat history (question, answer) turns from the backend, if one is configured."""
+        if self._backend is None:
+            return None
+        try:
+            data = self._backend.get(session_id)
+            # JSON stores turns as lists; ChatHistory expects tuples
+            return [tuple(turn) for turn in json.loads(data)] if data else None
+        except Exception as e:
+            logger.warning(f"Could not load session {session_id} from backend: {e}")
+            return None
+    
+    def save_session(self, session_id: str) -> None:
+        """
+        Write a session's chat history through to the backend (no-op without a backend).
+        
+        Call this after appending to the chat history so other workers see the new turn.
+        
+        Args:
+            session_id: Session ID to save
+        """
+        if self._backend is None:
+            return
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            chat_history = shard.sessions.get(session_id)
+            turns = list(chat_history) if chat_history is not None else None
+        if turns is None:
+            return
+        try:
+            self._backend.set(session_id, json.dumps(turns).encode("utf-8"))
+        except Exception as e:
+            logger.warning(f"Could not save session {session_id} to backend: {e}")
+    
+    async def async_save_session(self, session_id: str) -> None:
+        """
+        Async counterpart of save_session that writes to the backend without blocking the event loop.
+        
+        Args:
+            session_id: Session ID to save
+        """
+        if self._backend is not None:
+            await asyncio.to_thread(self.save_session, session_id)
     
     def get_or_create_slot_manager(
         self, 
@@ -61,10 +245,12 @@ class SessionManager:
         Returns:
             SlotManager: The slot manager for this session
         """
-        with self._lock:
-            if session_id not in self._slot_managers:
-                self._slot_managers[session_id] = SlotManager(session_id, llm)
-            return self._slot_managers[session_id]
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            slot_manager = _touch(shard.slot_managers, session_id)
+            if slot_manager is None:
+                slot_manager = shard.slot_managers[session_id] = SlotManager(session_id, llm)
+            return slot_manager
     
     def get_or_create_context_tracker(self, session_id: str) -> ContextTracker:
         """
@@ -76,10 +262,12 @@ class SessionManager:
         Returns:
             ContextTracker: The context tracker for this session
         """
-        with self._lock:
-            if session_id not in self._context_trackers:
-                self._context_trackers[session_id] = ContextTracker(session_id)
-            return self._context_trackers[session_id]
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            context_tracker = _touch(shard.context_trackers, session_id)
+            if context_tracker is None:
+                context_tracker = shard.context_trackers[session_id] = ContextTracker(session_id)
+            return context_tracker
     
     def clear_session(self, session_id: str) -> bool:
         """
@@ -91,21 +279,23 @@ class SessionManager:
         Returns:
             bool: True if session was cleared, False if session didn't exist
         """
-        with self._lock:
+        shard = self._shard_for(session_id)
+        with shard.lock:
             cleared = False
-            if session_id in self._sessions:
-                self._sessions[session_id].clear()
+            if session_id in shard.sessions:
+                shard.sessions[session_id].clear()
                 cleared = True
-            if session_id in self._slot_managers:
-                self._slot_managers[session_id].clear_slots()
+            if session_id in shard.slot_managers:
+                shard.slot_managers[session_id].clear_slots()
                 cleared = True
-            if session_id in self._context_trackers:
-                self._context_trackers[session_id].clear()
+            if session_id in shard.context_trackers:
+                shard.context_trackers[session_id].clear()
                 cleared = True
-            if session_id in self._session_data:
-                self._session_data[session_id].clear()
+            if session_id in shard.session_data:
+                shard.session_data[session_id].clear()
                 cleared = True
-            return cleared
+        self._delete_from_backend(session_id)
+        return cleared
     
     def delete_session(self, session_id: str) -> bool:
         """
@@ -117,21 +307,23 @@ class SessionManager:
         Returns:
             bool: True if session was deleted, False if session didn't exist
         """
-        with self._lock:
+        shard = self._shard_for(session_id)
+        with shard.lock:
             deleted = False
-            if session_id in self._sessions:
-                del self._sessions[session_id]
-                deleted = True
-            if session_id in self._slot_managers:
-                del self._slot_managers[session_id]
-                deleted = True
-            if session_id in self._context_trackers:
-                del self._context_trackers[session_id]
-                deleted = True
-            if session_id in self._session_data:
-                del self._session_data[session_id]
-                deleted = True
-            return deleted
+            for store in shard.stores():
+                if store.pop(session_id, None) is not None:
+                    deleted = True
+        self._delete_from_backend(session_id)
+        return deleted
+    
+    def _delete_from_backend(self, session_id: str) -> None:
+        """Remove a session's stored chat history from the backend, if one is configured."""
+        if self._backend is None:
+            return
+        try:
+            self._backend.delete(session_id)
+        except Exception as e:
+            logger.warning(f"Could not delete session {session_id} from backend: {e}")
     
     def get_session_data(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -143,8 +335,9 @@ class SessionManager:
         Returns:
             Dictionary with session data or None if session doesn't exist
         """
-        with self._lock:
-            return self._session_data.get(session_id)
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            return _touch(shard.session_data, session_id)
     
     def set_session_data(self, session_id: str, key: str, value: Any) -> None:
         """
@@ -155,10 +348,12 @@ class SessionManager:
             key: Data key
             value: Data value
         """
-        with self._lock:
-            if session_id not in self._session_data:
-                self._session_data[session_id] = {}
-            self._session_data[session_id][key] = value
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            session_data = _touch(shard.session_data, session_id)
+            if session_data is None:
+                session_data = shard.session_data[session_id] = {}
+            session_data[key] = value
     
     def clear_session_data(self, session_id: str) -> None:
         """
@@ -167,10 +362,15 @@ class SessionManager:
         Args:
             session_id: Session ID
         """
-        with self._lock:
-            if session_id in self._session_data:
-                self._session_data[session_id].clear()
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            if session_id in shard.session_data:
+                shard.session_data[session_id].clear()
 
 
 # Global session manager instance
-session_manager = SessionManager()
+session_manager = SessionManager(
+    backend=create_session_backend(),
+    max_sessions=int(os.getenv("MAX_SESSIONS", "10000")),
+    ttl=int(os.getenv("SESSION_TTL_SECONDS", "3600")),
+)
@@ -1,10 +1,18 @@
+import asyncio
+import functools
+import hashlib
+import importlib.util
+import json
 import os
 import logging
-from typing import Any, Iterator
+import math
+import threading
+import time
+from typing import Any, AsyncIterator, Iterator, Sequence
 
-from groq import Groq
-
-logger = logging.getLogger(__name__)
+import httpx
+from cachetools import TTLCache
+from groq import AsyncGroq, Groq, RateLimitError
 
 from bot.client.prompt import (
     CTX_PROMPT_TEMPLATE,
@@ -19,6 +27,336 @@ from bot.client.prompt import (
     generate_refined_ctx_prompt,
 )
 from bot.model.base_model import ModelSettings
+from bot.model.settings.llama import Llama31Settings
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - stream chunks fall back to the standard library decoder
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Adjacent stream deltas are coalesced into batches, so consumers handle a few larger tokens instead of one
+# dict per Groq chunk. The first batch is a single delta to keep time-to-first-token unchanged; each batch
+# after that is STREAM_BATCH_GROWTH_FACTOR times larger, up to STREAM_MAX_BATCH_SIZE deltas. A partial batch
+# is also flushed when a delta arrives STREAM_FLUSH_INTERVAL seconds or more after the previous flush. There
+# is no timer, so during a pause buffered deltas wait for the next delta or the end of the stream.
+STREAM_BATCH_GROWTH_FACTOR = 3
+STREAM_MAX_BATCH_SIZE = 16
+STREAM_FLUSH_INTERVAL = 0.05
+
+# Stop sequences for early stopping; an immutable tuple shared by every call. Groq applies them server
+# side, and the streamer also checks them so a model that overshoots is cut off client side.
+STOP_SEQUENCES = ("\n\n\n", "---", "###", "##")
+# Characters of earlier output kept to catch a stop sequence split across two batches
+_STOP_TAIL_CHARS = max(len(stop) for stop in STOP_SEQUENCES) - 1
+
+# Retries the SDK makes on 429s and transient errors, honouring the server's Retry-After header. The sync
+# client is called from inside async request handlers, where the SDK's back-off sleeps would block the event
+# loop, so it retries at most once and only the async client uses the full count.
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "5"))
+GROQ_SYNC_MAX_RETRIES = min(GROQ_MAX_RETRIES, 1)
+
+# Connection settings for the shared Groq clients. Streams multiplex over HTTP/2 when the optional h2
+# package is installed, so concurrent sessions don't queue for pooled HTTP/1.1 connections.
+GROQ_HTTP2 = importlib.util.find_spec("h2") is not None
+GROQ_HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=50)
+GROQ_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Account quotas for proactive throttling; requests wait for capacity instead of being rejected with a 429.
+# Unset or 0 disables the corresponding limit.
+GROQ_RPM = int(os.getenv("GROQ_RPM", "0"))
+GROQ_TPM = int(os.getenv("GROQ_TPM", "0"))
+
+# Groq SDK clients shared by every GroqClient with the same API key, so they share one connection pool
+_CLIENT_CACHE: dict[str, Groq] = {}
+_ASYNC_CLIENT_CACHE: dict[str, AsyncGroq] = {}
+
+# Completed answers keyed by a digest of (model, system prompt, max tokens, prompt), so repeated FAQ-style
+# questions with the same retrieved context skip the API call. Answers are sampled at temperature 0.7, so
+# caching freezes one sample per prompt; the cache is opt-in via GROQ_RESPONSE_CACHE_SIZE > 0.
+RESPONSE_CACHE_SIZE = int(os.getenv("GROQ_RESPONSE_CACHE_SIZE", "0"))
+RESPONSE_CACHE_TTL = int(os.getenv("GROQ_RESPONSE_CACHE_TTL_SECONDS", "3600"))
+_RESPONSE_CACHE: TTLCache | None = (
+    TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL) if RESPONSE_CACHE_SIZE > 0 else None
+)
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def _get_shared_groq(api_key: str) -> Groq:
+    """Return the process-wide Groq client for an API key, creating it on first use."""
+    client = _CLIENT_CACHE.get(api_key)
+    if client is None:
+        http_client = httpx.Client(http2=GROQ_HTTP2, limits=GROQ_HTTP_LIMITS, timeout=GROQ_HTTP_TIMEOUT)
+        client = _CLIENT_CACHE.setdefault(
+            api_key,
+            Groq(
+                api_key=api_key, max_retries=GROQ_SYNC_MAX_RETRIES, timeout=GROQ_HTTP_TIMEOUT, http_client=http_client
+            ),
+        )
+    return client
+
+
+def _get_shared_async_groq(api_key: str) -> AsyncGroq:
+    """Return the process-wide AsyncGroq client for an API key, creating it on first use."""
+    client = _ASYNC_CLIENT_CACHE.get(api_key)
+    if client is None:
+        http_client = httpx.AsyncClient(http2=GROQ_HTTP2, limits=GROQ_HTTP_LIMITS, timeout=GROQ_HTTP_TIMEOUT)
+        client = _ASYNC_CLIENT_CACHE.setdefault(
+            api_key,
+            AsyncGroq(
+                api_key=api_key, max_retries=GROQ_MAX_RETRIES, timeout=GROQ_HTTP_TIMEOUT, http_client=http_client
+            ),
+        )
+    return client
+
+
+def _get_cached_answer(key: str) -> str | None:
+    """Return the cached answer for a response cache key, or None on a miss."""
+    if _RESPONSE_CACHE is None:
+        return None
+    with _RESPONSE_CACHE_LOCK:
+        return _RESPONSE_CACHE.get(key)
+
+
+def _cache_answer(key: str, answer: str | None) -> None:
+    """Store a completed, non-empty answer in the response cache."""
+    if _RESPONSE_CACHE is None or not answer:
+        return
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE[key] = answer
+
+
+# Settings used when a client is created without any; stateless config, so one instance is shared
+_DEFAULT_SETTINGS: ModelSettings = Llama31Settings()
+
+# System message for tool calls, shared by every retrieve_tools request
+_TOOL_SYSTEM_MESSAGE = {"role": "system", "content": TOOL_SYSTEM_TEMPLATE}
+
+
+@functools.lru_cache(maxsize=32)
+def _tool_choice_param(tool_choice: str | None) -> dict | str:
+    """Return the tool_choice argument for a tool name, or "auto" when no tool is forced."""
+    return {"type": "function", "function": {"name": tool_choice}} if tool_choice else "auto"
+
+
+def _rate_limit_message(detail: object, retry_after: object = None) -> str:
+    """User-facing text for a request that hit the Groq rate limits, with a retry hint when one is known."""
+    wait = f"Please retry in {retry_after} seconds." if retry_after else "Please wait a few seconds and try again."
+    return (
+        f"Rate limit error: {detail}\n\n"
+        f"{wait} You may need to upgrade your Groq API tier for higher rate limits."
+    )
+
+
+class GroqThrottledError(RuntimeError):
+    """
+    Raised when a sync Groq request would have to wait for rate-limit capacity on an event loop thread.
+
+    The message is the same rate-limit text users get for a 429 from Groq, and retry_after holds the whole
+    seconds until capacity frees up, so handlers can answer with a 429 and a Retry-After header instead of a 500.
+    """
+
+    def __init__(self, retry_after: float):
+        self.retry_after = math.ceil(retry_after)
+        super().__init__(_rate_limit_message("Groq rate limits reached", self.retry_after))
+
+
+def _on_event_loop() -> bool:
+    """Whether the calling thread is running an asyncio event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class GroqRateLimiter:
+    """
+    Token buckets for the account's requests-per-minute and tokens-per-minute quotas.
+
+    Both buckets refill continuously with wall-clock time. Each request reserves one request and its
+    estimated tokens up front; when a bucket runs dry it goes into debt, and the request waits until the
+    debt is repaid, so concurrent callers are spaced out in arrival order. A limit of 0 is not enforced.
+    """
+
+    def __init__(self, rpm: int = 0, tpm: int = 0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        """Reserve capacity for one request and return how many seconds to wait before sending it."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._last_refill
+            self._last_refill = now
+            wait = 0.0
+            if self.rpm:
+                self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60) - 1
+                if self._requests < 0:
+                    wait = -self._requests * 60 / self.rpm
+            if self.tpm:
+                # A request larger than the whole bucket would otherwise never fit
+                self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60) - min(tokens, self.tpm)
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens * 60 / self.tpm)
+            return wait
+
+    def _release(self, tokens: int) -> None:
+        """Give back the capacity reserved for a request that won't be sent."""
+        with self._lock:
+            if self.rpm:
+                self._requests += 1
+            if self.tpm:
+                self._tokens += min(tokens, self.tpm)
+
+    def acquire(self, tokens: int) -> None:
+        """
+        Block until a request of the given estimated token count fits the quotas.
+
+        On an event loop thread, where sleeping would stall every other request, the reservation is given back
+        and GroqThrottledError is raised instead of waiting.
+        """
+        wait = self._reserve(tokens)
+        if wait <= 0:
+            return
+        if _on_event_loop():
+            self._release(tokens)
+            raise GroqThrottledError(wait)
+        logger.info(f"Throttling Groq request for {wait:.2f}s to stay within the rate limits")
+        time.sleep(wait)
+
+    async def async_acquire(self, tokens: int) -> None:
+        """Wait, without blocking the event loop, until a request of the given size fits the quotas."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            logger.info(f"Throttling Groq request for {wait:.2f}s to stay within the rate limits")
+            await asyncio.sleep(wait)
+
+
+_RATE_LIMITER: GroqRateLimiter | None = GroqRateLimiter(GROQ_RPM, GROQ_TPM) if GROQ_RPM or GROQ_TPM else None
+
+
+def _estimate_tokens(messages: list[dict], max_new_tokens: int) -> int:
+    """Rough token cost of a request: about four characters per prompt token plus the completion budget."""
+    return sum(len(message["content"]) for message in messages) // 4 + max_new_tokens
+
+
+def _throttle(messages: list[dict], max_new_tokens: int) -> None:
+    """Wait for rate-limit capacity before sending a request, when throttling is configured."""
+    if _RATE_LIMITER is not None:
+        _RATE_LIMITER.acquire(_estimate_tokens(messages, max_new_tokens))
+
+
+async def _async_throttle(messages: list[dict], max_new_tokens: int) -> None:
+    """Async counterpart of _throttle."""
+    if _RATE_LIMITER is not None:
+        await _RATE_LIMITER.async_acquire(_estimate_tokens(messages, max_new_tokens))
+
+
+def _truncate_at_stop(tail: str, text: str) -> tuple[str, bool]:
+    """
+    Cut a streamed batch at the first stop sequence.
+
+    Args:
+        tail (str): The last few characters already yielded, to catch a stop sequence split across batches.
+        text (str): The new batch.
+
+    Returns:
+        tuple[str, bool]: The part of the batch before the stop sequence, and whether one was found.
+    """
+    window = tail + text
+    hits = [index for index in (window.find(stop) for stop in STOP_SEQUENCES) if index >= 0]
+    if not hits:
+        return text, False
+    return text[: max(min(hits) - len(tail), 0)], True
+
+
+_loads_json = orjson.loads if orjson is not None else json.loads
+
+
+async def _aiter_once(text: str) -> AsyncIterator[str]:
+    """Async iterator over a single, already complete answer (e.g. a response cache hit)."""
+    yield text
+
+
+class _StreamBatcher:
+    """
+    Coalesces stream deltas into batches that grow by STREAM_BATCH_GROWTH_FACTOR up to max_batch_size, and
+    cuts the answer at the first stop sequence. Shared by the sync and async streamers.
+    """
+
+    def __init__(self, max_batch_size: int):
+        self.max_batch_size = max_batch_size
+        self.batch_size = 1
+        self.buffer: list[str] = []
+        self.last_flush = time.monotonic()
+        self.tail = ""
+        self.parts: list[str] = []
+        self.stopped = False
+
+    def add(self, content: str) -> str:
+        """Buffer a delta and return the text of the batch it completes, or "" while the batch is filling."""
+        self.buffer.append(content)
+        now = time.monotonic()
+        if len(self.buffer) < self.batch_size and now - self.last_flush < STREAM_FLUSH_INTERVAL:
+            return ""
+        self.batch_size = min(self.batch_size * STREAM_BATCH_GROWTH_FACTOR, self.max_batch_size)
+        self.last_flush = now
+        return self.flush()
+
+    def flush(self) -> str:
+        """Return the buffered text, cut at a stop sequence if one completes in it."""
+        text, self.stopped = _truncate_at_stop(self.tail, "".join(self.buffer))
+        self.buffer.clear()
+        if text:
+            self.parts.append(text)
+            self.tail = (self.tail + text)[-_STOP_TAIL_CHARS:]
+        return text
+
+    @property
+    def answer(self) -> str:
+        return "".join(self.parts)
+
+
+def _iter_sse_chunks(response: httpx.Response) -> Iterator[dict]:
+    """
+    Decode the chat completion chunks of a raw Groq server-sent event stream.
+
+    Chunks are parsed straight into dicts instead of the SDK's per-chunk ChatCompletionChunk models, since the
+    streamer only reads the delta content. The response is closed once the stream ends or is abandoned.
+
+    Args:
+        response (httpx.Response): The unread streaming response.
+
+    Returns:
+        Iterator[dict]: One dict per chunk, shaped like the API's JSON.
+    """
+    try:
+        for line in response.iter_lines():
+            if not line.startswith("data: "):
+                continue
+            data = line[6:]
+            if data == "[DONE]":
+                break
+            chunk = _loads_json(data)
+            if "error" in chunk:
+                raise RuntimeError(f"Groq stream error: {chunk['error']}")
+            yield chunk
+    finally:
+        response.close()
+
+
+def _rate_limit_error(e: RateLimitError) -> RuntimeError:
+    """Build the user-facing error for a 429 that outlasted the SDK retries, using its Retry-After hint."""
+    response = getattr(e, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    return RuntimeError(_rate_limit_message(e, retry_after))
 
 
 class GroqClient:
@@ -27,6 +365,7 @@ class GroqClient:
     Compatible with LamaCppClient interface.
     """
 
+
     def __init__(self, api_key: str = None, model_name: str = None, model_settings: ModelSettings = None):
         """
         Initialize Groq client.
@@ -43,14 +382,50 @@ class GroqClient:
         if not self.api_key:
             raise ValueError("Groq API key is required. Set GROQ_API_KEY environment variable or pass api_key parameter.")
         
-        self.client = Groq(api_key=self.api_key)
+        self.client = _get_shared_groq(self.api_key)
+        self.async_client = _get_shared_async_groq(self.api_key)
         self.model_name = model_name
-        self.model_settings = model_settings or self._create_default_model_settings()
-    
-    def _create_default_model_settings(self) -> ModelSettings:
-        """Create a default ModelSettings object for compatibility."""
-        from bot.model.settings.llama import Llama31Settings
-        return Llama31Settings()
+        self.model_settings = model_settings or _DEFAULT_SETTINGS
+        # The system message is identical for every call and never mutated, so it is built once
+        self._system_message = {"role": "system", "content": self.model_settings.system_template}
+        # Completion calls with the per-client constants bound, so call sites only pass messages and max_tokens
+        completions = self.client.chat.completions
+        self._create = functools.partial(
+            completions.create, model=self.model_name, temperature=0.7, stop=STOP_SEQUENCES
+        )
+        self._raw_stream_create = functools.partial(
+            completions.with_raw_response.create,
+            model=self.model_name,
+            temperature=0.7,
+            stop=STOP_SEQUENCES,
+            stream=True,
+        )
+        self._tool_create = functools.partial(completions.create, model=self.model_name, temperature=0.7)
+        self._async_create = functools.partial(
+            self.async_client.chat.completions.create, model=self.model_name, temperature=0.7, stop=STOP_SEQUENCES
+        )
+
+    async def warm_up(self) -> None:
+        """
+        Open the HTTPS connections of the sync and async Groq clients ahead of the first real request.
+
+        Listing models costs no tokens but completes the TLS handshake, leaving a keep-alive connection in
+        each client's pool. Failures are only logged since the first real request will simply connect itself.
+        """
+        try:
+            await asyncio.gather(asyncio.to_thread(self.client.models.list), self.async_client.models.list())
+            logger.info(f"Groq connections warmed up for {self.model_name}")
+        except Exception as e:
+            logger.warning(f"Could not warm up Groq connections for {self.model_name}: {e}")
+
+    def _response_cache_key(self, prompt: str, max_new_tokens: int) -> str:
+        """Digest of everything that shapes the answer, used as the response cache key."""
+        key = "\0".join((self.model_name, self._system_message["content"], str(max_new_tokens), prompt))
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _build_messages(self, prompt: str, history: Sequence[dict] = ()) -> list[dict]:
+        """Chat messages for a prompt: the shared system message, any earlier turns, then the prompt."""
+        return [self._system_message, *history, {"role": "user", "content": prompt}]
 
     def generate_answer(self, prompt: str, max_new_tokens: int = 512) -> str:
         """
@@ -63,23 +438,21 @@ class GroqClient:
         Returns:
             str: The generated answer.
         """
-        system_content = self.model_settings.system_template if self.model_settings else "You are a helpful assistant."
+        cache_key = self._response_cache_key(prompt, max_new_tokens)
+        cached = _get_cached_answer(cache_key)
+        if cached is not None:
+            return cached
 
-        # Add stop sequences for early stopping
-        stop_sequences = ["\n\n\n", "---", "###", "##"]
-        
-        response = self.client.chat.completions.create(
-            model=self.model_name,
-            messages=[
-                {"role": "system", "content": system_content},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=max_new_tokens,
-            temperature=0.7,
-            stop=stop_sequences,
-        )
+        messages = self._build_messages(prompt)
+        _throttle(messages, max_new_tokens)
+        try:
+            response = self._create(messages=messages, max_tokens=max_new_tokens)
+        except RateLimitError as e:
+            raise _rate_limit_error(e) from e
 
-        return response.choices[0].message.content
+        answer = response.choices[0].message.content
+        _cache_answer(cache_key, answer)
+        return answer
 
     async def async_generate_answer(self, prompt: str, max_new_tokens: int = 512) -> str:
         """
@@ -92,7 +465,21 @@ class GroqClient:
         Returns:
             str: The generated answer.
         """
-        return self.generate_answer(prompt, max_new_tokens)
+        cache_key = self._response_cache_key(prompt, max_new_tokens)
+        cached = _get_cached_answer(cache_key)
+        if cached is not None:
+            return cached
+
+        messages = self._build_messages(prompt)
+        await _async_throttle(messages, max_new_tokens)
+        try:
+            response = await self._async_create(messages=messages, max_tokens=max_new_tokens)
+        except RateLimitError as e:
+            raise _rate_limit_error(e) from e
+
+        answer = response.choices[0].message.content
+        _cache_answer(cache_key, answer)
+        return answer
 
     def stream_answer(self, prompt: str, max_new_tokens: int = 512) -> str:
         """
@@ -105,306 +492,169 @@ class GroqClient:
         Returns:
             str: The generated answer.
         """
-        answer = ""
+        tokens = []
         stream = self.start_answer_iterator_streamer(prompt, max_new_tokens=max_new_tokens)
 
         for output in stream:
             token = self.parse_token(output)
-            answer += token
+            tokens.append(token)
             print(token, end="", flush=True)
 
-        return answer
+        return "".join(tokens)
 
     def start_answer_iterator_streamer(
-        self, prompt: str, max_new_tokens: int = 512
-    ) -> Iterator[dict]:
+        self, prompt: str, max_new_tokens: int = 512, history: Sequence[dict] = ()
+    ) -> Iterator[str]:
         """
         Start an answer iterator streamer for a given prompt using Groq API.
 
+        The streamer yields the text of each coalesced batch as a plain string rather than a LamaCppClient-style
+        chunk dict, saving three dicts and a list per token; parse_token accepts both shapes.
+
         Args:
             prompt (str): The input prompt for generating the answer.
             max_new_tokens (int): The maximum number of new tokens to generate (default is 512).
+            history (Sequence[dict]): Earlier conversation turns as chat messages, sent between the system
+                message and the prompt so they form a stable, cacheable prefix (default is none).
 
         Returns:
-            Iterator[dict]: Iterator that yields token dictionaries compatible with LamaCppClient format.
+            Iterator[str]: Iterator that yields the streamed text.
         """
-        system_content = self.model_settings.system_template if self.model_settings else "You are a helpful assistant."
-
-        # Add stop sequences for early stopping
-        stop_sequences = ["\n\n\n", "---", "###", "##"]
-        
+        # Reasoning models need their start/stop tags to arrive as separate tokens so callers can filter
+        # them out, so only batch deltas (and serve whole answers from the cache) when reasoning is disabled.
+        reasoning = bool(self.model_settings and self.model_settings.reasoning)
+        max_batch_size = 1 if reasoning else STREAM_MAX_BATCH_SIZE
+        cache_key = None if reasoning or history else self._response_cache_key(prompt, max_new_tokens)
+        cached = _get_cached_answer(cache_key) if cache_key else None
+        if cached is not None:
+            return iter([cached])
+
+        messages = self._build_messages(prompt, history)
+        _throttle(messages, max_new_tokens)
         try:
-            logger.info(f"🔧 Creating Groq stream with max_tokens={max_new_tokens}, model={self.model_name}, prompt_length={len(prompt)}")
-            stream = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": system_content},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_new_tokens,
-                temperature=0.7,
-                stream=True,
-                stop=stop_sequences,
+            raw_response = self._raw_stream_create(messages=messages, max_tokens=max_new_tokens)
+            logger.debug(
+                f"Created Groq stream for model {self.model_name} "
+                f"(prompt length: {len(prompt)} chars, max_tokens={max_new_tokens})"
             )
-            logger.info(f"✅ Groq stream created successfully with max_tokens={max_new_tokens}")
-            logger.debug(f"Created Groq stream for prompt (length: {len(prompt)} chars)")
-            import sys
-            print(f"[GROQ_API] Created Groq stream for model: {self.model_name}, prompt length: {len(prompt)}", file=sys.stderr, flush=True)
-            logger.error(f"[GROQ_API] Created Groq stream for model: {self.model_name}, prompt length: {len(prompt)}")
-        except Exception as e:
-            error_msg = str(e).lower()
-            if "429" in error_msg or "rate limit" in error_msg or "rate_limit" in error_msg:
-                raise RuntimeError(
-                    f"Rate limit error: {e}\n\n"
-                    "Please wait a few seconds and try again. "
-                    "You may need to upgrade your Groq API tier for higher rate limits."
-                ) from e
-            raise
+        except RateLimitError as e:
+            raise _rate_limit_error(e) from e
+        stream = _iter_sse_chunks(raw_response.http_response)
 
         def streamer():
+            # Per-chunk diagnostics only run when debug logging is on; checked once per stream, not per token
+            debug = logger.isEnabledFor(logging.DEBUG)
             chunk_count = 0
             empty_chunks = 0
-            is_gpt_oss = "gpt-oss" in self.model_name.lower() or "openai/gpt" in self.model_name.lower()
-            # Force logging to stderr as well to ensure we see it
-            import sys
-            print(f"[GROQ_STREAMER] Starting to iterate over Groq stream for model: {self.model_name} (is_gpt_oss: {is_gpt_oss})", file=sys.stderr, flush=True)
-            logger.error(f"[GROQ_STREAMER] Starting to iterate over Groq stream for model: {self.model_name} (is_gpt_oss: {is_gpt_oss})")
+            batcher = _StreamBatcher(max_batch_size)
             try:
                 for chunk in stream:
                     chunk_count += 1
-                    # Log raw chunk structure for first few chunks - ALWAYS log these
-                    if chunk_count <= 5:
-                        logger.info(f"Raw chunk {chunk_count} type: {type(chunk)}, has choices: {hasattr(chunk, 'choices')}")
-                        if hasattr(chunk, 'choices'):
-                            logger.info(f"Chunk {chunk_count} choices length: {len(chunk.choices) if chunk.choices else 0}")
-                        # Log the entire chunk structure for debugging
-                        try:
-                            logger.info(f"Chunk {chunk_count} full structure: {chunk}")
-                        except:
-                            logger.info(f"Chunk {chunk_count} full structure: (could not stringify)")
-                        if hasattr(chunk, '__dict__'):
-                            logger.info(f"Chunk {chunk_count} attributes: {list(chunk.__dict__.keys())}")
-                        else:
-                            logger.info(f"Chunk {chunk_count} has no __dict__ attribute")
-                    
-                    # Check if chunk has choices and content
-                    if chunk.choices and len(chunk.choices) > 0:
-                        choice = chunk.choices[0]
-                        
-                        # Check for finish_reason - if present and not None, this might be the last chunk
-                        finish_reason = getattr(choice, 'finish_reason', None)
-                        if finish_reason:
-                            logger.warning(f"⚠️ Chunk {chunk_count} has finish_reason: {finish_reason} - Stream may be ending early!")
-                            if finish_reason == "stop" and chunk_count < 100:
-                                logger.error(f"🚨 EARLY STOP DETECTED at chunk {chunk_count} with finish_reason='stop' - This may indicate stop sequence was hit or max_tokens limit reached")
-                        elif chunk_count <= 3:
-                            logger.info(f"Chunk {chunk_count} has finish_reason: {finish_reason}")
-                        
-                        # Log choice structure for first few chunks
-                        if chunk_count <= 3:
-                            logger.info(f"Choice {chunk_count} type: {type(choice)}, has delta: {hasattr(choice, 'delta')}, finish_reason: {finish_reason}")
-                            if hasattr(choice, '__dict__'):
-                                logger.info(f"Choice {chunk_count} attributes: {list(choice.__dict__.keys())}")
-                        
-                        delta = getattr(choice, 'delta', None)
-                        if delta:
-                            # Log delta structure for first few chunks - ALWAYS log these with ERROR level
-                            if chunk_count <= 5:
-                                import sys
-                                print(f"[GROQ_STREAMER] Delta {chunk_count} type: {type(delta)}", file=sys.stderr, flush=True)
-                                logger.error(f"[GROQ_STREAMER] Delta {chunk_count} type: {type(delta)}")
-                                if hasattr(delta, '__dict__'):
-                                    attrs = list(delta.__dict__.keys())
-                                    print(f"[GROQ_STREAMER] Delta {chunk_count} attributes: {attrs}", file=sys.stderr, flush=True)
-                                    logger.error(f"[GROQ_STREAMER] Delta {chunk_count} attributes: {attrs}")
-                                else:
-                                    print(f"[GROQ_STREAMER] Delta {chunk_count} has no __dict__ attribute", file=sys.stderr, flush=True)
-                                    logger.error(f"[GROQ_STREAMER] Delta {chunk_count} has no __dict__ attribute")
-                                # Try to get content immediately and log it
-                                try:
-                                    direct_content = delta.content if hasattr(delta, 'content') else None
-                                    print(f"[GROQ_STREAMER] Delta {chunk_count} direct content access: {repr(direct_content)}", file=sys.stderr, flush=True)
-                                    logger.error(f"[GROQ_STREAMER] Delta {chunk_count} direct content access: {repr(direct_content)}")
-                                except Exception as e:
-                                    print(f"[GROQ_STREAMER] Delta {chunk_count} direct content access failed: {e}", file=sys.stderr, flush=True)
-                                    logger.error(f"[GROQ_STREAMER] Delta {chunk_count} direct content access failed: {e}")
-                            
-                            # Try different ways to get content
-                            # For GPT-OSS models, the response structure might be different
-                            # CRITICAL: Check if delta.content exists but is None vs doesn't exist
-                            if chunk_count <= 3:
-                                import sys
-                                # Try to get all possible attributes using dir()
-                                try:
-                                    delta_attrs = [attr for attr in dir(delta) if not attr.startswith('_')]
-                                    print(f"[GROQ_DEBUG] Delta {chunk_count} dir() attributes (first 20): {delta_attrs[:20]}", file=sys.stderr, flush=True)
-                                    logger.error(f"[GROQ_DEBUG] Delta {chunk_count} dir() attributes (first 20): {delta_attrs[:20]}")
-                                except:
-                                    pass
-                                
-                                # Try accessing content via different methods and log the actual values
-                                for attr in ['content', 'text', 'message', 'role', 'function_call', 'tool_calls']:
-                                    if hasattr(delta, attr):
-                                        try:
-                                            val = getattr(delta, attr)
-                                            print(f"[GROQ_DEBUG] Delta {chunk_count}.{attr} = {repr(val)} (type: {type(val)})", file=sys.stderr, flush=True)
-                                            logger.error(f"[GROQ_DEBUG] Delta {chunk_count}.{attr} = {repr(val)} (type: {type(val)})")
-                                        except Exception as e:
-                                            print(f"[GROQ_DEBUG] Delta {chunk_count}.{attr} access failed: {e}", file=sys.stderr, flush=True)
-                                            logger.error(f"[GROQ_DEBUG] Delta {chunk_count}.{attr} access failed: {e}")
-                            
-                            if is_gpt_oss:
-                                # GPT-OSS models might use different field names - try all possible locations
-                                content = None
-                                
-                                # First try standard delta.content
-                                if hasattr(delta, 'content'):
-                                    try:
-                                        content = delta.content
-                                    except:
-                                        pass
-                                
-                                # Try delta.text
-                                if content is None and hasattr(delta, 'text'):
-                                    try:
-                                        content = delta.text
-                                    except:
-                                        pass
-                                
-                                # Try choice.content (some models put it here)
-                                if content is None and hasattr(choice, 'content'):
-                                    try:
-                                        content = choice.content
-                                    except:
-                                        pass
-                                
-                                # Try choice.text
-                                if content is None and hasattr(choice, 'text'):
-                                    try:
-                                        content = choice.text
-                                    except:
-                                        pass
-                                
-                                # Try as dict
-                                if content is None and isinstance(delta, dict):
-                                    content = delta.get('content') or delta.get('text')
-                                
-                                # Try choice as dict
-                                if content is None and isinstance(choice, dict):
-                                    content = choice.get('content') or choice.get('text')
-                                
-                                # Try getattr as fallback
-                                if content is None:
-                                    content = getattr(delta, 'content', None)
-                                if content is None:
-                                    content = getattr(delta, 'text', None)
-                                if content is None:
-                                    content = getattr(choice, 'content', None)
-                                if content is None:
-                                    content = getattr(choice, 'text', None)
-                            else:
-                                # Standard llama models - use standard approach
-                                # First, try the standard delta.content (most common)
-                                content = getattr(delta, 'content', None)
-                                
-                                # If None, try accessing it directly (some API versions)
-                                if content is None and hasattr(delta, 'content'):
-                                    try:
-                                        content = delta.content
-                                    except:
-                                        pass
-                                
-                                # Also check if there's a 'text' attribute (some API versions use this)
-                                if content is None:
-                                    content = getattr(delta, 'text', None)
-                                
-                                # Also check if content is in the choice itself (some API versions)
-                                if content is None:
-                                    content = getattr(choice, 'content', None)
-                                if content is None:
-                                    content = getattr(choice, 'text', None)
-                                
-                                # Last resort: check if delta is a dict-like object
-                                if content is None and hasattr(delta, 'get'):
-                                    content = delta.get('content') or delta.get('text')
-                                
-                                # If still None, try to access as dict
-                                if content is None and isinstance(delta, dict):
-                                    content = delta.get('content') or delta.get('text')
-                            
-                            # Check if content is actually an empty string vs None
-                            # Groq sometimes sends empty strings for certain chunks (like finish_reason chunks)
-                            if content == "":
-                                # Empty string - this is normal for some chunks, skip it
-                                empty_chunks += 1
-                                if chunk_count <= 3:
-                                    logger.debug(f"Chunk {chunk_count} has empty string content (normal), continuing...")
-                                continue
-                            
-                            # Log first few chunks to debug
-                            if chunk_count <= 5:
-                                logger.info(f"Chunk {chunk_count}: delta type={type(delta)}, content={repr(content)}, content type={type(content) if content else None}")
-                                if hasattr(delta, '__dict__'):
-                                    logger.info(f"Chunk {chunk_count} delta attributes: {list(delta.__dict__.keys())}")
-                            
-                            # Only yield if content is not None and not empty
-                            if content:  # Yield only non-empty content
-                                # Format to match LamaCppClient's format
-                                yield {
-                                    "choices": [{
-                                        "delta": {
-                                            "content": content
-                                        }
-                                    }]
-                                }
-                            else:
-                                empty_chunks += 1
-                                if chunk_count == 1:
-                                    logger.debug(f"First chunk has no content (this is normal for Groq streaming), continuing...")
-                                elif empty_chunks <= 3:
-                                    logger.debug(f"Chunk {chunk_count} has no content, continuing...")
-                        else:
-                            empty_chunks += 1
-                            if chunk_count <= 3:
-                                logger.warning(f"Chunk {chunk_count} has no delta attribute")
-                    else:
+                    if debug and chunk_count <= 5:
+                        logger.debug(f"Groq stream chunk {chunk_count}: {chunk}")
+
+                    choices = chunk.get("choices")
+                    if not choices:
                         empty_chunks += 1
-                        if chunk_count <= 3:
-                            logger.debug(f"Chunk {chunk_count} has no choices, continuing...")
-                
+                        continue
+
+                    choice = choices[0]
+                    if choice.get("finish_reason") == "length":
+                        logger.warning(f"Groq stream hit max_tokens={max_new_tokens} after {chunk_count} chunks")
+
+                    content = choice["delta"].get("content")
+                    # Groq sends empty or missing content for role and finish_reason chunks
+                    if not content:
+                        empty_chunks += 1
+                        continue
+
+                    text = batcher.add(content)
+                    if text:
+                        yield text
+                    if batcher.stopped:
+                        # The model overshot a stop sequence; stop paying for the rest of the stream. Closing
+                        # the chunk iterator closes the HTTP response.
+                        stream.close()
+                        break
+
+                if batcher.buffer:
+                    text = batcher.flush()
+                    if text:
+                        yield text
+
+                # Only a stream consumed to the end is a complete answer worth caching
+                if cache_key:
+                    _cache_answer(cache_key, batcher.answer)
+
                 if chunk_count > 0 and empty_chunks == chunk_count:
                     logger.error(f"All {chunk_count} chunks had no content - stream is empty or API returned no content. This may indicate an API issue or the response was cut off.")
-                    # Log more details about the last few chunks for debugging
-                    logger.error(f"Last chunk processed: chunk_count={chunk_count}, empty_chunks={empty_chunks}")
-                elif empty_chunks > 0:
+                elif debug:
                     logger.debug(f"Processed {chunk_count} chunks, {empty_chunks} were empty, {chunk_count - empty_chunks} had content")
             except Exception as e:
                 logger.error(f"Error in streamer generator (processed {chunk_count} chunks, {empty_chunks} empty before error): {e}", exc_info=True)
-                error_msg = str(e).lower()
-                if "429" in error_msg or "rate limit" in error_msg or "rate_limit" in error_msg:
-                    raise RuntimeError(
-                        f"Rate limit error during streaming: {e}\n\n"
-                        "Please wait a few seconds and try again. "
-                        "You may need to upgrade your Groq API tier for higher rate limits."
-                    ) from e
                 raise
 
         return streamer()
 
     async def async_start_answer_iterator_streamer(
-        self, prompt: str, max_new_tokens: int = 512
-    ) -> Iterator[dict]:
+        self, prompt: str, max_new_tokens: int = 512, history: Sequence[dict] = ()
+    ) -> AsyncIterator[str]:
         """
-        Asynchronously start an answer iterator streamer.
+        Asynchronously start an answer iterator streamer backed by AsyncGroq.
+
+        The request is awaited here, so errors surface like they do for the sync streamer, and the returned
+        async iterator reads the stream with `async for`, so no network read blocks the event loop. Batching,
+        stop sequences and the response cache behave as in start_answer_iterator_streamer.
 
         Args:
             prompt (str): The input prompt for generating the answer.
             max_new_tokens (int): The maximum number of new tokens to generate (default is 512).
+            history (Sequence[dict]): Earlier conversation turns as chat messages (default is none).
 
         Returns:
-            Iterator[dict]: Iterator that yields token dictionaries.
+            AsyncIterator[str]: Async iterator that yields the streamed text.
         """
-        return self.start_answer_iterator_streamer(prompt, max_new_tokens)
+        reasoning = bool(self.model_settings and self.model_settings.reasoning)
+        cache_key = None if reasoning or history else self._response_cache_key(prompt, max_new_tokens)
+        cached = _get_cached_answer(cache_key) if cache_key else None
+        if cached is not None:
+            return _aiter_once(cached)
+
+        messages = self._build_messages(prompt, history)
+        await _async_throttle(messages, max_new_tokens)
+        try:
+            stream = await self._async_create(messages=messages, max_tokens=max_new_tokens, stream=True)
+        except RateLimitError as e:
+            raise _rate_limit_error(e) from e
+        return self._async_streamer(stream, max_new_tokens, 1 if reasoning else STREAM_MAX_BATCH_SIZE, cache_key)
+
+    async def _async_streamer(
+        self, stream, max_new_tokens: int, max_batch_size: int, cache_key: str | None
+    ) -> AsyncIterator[str]:
+        """Yield the batched text of an AsyncGroq stream, closing it once done or cut at a stop sequence."""
+        batcher = _StreamBatcher(max_batch_size)
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.finish_reason == "length":
+                    logger.warning(f"Groq stream hit max_tokens={max_new_tokens}")
+                if not choice.delta.content:
+                    continue
+                text = batcher.add(choice.delta.content)
+                if text:
+                    yield text
+                if batcher.stopped:
+                    break
+            if batcher.buffer:
+                text = batcher.flush()
+                if text:
+                    yield text
+            if cache_key:
+                _cache_answer(cache_key, batcher.answer)
+        finally:
+            await stream.close()
 
     def retrieve_tools(
         self, prompt: str, max_new_tokens: int = 512, tools: list[dict] = None, tool_choice: str = None
@@ -421,26 +671,20 @@ class GroqClient:
         Returns:
             list[dict] | None: A list of tool calls made by the language model, or None if no tools were called.
         """
-        tool_choice_param = {"type": "function", "function": {"name": tool_choice}} if tool_choice else "auto"
-
-        response = self.client.chat.completions.create(
-            model=self.model_name,
-            messages=[
-                {"role": "system", "content": TOOL_SYSTEM_TEMPLATE},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=max_new_tokens,
-            tools=tools,
-            tool_choice=tool_choice_param,
-            temperature=0.7,
+        messages = [_TOOL_SYSTEM_MESSAGE, {"role": "user", "content": prompt}]
+        _throttle(messages, max_new_tokens)
+        response = self._tool_create(
+            messages=messages, max_tokens=max_new_tokens, tools=tools, tool_choice=_tool_choice_param(tool_choice)
         )
 
         tool_calls = response.choices[0].message.tool_calls
         return tool_calls if tool_calls else None
 
     @staticmethod
-    def parse_token(token):
-        """Parse token from stream response (compatible with LamaCppClient format)."""
+    def parse_token(token: str | dict) -> str:
+        """Parse token from stream response: streamed text, or a chunk dict in LamaCppClient format."""
+        if isinstance(token, str):
+            return token
         return token["choices"][0]["delta"].get("content", "")
 
     @staticmethod
@@ -1,14 +1,15 @@
 import os
 from pathlib import Path
-from typing import Any, Iterator
+from typing import Any, Iterator, Sequence
 
 import requests
-from helpers.log import experimental
-from llama_cpp import CreateCompletionResponse, CreateCompletionStreamResponse, Llama
+from helpers.log import experimental, get_logger
+from llama_cpp import CreateCompletionResponse, CreateCompletionStreamResponse, Llama, LlamaRAMCache
 from tqdm import tqdm
 
 from bot.client.prompt import (
     CTX_PROMPT_TEMPLATE,
+    PROMPT_MODULES,
     QA_PROMPT_TEMPLATE,
     REFINED_ANSWER_CONVERSATION_AWARENESS_PROMPT_TEMPLATE,
     REFINED_CTX_PROMPT_TEMPLATE,
@@ -21,6 +22,13 @@ from bot.client.prompt import (
 )
 from bot.model.base_model import ModelSettings
 
+logger = get_logger(__name__)
+
+# Size of the in-memory cache of prompt attention (KV) states, in MB (0 disables it). Generation resumes from the
+# cached state sharing the longest prefix with the new prompt, so the static rules every context prompt starts
+# with are only prefilled once. Each state holds the KV cache of its whole prompt, so size it to fit the modules.
+PROMPT_CACHE_MB = int(os.getenv("LLAMA_PROMPT_CACHE_MB", "0"))
+
 
 class LamaCppClient:
     """
@@ -35,6 +43,8 @@ class LamaCppClient:
         self._auto_download()
 
         self.llm = self._load_llm()
+        if self.llm.cache is not None:
+            self._prefill_prompt_modules()
         # self.tokenizer = self._load_tokenizer()
 
     def _load_llm(self) -> Any:
@@ -52,6 +62,8 @@ class LamaCppClient:
             config.setdefault("use_mlock", False)  # Don't lock memory to avoid issues
             
             llm = Llama(model_path=str(self.model_path), **config)
+            if PROMPT_CACHE_MB > 0:
+                llm.set_cache(LlamaRAMCache(capacity_bytes=PROMPT_CACHE_MB << 20))
             return llm
         except FileNotFoundError:
             raise
@@ -135,6 +147,27 @@ class LamaCppClient:
 
             print(f"=> Model: {file_name} downloaded successfully 🥳")
 
+    def _prefill_prompt_modules(self) -> None:
+        """
+        Prefill the static prompt modules (see `PROMPT_MODULES`) once at load so their attention states are in
+        the prompt cache, and a request only prefills its own context and question. Failures are only logged
+        since requests still work without the cached states.
+        """
+        try:
+            for name, module in PROMPT_MODULES.items():
+                self.llm.create_chat_completion(
+                    messages=[
+                        {"role": "system", "content": self.model_settings.system_template},
+                        {"role": "user", "content": module},
+                    ],
+                    max_tokens=1,
+                )
+                logger.debug(f"Prefilled prompt module '{name}'")
+        except Exception as e:
+            logger.warning(f"Could not prefill prompt modules: {e}")
+            return
+        logger.info(f"Prefilled {len(PROMPT_MODULES)} prompt modules into the prompt cache")
+
     def generate_answer(self, prompt: str, max_new_tokens: int = 512) -> str:
         """
         Generates an answer based on the given prompt using the language model.
@@ -184,18 +217,18 @@ class LamaCppClient:
         Returns:
             str: The generated answer.
         """
-        answer = ""
+        tokens = []
         stream = self.start_answer_iterator_streamer(prompt, max_new_tokens=max_new_tokens)
 
         for output in stream:
             token = output["choices"][0]["delta"].get("content", "")
-            answer += token
+            tokens.append(token)
             print(token, end="", flush=True)
 
-        return answer
+        return "".join(tokens)
 
     def start_answer_iterator_streamer(
-        self, prompt: str, max_new_tokens: int = 512
+        self, prompt: str, max_new_tokens: int = 512, history: Sequence[dict] = ()
     ) -> CreateCompletionResponse | Iterator[CreateCompletionStreamResponse]:
         """
         Abstract method to start an answer iterator streamer for a given prompt.
@@ -203,11 +236,14 @@ class LamaCppClient:
         Args:
             prompt (str): The input prompt for generating the answer.
             max_new_tokens (int): The maximum number of new tokens to generate (default is 1000).
+            history (Sequence[dict]): Earlier conversation turns as chat messages, sent between the system
+                message and the prompt (default is none).
 
         """
         stream = self.llm.create_chat_completion(
             messages=[
                 {"role": "system", "content": self.model_settings.system_template},
+                *history,
                 {"role": "user", "content": f"{prompt}"},
             ],
             max_tokens=max_new_tokens,
@@ -218,7 +254,7 @@ class LamaCppClient:
         return stream
 
     async def async_start_answer_iterator_streamer(
-        self, prompt: str, max_new_tokens: int = 512
+        self, prompt: str, max_new_tokens: int = 512, history: Sequence[dict] = ()
     ) -> CreateCompletionResponse | Iterator[CreateCompletionStreamResponse]:
         """
         Abstract method to asynchronously start an answer iterator streamer,
@@ -227,9 +263,10 @@ class LamaCppClient:
         Args:
             prompt (str): The input prompt for generating the answer.
             max_new_tokens (int): The maximum number of new tokens to generate (default is 1000).
+            history (Sequence[dict]): Earlier conversation turns as chat messages (default is none).
 
         """
-        return self.start_answer_iterator_streamer(prompt, max_new_tokens)
+        return self.start_answer_iterator_streamer(prompt, max_new_tokens, history)
 
     @experimental
     def retrieve_tools(
@@ -270,6 +307,9 @@ class LamaCppClient:
 
     @staticmethod
     def parse_token(token):
+        # GroqClient streamers yield plain strings; accept them so parsing doesn't depend on the stream's source
+        if isinstance(token, str):
+            return token
         return token["choices"][0]["delta"].get("content", "")
 
     @staticmethod
@@ -1,4 +1,20 @@
 # -*- coding: utf-8 -*-
+import functools
+import re
+import string
+import sys
+from typing import Any, Callable, Iterable
+
+from helpers.log import get_logger
+
+logger = get_logger(__name__)
+
+# Caps on the retrieved context and the chat history inlined into a prompt, in estimated tokens (about four
+# characters each). A pathological document or a long session is cut instead of inflating every prompt built from it.
+MAX_CTX_TOKENS = 3000
+MAX_HIST_TOKENS = 1500
+_CHARS_PER_TOKEN = 4
+
 # A string template for the system message.
 # This template is used to define the behavior and characteristics of the assistant.
 SYSTEM_TEMPLATE = """You are a helpful, respectful and honest assistant.
@@ -16,110 +32,112 @@ QA_PROMPT_TEMPLATE = """Answer the question below:
 {question}
 """
 
+# Cottage, location and naming rules, each stated once. Templates (and COMMON_SYSTEM_FACTS) include them through a
+# {guardrails} slot, which is filled in at import.
+_GUARDRAIL_RULES = (
+    "- Only cottages 7, 9 and 11 exist",
+    '- [CRITICAL] Location: Murree Hills, Bhurban, Pakistan - NEVER "Azad Kashmir", "Patriata", "Bhubaneswar", '
+    '"Lahore", "Karachi" or "Islamabad", even if the context says so',
+    '- [CRITICAL] Name: "Swiss Cottages Bhurban" or "Swiss Cottages" - NEVER "Swiss Chalet", "mountain cottage", '
+    '"pearl cottage" or any variation, even if the context uses one',
+)
+_GUARDRAILS = "\n".join(_GUARDRAIL_RULES)
+
+# Rules shared by the intent templates, by the name of the slot they fill. Like {guardrails}, the slots are filled
+# in at import so each rule's wording lives in one place.
+_RULES = {
+    "guardrails": _GUARDRAILS,
+    "context_only": "- You MUST use ONLY the context provided below. "
+    "DO NOT use any information from your training data.",
+    "no_info": '- If the context does not contain the answer, say "I don\'t have that information in my knowledge base."',
+    "no_pricing": '- DO NOT mention ANY pricing, prices, costs, rates, PKR amounts (e.g. "PKR 32,000") or "per night" '
+    "figures, even if the context contains them",
+    "general_info": '- If the user asks about "each cottage" or "Cottage X, Y, Z" but the context only has general '
+    "information on the topic, provide it IMMEDIATELY and state that it applies to ALL cottages (Cottage 7, Cottage 9 "
+    'and Cottage 11), e.g. "All cottages have...", "The cottages include..." or "Each cottage features..."\n'
+    '- If the context mentions the topic at all, NEVER say "I couldn\'t find", "I don\'t have", "unfortunately", '
+    '"I recommend checking", "please contact" or anything else suggesting the information is unavailable, and never '
+    'hedge with "I would expect" or "it\'s likely to include"\n'
+    "- ONLY if the context has ABSOLUTELY NO information on the topic, say that the information is unavailable",
+    "location": "- [CRITICAL] Give the cottages' location ONLY as stated in SYSTEM FACTS below and ignore any other "
+    "location the context gives for them\n"
+    "- If the question is about location, include the Google Maps link from SYSTEM FACTS",
+}
+
+
+def _expand_rules(template: str) -> str:
+    """Fill in the shared rule slots of a template."""
+    for name, rule in _RULES.items():
+        template = template.replace("{" + name + "}", rule)
+    return template
+
 # Common system facts shared across all prompts
-COMMON_SYSTEM_FACTS = """- Only cottages: 7, 9, 11
-- No other cottages exist
+COMMON_SYSTEM_FACTS = """{guardrails}
 - CORRECT LOCATION: Swiss Cottages is located adjacent to Pearl Continental (PC) Bhurban in the Murree Hills, within a secure gated community in Bhurban, Pakistan
 - Location formats: "Bhurban, Murree, Pakistan" or "Murree Hills, Pakistan" or "Swiss Cottages Bhurban, Bhurban, Murree, Pakistan"
-- [CRITICAL] NEVER say "Azad Kashmir" or "Patriata" for cottage location - these are WRONG
-- [CRITICAL] NEVER say "Bhubaneswar" (India) for cottage location - this is COMPLETELY WRONG
-- [CRITICAL] NEVER say "Lahore", "Karachi", "Islamabad" for cottage location - these are WRONG
 - PC Bhurban (Pearl Continental Bhurban) is a nearby hotel/viewpoint, NOT where cottages are - cottages are adjacent to it
 - Google Maps link: https://goo.gl/maps/PQbSR9DsuxwjxUoU6
 - Do not invent entities
-- CRITICAL NAMING RULE: ALWAYS use "Swiss Cottages Bhurban" or "Swiss Cottages" - NEVER use "mountain cottage", "pearl cottage", "Pearl Cottage", "Swiss Chalet", "Swiss Chalet cottages", or any variation
-- If you see "mountain cottage", "pearl cottage", "Swiss Chalet", "Swiss Chalet cottages", or any incorrect name in context, REPLACE it with "Swiss Cottages Bhurban" in your answer
-- The property is called "Swiss Cottages Bhurban" - this is the ONLY correct name
-- CRITICAL LOCATION RULE: Swiss Cottages is in "Murree Hills, Bhurban, Pakistan" - NEVER say "Azad Kashmir", "Patriata", "Bhubaneswar", "Lahore", "Karachi", or "Islamabad" for location
-- If context says "Azad Kashmir", "Patriata", "Bhubaneswar", "Lahore", "Karachi", or "Islamabad" for location, IGNORE IT - it is WRONG
 - [CRITICAL] ABSOLUTE PROHIBITION: NEVER generate example URLs like "example.com", "placeholder.com", "test.com" - these are from training data, NOT from context
 - [CRITICAL] ONLY use URLs that appear in the context provided - if context doesn't have a URL, DO NOT invent one
 - [CRITICAL] If context mentions photo gallery or images, use ONLY the URLs from context (e.g., swisscottagesbhurban.com, Airbnb links, Instagram links)
 - [CRITICAL] DO NOT generate placeholder text like "Take a look at our photo gallery" with example.com URLs - this is from training data"""
 
-# Short prompt template for simple queries (reduces context size to prevent 413 errors)
-# NOTE: This is a fallback template used only when USE_INTENT_FILTERING=false or intent is not detected
-SIMPLE_CTX_PROMPT_TEMPLATE = """Context information is below.
+# Shared tail of the context prompts; the simple and full templates only differ in the instructions before it
+_CTX_PROMPT_TAIL = """
+Context information is below.
 ---------------------
 {context}
 ---------------------
 
-Answer the question using ONLY the context above. Be concise.
-
 Question: {question}
 Answer:"""
 
-# A string template with placeholders for question, and context.
+# Short prompt template for simple queries (reduces context size to prevent 413 errors)
 # NOTE: This is a fallback template used only when USE_INTENT_FILTERING=false or intent is not detected
-CTX_PROMPT_TEMPLATE = """Context information is below.
----------------------
-{context}
----------------------
+SIMPLE_CTX_PROMPT_TEMPLATE = """Answer the question using ONLY the context below. Be concise.
+""" + _CTX_PROMPT_TAIL
 
-CRITICAL RULES:
-- Answer using ONLY the context provided above. Do NOT use training data.
-- Location: Swiss Cottages Bhurban, Bhurban, Murree, Pakistan (in Murree Hills, NOT Azad Kashmir)
-- Only cottages: 7, 9, 11 exist
+# A string template with placeholders for question, and context.
+# NOTE: This is a fallback template used only when USE_INTENT_FILTERING=false or intent is not detected
+CTX_PROMPT_TEMPLATE = """CRITICAL RULES:
+- Answer using ONLY the context provided below. Do NOT use training data.
+{guardrails}
 - DO NOT mention pricing unless question explicitly asks about it
 - DO NOT mention other hotels/resorts not in context
 - Be concise and conversational
+""" + _CTX_PROMPT_TAIL
 
-Question: {question}
-Answer:"""
-
-# Short refined prompt template for simple queries
-# NOTE: This is a fallback template used only when USE_INTENT_FILTERING=false or intent is not detected
-SIMPLE_REFINED_CTX_PROMPT_TEMPLATE = """Original query: {question}
-Existing answer: {existing_answer}
+# Shared tail of the refine prompts
+_REFINED_CTX_PROMPT_TAIL = """
 Additional context:
 ---------------------
 {context}
 ---------------------
 
-Refine the answer using the additional context above. Keep it concise and conversational.
+Original query: {question}
+Existing answer: {existing_answer}
 Answer:"""
 
-# A string template with placeholders for question, existing_answer, and context.
+# Short refined prompt template for simple queries
 # NOTE: This is a fallback template used only when USE_INTENT_FILTERING=false or intent is not detected
-REFINED_CTX_PROMPT_TEMPLATE = """The original query is as follows: {question}
-We have provided an existing answer: {existing_answer}
-We have the opportunity to refine the existing answer with some more context below.
----------------------
-{context}
----------------------
+SIMPLE_REFINED_CTX_PROMPT_TEMPLATE = """Refine the existing answer using the additional context below. Keep it concise and conversational.
+""" + _REFINED_CTX_PROMPT_TAIL
 
-CRITICAL INSTRUCTIONS:
-- Use ONLY the context information provided above. DO NOT use prior knowledge.
-- Location: Swiss Cottages Bhurban, Bhurban, Murree, Pakistan (in Murree Hills, NOT Azad Kashmir)
-- Only cottages: 7, 9, 11 exist
+# A string template with placeholders for question, existing_answer, and context.
+# NOTE: This is a fallback template used only when USE_INTENT_FILTERING=false or intent is not detected
+REFINED_CTX_PROMPT_TEMPLATE = """CRITICAL INSTRUCTIONS:
+- Use ONLY the context information provided below. DO NOT use prior knowledge.
+{guardrails}
 - DO NOT mention pricing unless question explicitly asks about it
 - IMPORTANT: The new context may contain ADDITIONAL information that should be ADDED to the existing answer.
 - If the new context contains relevant information NOT already in the existing answer, you MUST include it in the refined answer.
-- **[CRITICAL] ABSOLUTE PROHIBITION ON REASONING TEXT [CRITICAL]**
-- **NEVER output any of the following phrases or similar reasoning text:**
-  * "We have the opportunity to refine..."
-  * "Based on the context information provided above..."
-  * "Based on the provided context..."
-  * "Given the context..."
-  * "Since the original query..."
-  * "The refined answer is..."
-  * "The refined answer remains..."
-  * "Refined Answer:" or "Answer:"
-  * Any explanation of your process, thinking, or reasoning
-- **ONLY output the refined answer text itself, nothing else. No explanations, no reasoning, no process description, no meta-commentary.**
-- **Start your response directly with the answer content. Do NOT preface it with any reasoning or explanation.**
+- Output ONLY the refined answer, starting directly with the answer content: no preamble, reasoning, process description or meta-commentary (e.g. "Based on the provided context...", "The refined answer is...") and no "Refined Answer:" or "Answer:" prefix
 - Keep your answer CONCISE: 2-5 lines maximum. Avoid repeating generic information.
-
-Refined Answer:
-"""
+""" + _REFINED_CTX_PROMPT_TAIL
 
 # A string template with placeholders for question, and chat_history to refine the question based on the chat history.
-REFINED_QUESTION_CONVERSATION_AWARENESS_PROMPT_TEMPLATE = """Chat History:
----------------------
-{chat_history}
----------------------
-Follow Up Question: {question}
-Given the above conversation and a follow up question, rephrase the follow up question to be a standalone question.
+REFINED_QUESTION_CONVERSATION_AWARENESS_PROMPT_TEMPLATE = """Given the conversation and the follow up question below, rephrase the follow up question to be a standalone question.
 
 CRITICAL PRONOUN EXPANSION: If the follow-up question uses pronouns like "it", "they", "them", "this", "that", "these", "those", you MUST replace them with the specific entity mentioned in the chat history.
 - **ABSOLUTE PROHIBITION ON FORBIDDEN LOCATIONS:** NEVER expand pronouns to "Azad Kashmir", "Patriata", "Bhubaneswar", "Lahore", "Karachi", "Islamabad", or any location other than "Swiss Cottages Bhurban" or "Swiss Cottages". These are FORBIDDEN entities for pronoun expansion.
@@ -186,6 +204,11 @@ ADDITIONAL GUIDELINES:
 - If multiple entities are mentioned in chat history, prioritize the most recent or most relevant one
 - For questions about "best", "better", "recommended", include the entity context (e.g., "which cottage is best at swiss cottages bhurban")
 
+Chat History:
+---------------------
+{chat_history}
+---------------------
+Follow Up Question: {question}
 Standalone question:
 """
 
@@ -252,23 +275,160 @@ You are engaging in a conversation with a human participant who is unaware that
 interacting with a machine.
 Your goal is to respond in a way that convincingly simulates human-like intelligence and behavior.
 The conversation should be natural, coherent, and contextually relevant.
-Chat History:
----------------------
-{chat_history}
----------------------
-Follow Up Question: {question}\n
-Given the context provided in the Chat History and the follow up question, please answer the follow up question above.
+Given the context provided in the Chat History and the follow up question below, please answer the follow up question.
 If the follow up question isn't correlated to the context provided in the Chat History, please just answer the follow up
 question, ignoring the context provided in the Chat History.
 Please also don't reformulate the follow up question, and write just a concise answer.
 - [CRITICAL] ABSOLUTE PROHIBITION: DO NOT rephrase, repeat, or restate the user's question - answer directly
 - [CRITICAL] ABSOLUTE PROHIBITION: DO NOT start with "Considering...", "Regarding...", "About your question...", or any phrase that rephrases the question
 - [CRITICAL] START YOUR ANSWER DIRECTLY with the answer content - do not preface it with a question or rephrasing
-- [CRITICAL] CRITICAL NAMING: ALWAYS use "Swiss Cottages Bhurban" - NEVER use "Swiss Chalet", "Swiss Chalet cottages", "mountain cottage", "pearl cottage", or any variation
+{guardrails}
 - DO NOT ask questions back to the user - answer directly.
+
+Chat History:
+---------------------
+{chat_history}
+---------------------
+Follow Up Question: {question}
+Answer:
 """
 
 
+_REPEATED_MARKER_RE = re.compile(r"\[CRITICAL\](?:\s*\[CRITICAL\])+")
+_MARKER_BEFORE_CRITICAL_RE = re.compile(r"\[CRITICAL\]\s+(?=CRITICAL\b)")
+
+
+def _compact_text(text: str) -> str:
+    """Drop emphasis that costs tokens without adding meaning: repeated [CRITICAL] markers and ** bold."""
+    text = _REPEATED_MARKER_RE.sub("[CRITICAL]", text)
+    text = _MARKER_BEFORE_CRITICAL_RE.sub("", text)
+    return text.replace("**", "")
+
+
+def _compact(template: str) -> str:
+    """
+    Shrinks a prompt template without changing its rules.
+
+    Repeated [CRITICAL] markers and markdown bold are dropped, trailing whitespace is stripped and top-level
+    rule bullets stated more than once are kept only the first time. Text inside double quotes is left as is,
+    since it quotes markers and phrases the model has to recognise verbatim.
+
+    Args:
+        template (str): The prompt template.
+
+    Returns:
+        str: The compacted template.
+    """
+    lines = []
+    seen_rules = set()
+    for line in template.split("\n"):
+        segments = line.rstrip().split('"')
+        # Only rewrite outside quotes, and only when the line's quotes are balanced
+        if len(segments) % 2:
+            segments[::2] = [_compact_text(segment) for segment in segments[::2]]
+        line = '"'.join(segments)
+        if line.startswith("- "):
+            if line in seen_rules:
+                continue
+            seen_rules.add(line)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _compile_template(template: str) -> Callable[..., str]:
+    """
+    Pre-parses a template into its literal text and placeholder names, so rendering it is a single join
+    instead of str.format re-scanning the whole template on every call.
+
+    Args:
+        template (str): A template using plain {name} placeholders (no format specs or conversions).
+
+    Returns:
+        Callable[..., str]: A function taking the placeholder values as keyword arguments.
+    """
+    parts = []
+    for literal, field, format_spec, conversion in string.Formatter().parse(template):
+        if format_spec or conversion or (field is not None and not field.isidentifier()):
+            raise ValueError(f"Unsupported placeholder {{{field}}} in prompt template")
+        # Interned so looking a field up in the keyword arguments, whose names are interned, hits on identity
+        parts.append((literal, sys.intern(field) if field is not None else None))
+
+    def render(**values: Any) -> str:
+        pieces = []
+        for literal, field in parts:
+            pieces.append(literal)
+            if field is not None:
+                value = values[field]
+                pieces.append(value if type(value) is str else format(value))
+        return "".join(pieces)
+
+    return render
+
+
+def _render(template: str, **values: Any) -> str:
+    """Format a template, using its pre-compiled renderer when it is one of this module's templates."""
+    render = _COMPILED_TEMPLATES.get(template)
+    return render(**values) if render is not None else template.format(**values)
+
+
+def _find_intent_template(intent: str | None) -> str | None:
+    """Get the template registered for an intent, lower-casing the intent only when it isn't already canonical."""
+    if not intent:
+        return None
+    return _INTENT_TEMPLATES.get(intent) or _INTENT_TEMPLATES.get(intent.lower())
+
+
+def _split_ctx_template(template: str) -> tuple[str, str, str] | None:
+    """Split a template whose only fields are {context} then {question} into the text around them."""
+    parsed = list(string.Formatter().parse(template))
+    if [field for _, field, _, _ in parsed if field is not None] != ["context", "question"]:
+        return None
+    literals = [literal for literal, _, _, _ in parsed]
+    return literals[0], literals[1], literals[2] if len(literals) > 2 else ""
+
+
+def _render_ctx(template: str, context: str, question: str) -> str:
+    """Render a context prompt, joining the pre-split parts of the template when it is one of this module's."""
+    parts = _CTX_TEMPLATE_PARTS.get(template)
+    if parts is None:
+        return _render(template, context=context, question=question, common_facts=COMMON_SYSTEM_FACTS)
+    prefix, middle, suffix = parts
+    return "".join((prefix, context, middle, question, suffix))
+
+
+def _static_prefix_length(template: str, dynamic_fields) -> int:
+    """Length of the template text before its first dynamic placeholder."""
+    return min(
+        (index for index in (template.find("{" + name + "}") for name in dynamic_fields) if index >= 0),
+        default=len(template),
+    )
+
+
+def _truncate(text: str, max_tokens: int, keep_end: bool = False) -> str:
+    """
+    Cut text down to about `max_tokens` tokens at a word boundary.
+
+    Args:
+        text (str): The text to cap.
+        max_tokens (int): The maximum number of estimated tokens to keep.
+        keep_end (bool): If True, keep the end of the text (e.g. the most recent chat turns) instead of the start.
+
+    Returns:
+        str: The text, truncated if it was longer than the cap.
+    """
+    max_chars = max_tokens * _CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    if keep_end:
+        truncated = text[-max_chars:]
+        truncated = truncated[truncated.find(" ") + 1 :] if " " in truncated else truncated
+    else:
+        truncated = text[:max_chars]
+        truncated = truncated[: truncated.rfind(" ")] if " " in truncated else truncated
+    logger.info(f"Truncated prompt input from {len(text)} to {len(truncated)} characters")
+    return truncated
+
+
 def generate_qa_prompt(template: str, question: str) -> str:
     """
     Generates a prompt for a question-answer task.
@@ -281,35 +441,70 @@ def generate_qa_prompt(template: str, question: str) -> str:
         str: The generated prompt.
     """
 
-    prompt = template.format(question=question)
+    prompt = _render(template, question=question)
     return prompt
 
 
-def generate_ctx_prompt(template: str = None, question: str = "", context: str = "", use_simple_prompt: bool = False) -> str:
+def generate_ctx_prompt(
+    template: str = None,
+    question: str = "",
+    context: str = "",
+    use_simple_prompt: bool = False,
+    intent: str | None = None,
+) -> str:
     """
     Generates a prompt for a context-aware question-answer task.
 
     Args:
         template (str, optional): A string template with placeholders for question, and context.
-            If None, will use SIMPLE_CTX_PROMPT_TEMPLATE or CTX_PROMPT_TEMPLATE based on use_simple_prompt.
+            If None, the template registered for `intent` is used, falling back to SIMPLE_CTX_PROMPT_TEMPLATE or
+            CTX_PROMPT_TEMPLATE based on use_simple_prompt.
         question (str): The question to be included in the prompt.
-        context (str, optional): Additional context information. Defaults to "".
+        context (str, optional): Additional context information, cut to MAX_CTX_TOKENS. Defaults to "".
         use_simple_prompt (bool, optional): If True, use SIMPLE_CTX_PROMPT_TEMPLATE. Defaults to False.
+        intent (str | None, optional): The detected intent (e.g. "pricing"), used to pick an intent-specific
+            template. Defaults to None.
 
     Returns:
         str: The generated prompt.
     """
     if template is None:
-        if use_simple_prompt:
-            template = SIMPLE_CTX_PROMPT_TEMPLATE
-        else:
-            template = CTX_PROMPT_TEMPLATE
+        template = _find_intent_template(intent) or _CTX_TEMPLATES[use_simple_prompt]
 
-    prompt = template.format(context=context, question=question)
-    return prompt
+    context = _truncate(context, MAX_CTX_TOKENS)
+    return _render_ctx(template, context, question)
 
 
-def generate_refined_ctx_prompt(template: str = None, question: str = "", existing_answer: str = "", context: str = "", use_simple_prompt: bool = False) -> str:
+def batch_generate_ctx_prompts(
+    questions: Iterable[str], contexts: Iterable[str], use_simple_prompt: bool = False
+) -> list[str]:
+    """
+    Generates the context prompts for several (question, context) pairs, resolving the template once.
+
+    The prompts are ready to be sent concurrently (e.g. with `asyncio.gather` over `async_generate_answer`).
+
+    Args:
+        questions (Iterable[str]): The questions, one per prompt.
+        contexts (Iterable[str]): The context of each prompt, each cut to MAX_CTX_TOKENS.
+        use_simple_prompt (bool, optional): If True, use SIMPLE_CTX_PROMPT_TEMPLATE. Defaults to False.
+
+    Returns:
+        list[str]: The generated prompts, in the order of the pairs.
+    """
+    prefix, middle, suffix = _CTX_TEMPLATE_PARTS[_CTX_TEMPLATES[use_simple_prompt]]
+    return [
+        "".join((prefix, _truncate(context, MAX_CTX_TOKENS), middle, question, suffix))
+        for question, context in zip(questions, contexts)
+    ]
+
+
+def generate_refined_ctx_prompt(
+    template: str = None,
+    question: str = "",
+    existing_answer: str = "",
+    context: str = "",
+    use_simple_prompt: bool = False,
+) -> str:
     """
     Generates a prompt for a refined context-aware question-answer task.
 
@@ -318,19 +513,18 @@ def generate_refined_ctx_prompt(template: str = None, question: str = "", existi
             If None, will use SIMPLE_REFINED_CTX_PROMPT_TEMPLATE or REFINED_CTX_PROMPT_TEMPLATE based on use_simple_prompt.
         question (str): The question to be included in the prompt.
         existing_answer (str): The existing answer associated with the question.
-        context (str, optional): Additional context information. Defaults to "".
+        context (str, optional): Additional context information, cut to MAX_CTX_TOKENS. Defaults to "".
         use_simple_prompt (bool, optional): If True, use SIMPLE_REFINED_CTX_PROMPT_TEMPLATE. Defaults to False.
 
     Returns:
         str: The generated prompt.
     """
     if template is None:
-        if use_simple_prompt:
-            template = SIMPLE_REFINED_CTX_PROMPT_TEMPLATE
-        else:
-            template = REFINED_CTX_PROMPT_TEMPLATE
+        template = _REFINED_CTX_TEMPLATES[use_simple_prompt]
 
-    prompt = template.format(
+    context = _truncate(context, MAX_CTX_TOKENS)
+    prompt = _render(
+        template,
         context=context,
         existing_answer=existing_answer,
         question=question,
@@ -345,14 +539,15 @@ def generate_conversation_awareness_prompt(template: str, question: str, chat_hi
     Args:
         template (str): A string template with placeholders for question, and chat_history.
         question (str): The question to be included in the prompt.
-        chat_history (str): The chat history associated with the conversation.
+        chat_history (str): The chat history associated with the conversation; only its last MAX_HIST_TOKENS are kept.
 
     Returns:
         str: The generated prompt.
     """
 
-    prompt = template.format(
-        chat_history=chat_history,
+    prompt = _render(
+        template,
+        chat_history=_truncate(chat_history, MAX_HIST_TOKENS, keep_end=True),
         question=question,
     )
     return prompt
@@ -419,6 +614,28 @@ Generate a booking nudge that:
 Booking nudge:"""
 
 
+@functools.lru_cache(maxsize=512)
+def _serialize_slots(items: tuple[tuple[str, Any], ...]) -> str:
+    """Render (name, value) slot pairs as "name: value, ..." for the slot prompts."""
+    return ", ".join([f"{k}: {v}" for k, v in items])
+
+
+def _format_slots(slots: dict) -> str:
+    """
+    Render the filled slots of a slot dict for a prompt, or "None" when no slot is filled.
+
+    The booking flow renders the same few slot combinations turn after turn, so the rendering is memoized on
+    the filled (name, value) pairs; slot values that can't be hashed are rendered directly.
+    """
+    items = tuple((k, v) for k, v in slots.items() if v is not None)
+    if not items:
+        return "None"
+    try:
+        return _serialize_slots(items)
+    except TypeError:
+        return ", ".join([f"{k}: {v}" for k, v in items])
+
+
 def generate_slot_question_prompt(intent: str, missing_slot: str, collected_slots: dict) -> str:
     """
     Generate a prompt for creating a slot-filling question.
@@ -431,11 +648,10 @@ def generate_slot_question_prompt(intent: str, missing_slot: str, collected_slot
     Returns:
         Formatted prompt string
     """
-    collected_str = ", ".join([f"{k}: {v}" for k, v in collected_slots.items() if v is not None])
-    if not collected_str:
-        collected_str = "None"
+    collected_str = _format_slots(collected_slots)
     
-    return SLOT_QUESTION_PROMPT_TEMPLATE.format(
+    return _render(
+        SLOT_QUESTION_PROMPT_TEMPLATE,
         intent=intent,
         missing_slot=missing_slot,
         collected_slots=collected_str
@@ -454,11 +670,10 @@ def generate_recommendation_prompt(intent: str, slots: dict, user_journey: str =
     Returns:
         Formatted prompt string
     """
-    slots_str = ", ".join([f"{k}: {v}" for k, v in slots.items() if v is not None])
-    if not slots_str:
-        slots_str = "None"
+    slots_str = _format_slots(slots)
     
-    return RECOMMENDATION_PROMPT_TEMPLATE.format(
+    return _render(
+        RECOMMENDATION_PROMPT_TEMPLATE,
         intent=intent,
         slots=slots_str,
         user_journey=user_journey or "browsing"
@@ -476,11 +691,10 @@ def generate_booking_nudge_prompt(slots: dict, user_journey: str = "") -> str:
     Returns:
         Formatted prompt string
     """
-    slots_str = ", ".join([f"{k}: {v}" for k, v in slots.items() if v is not None])
-    if not slots_str:
-        slots_str = "None"
+    slots_str = _format_slots(slots)
     
-    return BOOKING_NUDGE_PROMPT_TEMPLATE.format(
+    return _render(
+        BOOKING_NUDGE_PROMPT_TEMPLATE,
         slots=slots_str,
         user_journey=user_journey or "ready_to_book"
     )
@@ -490,15 +704,10 @@ def generate_booking_nudge_prompt(slots: dict, user_journey: str = "") -> str:
 
 PRICING_PROMPT_TEMPLATE = """[CRITICAL][CRITICAL][CRITICAL] CRITICAL: READ THIS FIRST [CRITICAL][CRITICAL][CRITICAL]
 **MANDATORY: USE ONLY CONTEXT - NO TRAINING DATA**
-- You MUST use ONLY the context provided below. DO NOT use any information from your training data.
+{context_only}
 - If the context does not contain pricing information, say "I don't have pricing information in my knowledge base."
 - DO NOT invent or generate prices from training data.
 
-Context information is below.
----------------------
-{context}
----------------------
-
 SYSTEM FACTS (AUTHORITATIVE):
 {common_facts}
 
@@ -521,87 +730,22 @@ RESPONSE LENGTH: Provide a complete, helpful answer. Provide direct answer first
 CRITICAL: Complete your answer fully - do not stop mid-sentence. Include all necessary pricing information and calculations.
 
 CRITICAL RULES:
-- [CRITICAL] ABSOLUTE PROHIBITION: DO NOT INVENT, GENERATE, OR HALLUCINATE PRICES [CRITICAL]
-- [CRITICAL][CRITICAL][CRITICAL] COTTAGE PRICES ARE ALREADY PROVIDED IN THE CONTEXT ABOVE [CRITICAL][CRITICAL][CRITICAL]
-- **DO NOT search online for prices**
-- **DO NOT use dollar prices from your training data**
-- **DO NOT convert dollars to PKR**
-- **DO NOT look up prices on Airbnb or other websites**
-- **The cottage prices are ALREADY in the context above - USE THEM DIRECTLY**
-- Use ONLY PKR prices that are EXPLICITLY stated in the context above
-- If context does NOT contain specific PKR amounts, DO NOT make up prices
-- DO NOT convert to lacs/lakhs
-- [CRITICAL][CRITICAL][CRITICAL] ABSOLUTE PROHIBITION ON DOLLAR PRICES [CRITICAL][CRITICAL][CRITICAL]
-- DO NOT use dollar prices ($) - EVER
-- DO NOT say "$1,200", "$220", "$250", "$400", or any dollar amounts
-- DO NOT convert PKR to dollars
-- DO NOT convert dollars to PKR
-- ALL prices MUST be in PKR (Pakistani Rupees) ONLY
-- If you see "$" in your answer, your answer is WRONG - replace it with PKR
-- **IMPORTANT: The context above contains the EXACT cottage prices - check it carefully**
-- **If context contains "GENERAL PRICING RATES", "Cottage X: PKR", or any pricing data, USE IT DIRECTLY**
-- **If context contains "PKR" followed by numbers (e.g., "PKR 38,000", "PKR 33,000"), this IS pricing information - USE IT**
-- **If context has pricing (even if formatted as "Cottage 9: PKR 33,000 per night on weekdays, PKR 38,000 per night on weekends"), provide it directly**
-- If context has pricing, provide it directly EXACTLY as stated
-- **ONLY if context has NO pricing information at all (no "PKR", no "pricing", no rates), then say "I don't have specific pricing information in my knowledge base. Please contact us for current rates."**
-- **CRITICAL: If context contains "STRUCTURED PRICING ANALYSIS" or "TOTAL COST FOR X NIGHTS: PKR", this means pricing has been CALCULATED - you MUST provide this calculated total**
-- **[CRITICAL][CRITICAL][CRITICAL] MANDATORY: When user provides dates OR nights in their question, you MUST calculate total cost [CRITICAL][CRITICAL][CRITICAL]**
-- **CASE 1: If user provides dates (e.g., "i will stay from 10 march to 19 march"):**
-  1. **EXTRACT the dates:**
-     - Start: 10 March
-     - End: 19 March
-  2. **CALCULATE nights:**
-     - Check-in: 10 March (stay night of 10th)
-     - Check-out: 19 March (leave on 19th)
-     - Nights = 19 - 10 = 9 nights (you stay on nights of: 10, 11, 12, 13, 14, 15, 16, 17, 18 = 9 nights)
-  3. **CALCULATE total cost:**
-     - Get rates from context (e.g., Cottage 9: PKR 33,000 weekday, PKR 38,000 weekend)
-     - Count weekday nights (Monday-Friday) and weekend nights (Saturday-Sunday) in the date range
-     - Calculate: (weekday nights × PKR 33,000) + (weekend nights × PKR 38,000) = Total PKR
-  4. **PROVIDE the answer:**
-     - "For your stay from 10 March to 19 March (9 nights) at Cottage 9:"
-     - "X weekday nights at PKR 33,000 = PKR XXX"
-     - "X weekend nights at PKR 38,000 = PKR XXX"
-     - "Total cost: PKR XXX"
-- **CASE 2: If user provides only nights (e.g., "i will stay for 5 nights" or "tell me pricing for 5 nights"):**
-  1. **EXTRACT the number of nights:**
-     - Nights = 5 (from "5 nights")
-  2. **CALCULATE total cost using estimated weekday/weekend mix:**
-     - Get rates from context (e.g., Cottage 9: PKR 33,000 weekday, PKR 38,000 weekend)
-     - If context contains "ESTIMATED TOTAL" or "typical weekday/weekend mix", use that calculation
-     - If context shows price range (minimum/maximum), provide the estimated total and mention the range
-  3. **PROVIDE the answer:**
-     - "For 5 nights at Cottage 9, the estimated total cost is PKR XXX (based on a typical weekday/weekend mix)."
-     - "Price range: PKR XXX (all weekdays) to PKR XXX (all weekends)."
-     - "The exact price depends on which days are weekdays vs weekends."
-- **[CRITICAL] CRITICAL: DO NOT ask for dates if dates OR nights are in the question - calculate immediately**
-- **[CRITICAL] CRITICAL: DO NOT say "I need dates" if nights are provided - calculate using nights**
-- **[CRITICAL] CRITICAL: DO NOT say "I need check-in dates" if nights are provided - provide estimated pricing**
-- **[CRITICAL] CRITICAL: DO NOT ask for guest count if already mentioned - use the provided number**
-- **[CRITICAL] CRITICAL: If dates OR nights are provided, you MUST calculate and provide the total cost - do not defer to Airbnb or website**
-- **[CRITICAL] CRITICAL: If user says "i will stay for 5 nights", calculate estimated total immediately using typical weekday/weekend mix**
-- Calculate totals when nights are specified, but ONLY using prices from context
-- DO NOT say "I don't have direct access to real-time pricing" or "I'm a large language model" - if context has pricing data, USE IT
-- DO NOT suggest visiting Airbnb or website if context contains calculated pricing - provide the calculated price directly
-- DO NOT use prices like "PKR 18,000", "PKR 12,000", "PKR 24,000" unless they appear in the context above
-
-[CRITICAL] ABSOLUTE PROHIBITION: DO NOT OUTPUT TEMPLATES OR INSTRUCTIONS [CRITICAL]
-- If context contains "[CRITICAL] CRITICAL PRICING INFORMATION" or "STRUCTURED PRICING ANALYSIS" or "[WARNING] MANDATORY INSTRUCTIONS FOR LLM" or "GENERAL PRICING RATES", these contain PRICING DATA that you MUST USE
-- **CRITICAL: If context contains "GENERAL PRICING RATES" followed by pricing information (e.g., "Cottage 9: PKR 33,000 per night on weekdays, PKR 38,000 per night on weekends"), this IS the pricing information you must provide to the user**
-- **The template markers ([CRITICAL], [WARNING]) and instruction text are for YOU to understand the data - but the PRICING DATA itself (the rates, amounts, cottage numbers) is what the user needs**
-- **DO NOT START YOUR ANSWER WITH "[WARNING]" OR "[CRITICAL]" OR "GENERAL" - these are template markers, NOT part of your answer**
-- **DO NOT output "[WARNING] GENERAL PRICING QUERY DETECTED" or similar template text**
-- **START YOUR ANSWER DIRECTLY with the actual pricing information (e.g., "Cottage 9 costs PKR 33,000...")**
-- DO NOT copy, repeat, or output ANY part of the template markers or instruction text to the user
-- DO NOT include the emoji markers ([CRITICAL], [WARNING], 🎯) in your answer
-- DO NOT include the instruction numbers (1., 2., 3., etc.) in your answer
-- DO NOT include phrases like "CRITICAL PRICING INFORMATION", "MANDATORY INSTRUCTIONS", "STRUCTURED PRICING ANALYSIS", "GENERAL PRICING QUERY DETECTED" in your answer
-- **BUT DO extract and provide the actual pricing data (cottage numbers, PKR amounts, weekday/weekend rates) from the template**
-- Instead, extract ONLY the pricing information (dates, nights, rates, total cost) and provide a natural, conversational answer
-- Example: If template says "Cottage 9: PKR 33,000 per night on weekdays, PKR 38,000 per night on weekends", you should say: "Cottage 9 costs PKR 33,000 per night on weekdays and PKR 38,000 per night on weekends" (extract the pricing data, ignore the template markers)
-- Example: If template says "TOTAL COST FOR 1 NIGHTS: PKR 33,000", you should say: "For 1 night at Cottage 9, the total cost is PKR 33,000" (NOT the entire template)
-- Your answer should be natural and conversational, NOT a template or instruction list
-- START YOUR ANSWER DIRECTLY with the pricing information - do not include any template text, emojis, or warning symbols
+- [CRITICAL] Use ONLY PKR prices EXPLICITLY stated in the context below - the cottage prices are already there. NEVER invent prices, look them up online or on Airbnb, or use prices from training data (e.g. "PKR 18,000", "PKR 12,000", "PKR 24,000" unless they appear in the context)
+- [CRITICAL] Prices in PKR only. NEVER output "$" or dollar amounts, never convert between currencies and never convert to lacs/lakhs
+- Pricing data in the context ("GENERAL PRICING RATES", "Cottage 9: PKR 33,000 per night on weekdays, PKR 38,000 per night on weekends" or any other "PKR" amount) IS the answer - provide it EXACTLY as stated
+- ONLY if the context has NO pricing information at all (no "PKR", no "pricing", no rates), say "I don't have specific pricing information in my knowledge base. Please contact us for current rates."
+- [CRITICAL] When the question gives dates or nights, the total has already been calculated for you: use the "TOTAL COST FOR X NIGHTS: PKR" (or "ESTIMATED TOTAL: PKR") value and the weekday/weekend breakdown from context EXACTLY as given - DO NOT recalculate nights, weekdays or totals yourself
+- [CRITICAL] DO NOT ask for dates, check-in dates or guest count if they are already in the question
+- If the context has pricing or a calculated total, provide it - DO NOT defer to Airbnb or the website, and DO NOT say "I don't have direct access to real-time pricing" or "I'm a large language model"
+
+OUTPUT FORMAT:
+- The context may wrap pricing data in system markers ("CRITICAL PRICING INFORMATION", "STRUCTURED PRICING ANALYSIS", "MANDATORY INSTRUCTIONS FOR LLM", "GENERAL PRICING QUERY DETECTED"), emojis and numbered instructions. Extract the pricing data (cottages, dates, nights, rates, total) and NEVER copy the markers, emojis, instruction numbers or instruction text into your answer
+- START YOUR ANSWER DIRECTLY with the pricing information, in natural conversational sentences (e.g. "Cottage 9 costs PKR 33,000 per night on weekdays and PKR 38,000 per night on weekends" or "For 1 night at Cottage 9, the total cost is PKR 33,000")
+
+Context information is below.
+---------------------
+{context}
+---------------------
 
 Question: {question}
 Answer:"""
@@ -609,20 +753,12 @@ Answer:"""
 
 AVAILABILITY_PROMPT_TEMPLATE = """[CRITICAL][CRITICAL][CRITICAL] CRITICAL: READ THIS FIRST [CRITICAL][CRITICAL][CRITICAL]
 **MANDATORY: USE ONLY CONTEXT - NO TRAINING DATA**
-- You MUST use ONLY the context provided below. DO NOT use any information from your training data.
-- If the context does not contain the answer, say "I don't have that information in my knowledge base."
+{context_only}
+{no_info}
 
 **ABSOLUTE PROHIBITION ON PRICING - THIS IS MANDATORY**
-- DO NOT mention ANY pricing, prices, costs, rates, PKR amounts, or monetary information
-- DO NOT say "PKR 32,000", "PKR 38,000", "costs", "pricing", "price", "rate", "per night"
-- Even if context contains pricing, DO NOT include it in your answer
+{no_pricing}
 - This is an AVAILABILITY query, NOT a pricing query
-- If you mention pricing, your answer is WRONG
-
-Context information is below.
----------------------
-{context}
----------------------
 
 SYSTEM FACTS (AUTHORITATIVE):
 {common_facts}
@@ -634,7 +770,7 @@ ALLOWED FIELDS:
 - Date-related availability
 
 FORBIDDEN FIELDS:
-- Pricing information (ABSOLUTELY FORBIDDEN - do not mention PKR, prices, costs, rates)
+- Pricing information
 - Capacity details (unless asked)
 - Safety information
 - Location details
@@ -673,7 +809,10 @@ CRITICAL RULES - READ CAREFULLY:
 6. Complete your answer fully - do not stop mid-sentence
 7. Use all available tokens to provide a complete response
 
-[CRITICAL] ABSOLUTE PROHIBITION: DO NOT mention pricing, prices, costs, rates, PKR amounts
+Context information is below.
+---------------------
+{context}
+---------------------
 
 Question: {question}
 Answer:"""
@@ -681,20 +820,12 @@ Answer:"""
 
 SAFETY_PROMPT_TEMPLATE = """[CRITICAL][CRITICAL][CRITICAL] CRITICAL: READ THIS FIRST [CRITICAL][CRITICAL][CRITICAL]
 **MANDATORY: USE ONLY CONTEXT - NO TRAINING DATA**
-- You MUST use ONLY the context provided below. DO NOT use any information from your training data.
-- If the context does not contain the answer, say "I don't have that information in my knowledge base."
+{context_only}
+{no_info}
 
 **ABSOLUTE PROHIBITION ON PRICING - THIS IS MANDATORY**
-- DO NOT mention ANY pricing, prices, costs, rates, PKR amounts, or monetary information
-- DO NOT say "PKR 32,000", "PKR 38,000", "costs", "pricing", "price", "rate", "per night"
-- Even if context contains pricing, DO NOT include it in your answer
+{no_pricing}
 - This is a SAFETY query, NOT a pricing query
-- If you mention pricing, your answer is WRONG
-
-Context information is below.
----------------------
-{context}
----------------------
 
 SYSTEM FACTS (AUTHORITATIVE):
 {common_facts}
@@ -707,7 +838,7 @@ ALLOWED FIELDS:
 - Emergency procedures
 
 FORBIDDEN FIELDS:
-- Pricing information (ABSOLUTELY FORBIDDEN - do not mention PKR, prices, costs, rates)
+- Pricing information
 - Availability details
 - Capacity information
 - Location details (unless relevant to safety)
@@ -724,7 +855,6 @@ CRITICAL RULES:
 - [CRITICAL] START YOUR ANSWER DIRECTLY with safety information - do not preface it with a question or rephrasing
 - Focus on safety and security features
 - Mention guards, gated community if in context
-- [CRITICAL] ABSOLUTE PROHIBITION: DO NOT mention pricing, prices, costs, rates, PKR amounts
 - [CRITICAL] ABSOLUTE PROHIBITION: DO NOT ask questions back to the user - provide a direct answer immediately
 - [CRITICAL] ABSOLUTE PROHIBITION: DO NOT say "I'd love to know", "I'd like to know", "Could you tell me", "I recommend verifying", "contact management", "check with management", "verify with management", or any phrase that asks the user for information or defers to external sources
 - [CRITICAL] ABSOLUTE PROHIBITION: NEVER say "we can't provide a definitive answer", "I can't provide a definitive answer", "we can't provide", "it's essential to note that we can't provide", or any variation
@@ -735,17 +865,14 @@ CRITICAL RULES:
 - NEVER defer to external sources, management, or official sources if context has safety information
 
 [CRITICAL][CRITICAL][CRITICAL] HANDLING GENERAL VS SPECIFIC INFORMATION [CRITICAL][CRITICAL][CRITICAL]:
-- **IF user asks about safety "for each cottage", "in each cottage", or "for Cottage X, Y, Z"** BUT context only contains general/overall safety information:
-  - **DO NOT say "I don't have enough information" or "I couldn't find specific details"**
-  - **DO NOT say "Unfortunately, I don't have information about each cottage"**
-  - **DO NOT say "we can't provide a definitive answer" or "it's essential to note that we can't provide"**
-  - **DO NOT say "I recommend verifying" or "contact management"**
-  - **INSTEAD: Provide the general safety information from context IMMEDIATELY**
-  - **State that these safety measures apply to ALL cottages (Cottage 7, Cottage 9, and Cottage 11)**
-  - **Use phrases like "All cottages have...", "The cottages include...", or "Each cottage features..."**
-  - **Example: If context mentions "gated community with security guards" and user asks "safety for each cottage", respond: "All cottages at Swiss Cottages Bhurban are located in a secure gated community with security guards. These safety measures apply to Cottage 7, Cottage 9, and Cottage 11."**
+{general_info}
+- **Example: If context mentions "gated community with security guards" and user asks "safety for each cottage", respond: "All cottages at Swiss Cottages Bhurban are located in a secure gated community with security guards. These safety measures apply to Cottage 7, Cottage 9, and Cottage 11."**
 - **IF context contains ANY safety-related terms (safe, safety, security, guard, guards, gated, secure, surveillance, emergency), you MUST provide that information - NEVER say information is unavailable**
-- **ONLY say "I don't have information" if context truly has ABSOLUTELY NO safety-related terms at all (no safe, safety, security, guard, guards, gated, secure, surveillance, emergency)**
+
+Context information is below.
+---------------------
+{context}
+---------------------
 
 Question: {question}
 Answer:"""
@@ -753,26 +880,15 @@ Answer:"""
 
 ROOMS_PROMPT_TEMPLATE = """[CRITICAL][CRITICAL][CRITICAL] CRITICAL: READ THIS FIRST [CRITICAL][CRITICAL][CRITICAL]
 **MANDATORY: USE ONLY CONTEXT - NO TRAINING DATA**
-- You MUST use ONLY the context provided below. DO NOT use any information from your training data.
-- If the context does not contain the answer, say "I don't have that information in my knowledge base."
+{context_only}
+{no_info}
 
 **ABSOLUTE PROHIBITION ON PRICING - THIS IS MANDATORY**
-- DO NOT mention ANY pricing, prices, costs, rates, PKR amounts, or monetary information
-- DO NOT say "PKR 32,000", "PKR 38,000", "costs", "pricing", "price", "rate", "per night"
-- Even if context contains pricing, DO NOT include it in your answer
+{no_pricing}
 - This is a COTTAGE/DESCRIPTION query, NOT a pricing query
-- If you mention pricing, your answer is WRONG
 
 **LOCATION RULE - MANDATORY**
-- Location MUST be "Swiss Cottages Bhurban, Bhurban, Murree" or "Bhurban, Murree, Pakistan" or "Murree Hills, Pakistan"
-- NEVER say "Azad Kashmir", "Patriata", or "PC Bhurban" for cottage location
-- The cottages are in Murree (Murree Hills), NOT in Azad Kashmir
-- If you mention "Azad Kashmir" for cottage location, your answer is WRONG
-
-Context information is below.
----------------------
-{context}
----------------------
+{location}
 
 SYSTEM FACTS (AUTHORITATIVE):
 {common_facts}
@@ -786,7 +902,7 @@ ALLOWED FIELDS:
 - Property details
 
 FORBIDDEN FIELDS:
-- Pricing information (ABSOLUTELY FORBIDDEN - do not mention PKR, prices, costs, rates)
+- Pricing information
 - Availability details (unless asked)
 - Safety information
 - Location details (unless relevant - but MUST be "Bhurban, Murree, Pakistan" or "Murree Hills, Pakistan")
@@ -799,27 +915,23 @@ CRITICAL: Complete your answer fully - do not stop mid-sentence. Include all rel
 CRITICAL RULES:
 - Focus on cottage types/properties (Cottage 7, 9, 11)
 - Include capacity: base (up to 6) and max (up to 9 with confirmation)
-- [CRITICAL] ABSOLUTE PROHIBITION: DO NOT mention pricing, prices, costs, rates, PKR amounts, or any monetary information
 - Location MUST be "Swiss Cottages Bhurban, Bhurban, Murree" or "Bhurban, Murree, Pakistan" - NEVER "Azad Kashmir" or "Patriata"
 - Use "cottage_id" terminology, NOT "room_type"
 - Answer the question directly - do not add extra information
 
+Context information is below.
+---------------------
+{context}
+---------------------
+
 Question: {question}
 Answer:"""
 
 
 FACILITIES_PROMPT_TEMPLATE = """[CRITICAL][CRITICAL][CRITICAL] CRITICAL: READ THIS FIRST [CRITICAL][CRITICAL][CRITICAL]
 **ABSOLUTE PROHIBITION ON PRICING - THIS IS MANDATORY**
-- DO NOT mention ANY pricing, prices, costs, rates, PKR amounts, or monetary information
-- DO NOT say "PKR 32,000", "PKR 38,000", "costs", "pricing", "price", "rate", "per night"
-- Even if context contains pricing, DO NOT include it in your answer
+{no_pricing}
 - This is a FACILITIES query, NOT a pricing query
-- If you mention pricing, your answer is WRONG
-
-Context information is below.
----------------------
-{context}
----------------------
 
 SYSTEM FACTS (AUTHORITATIVE):
 {common_facts}
@@ -832,7 +944,7 @@ ALLOWED FIELDS:
 - Equipment and features
 
 FORBIDDEN FIELDS:
-- Pricing information (ABSOLUTELY FORBIDDEN - do not mention PKR, prices, costs, rates)
+- Pricing information
 - Availability details (unless asked)
 - Safety information
 - Location details
@@ -844,22 +956,15 @@ CRITICAL: Complete your answer fully - do not stop mid-sentence. Include all rel
 
 CRITICAL RULES:
 - Focus on facilities and amenities
-- [CRITICAL] ABSOLUTE PROHIBITION: DO NOT mention pricing, prices, costs, rates, PKR amounts
 
 [CRITICAL][CRITICAL][CRITICAL] HANDLING GENERAL VS SPECIFIC INFORMATION [CRITICAL][CRITICAL][CRITICAL]:
-- **CRITICAL: If user asks about facilities "in each cottage", "for each cottage", or "for Cottage X, Y, Z"**:
-  - **FIRST: Check if context contains ANY facilities information (even if general/overall)**
-  - **IF context has ANY facilities information (general or specific):**
-    - **[CRITICAL] ABSOLUTE PROHIBITION: DO NOT say "I couldn't find", "I was unable to find", "I don't have", "unfortunately", "I recommend checking", "please contact", "check the official website", "reach out to", "contact the establishment", or ANY phrase indicating information is unavailable**
-    - **[CRITICAL] ABSOLUTE PROHIBITION: DO NOT say "I couldn't find any information on" or "I couldn't find specific details"**
-    - **[CRITICAL] ABSOLUTE PROHIBITION: DO NOT say "I would expect" or "it's likely to include" - if context has information, state it directly**
-    - **INSTEAD: IMMEDIATELY provide the facilities information from context (even if it's general)**
-    - **State that these facilities apply to ALL cottages (Cottage 7, Cottage 9, and Cottage 11)**
-    - **Use phrases like "All cottages have...", "The cottages include...", or "Each cottage features..."**
-    - **Example: If context mentions "fully equipped kitchens" or "kitchen" or "microwave, oven, kettle" and user asks "kitchen facilities in each cottage", respond: "All cottages at Swiss Cottages Bhurban have fully equipped kitchens that include: microwave, oven, kettle, refrigerator, cookware, and utensils. These kitchen facilities are available in Cottage 7, Cottage 9, and Cottage 11."**
-    - **If context mentions kitchen facilities in general terms, extract and provide them - do not say you couldn't find specific details**
-  - **ONLY if context has ABSOLUTELY NO facilities information at all (no mention of kitchen, facilities, amenities, equipment, etc.), then you may say information is unavailable**
-- **[CRITICAL] CRITICAL RULE: If context contains ANY mention of the topic (kitchen, facilities, amenities, equipment), you MUST provide that information - never say "I couldn't find"**
+{general_info}
+- **Example: If context mentions "fully equipped kitchens" or "kitchen" or "microwave, oven, kettle" and user asks "kitchen facilities in each cottage", respond: "All cottages at Swiss Cottages Bhurban have fully equipped kitchens that include: microwave, oven, kettle, refrigerator, cookware, and utensils. These kitchen facilities are available in Cottage 7, Cottage 9, and Cottage 11."**
+
+Context information is below.
+---------------------
+{context}
+---------------------
 
 Question: {question}
 Answer:"""
@@ -867,17 +972,15 @@ Answer:"""
 
 LOCATION_PROMPT_TEMPLATE = """[CRITICAL][CRITICAL][CRITICAL] CRITICAL: READ THIS FIRST [CRITICAL][CRITICAL][CRITICAL]
 **MANDATORY: USE ONLY CONTEXT - NO TRAINING DATA**
-- You MUST use ONLY the context provided below. DO NOT use any information from your training data.
-- If the context does not contain the answer, say "I don't have that information in my knowledge base."
+{context_only}
+{no_info}
 - DO NOT use locations like "Bhubaneswar" (India) or "Azad Kashmir" from training data - these are WRONG
 - If context mentions "Bhurban" or "Murree", use that EXACTLY. Do not substitute with other locations.
 
 **ABSOLUTE PROHIBITION ON PRICING - THIS IS MANDATORY**
-- DO NOT mention ANY pricing, prices, costs, rates, PKR amounts for cottages OR attractions
-- DO NOT say "PKR 32,000", "PKR 38,000", "costs", "pricing", "price", "rate", "per night"
-- Even if context contains pricing, DO NOT include it in your answer
+{no_pricing}
+- This applies to cottages AND attractions
 - This is a LOCATION query, NOT a pricing query
-- If you mention pricing, your answer is WRONG
 
 **ABSOLUTE PROHIBITION ON QUESTION REPHRASING AND WRONG DESCRIPTIONS**
 - [CRITICAL] DO NOT rephrase, repeat, or restate the user's question - answer directly
@@ -926,11 +1029,6 @@ LOCATION_PROMPT_TEMPLATE = """[CRITICAL][CRITICAL][CRITICAL] CRITICAL: READ THIS
   * "Swiss Cottages is located adjacent to Pearl Continental (PC) Bhurban in the Murree Hills, within a secure gated community in Bhurban, Pakistan. [MAP] View on Google Maps: https://goo.gl/maps/PQbSR9DsuxwjxUoU6"
 - [CRITICAL] YOUR ANSWER MUST START WITH "Swiss Cottages" - do NOT start with "Bhurban is..." or describe Bhurban as a general place
 
-Context information is below.
----------------------
-{context}
----------------------
-
 SYSTEM FACTS (AUTHORITATIVE):
 {common_facts}
 - CORRECT LOCATION: Swiss Cottages is located adjacent to Pearl Continental (PC) Bhurban in the Murree Hills, within a secure gated community in Bhurban, Pakistan
@@ -947,7 +1045,7 @@ ALLOWED FIELDS:
 - Surrounding areas
 
 FORBIDDEN FIELDS:
-- Pricing information (ABSOLUTELY FORBIDDEN - do not mention PKR, prices, costs, rates for cottages OR attractions)
+- Pricing information (for cottages OR attractions)
 - Availability details (unless asked)
 - Safety information
 - Capacity information
@@ -980,14 +1078,19 @@ CRITICAL RULES - FOLLOW THESE EXACTLY:
 
 REMEMBER: The correct location is ALWAYS "Murree Hills, Bhurban, Pakistan" - NEVER "Azad Kashmir" or "Patriata"
 
+Context information is below.
+---------------------
+{context}
+---------------------
+
 Question: {question}
 Answer:"""
 
 
 GENERAL_PROMPT_TEMPLATE = """[CRITICAL][CRITICAL][CRITICAL] CRITICAL: READ THIS FIRST [CRITICAL][CRITICAL][CRITICAL]
 **MANDATORY: USE ONLY CONTEXT - NO TRAINING DATA**
-- You MUST use ONLY the context provided below. DO NOT use any information from your training data.
-- If the context does not contain the answer, say "I don't have that information in my knowledge base."
+{context_only}
+{no_info}
 - DO NOT use locations like "Bhubaneswar" (India), "Lahore", "Karachi", "Azad Kashmir" from training data - these are WRONG
 - If context mentions "Bhurban" or "Murree", use that EXACTLY. Do not substitute with other locations.
 
@@ -999,20 +1102,8 @@ GENERAL_PROMPT_TEMPLATE = """[CRITICAL][CRITICAL][CRITICAL] CRITICAL: READ THIS
 - Even if context contains pricing, DO NOT include it unless the question asks about it
 - If you mention pricing when the question doesn't ask about it, your answer is WRONG
 
-**LOCATION RULE - MANDATORY AND ABSOLUTE**
-- [CRITICAL] ABSOLUTE PROHIBITION: NEVER say "Azad Kashmir" for Swiss Cottages location - this is COMPLETELY WRONG
-- [CRITICAL] ABSOLUTE PROHIBITION: NEVER say "Patriata" for Swiss Cottages location - this is COMPLETELY WRONG
-- CORRECT LOCATION: "Swiss Cottages is located adjacent to Pearl Continental (PC) Bhurban in the Murree Hills, within a secure gated community in Bhurban, Pakistan"
-- Location formats: "Swiss Cottages Bhurban, Bhurban, Murree, Pakistan" or "Bhurban, Murree, Pakistan" or "Murree Hills, Pakistan"
-- The cottages are in Murree Hills, Bhurban, Pakistan - NOT in Azad Kashmir
-- PC Bhurban (Pearl Continental Bhurban) is a nearby hotel/viewpoint, NOT where cottages are - cottages are adjacent to it
-- If context mentions "Azad Kashmir" for cottage location, COMPLETELY IGNORE IT - use ONLY the correct location above
-- If question is about location, you MUST include Google Maps link: https://goo.gl/maps/PQbSR9DsuxwjxUoU6
-
-Context information is below.
----------------------
-{context}
----------------------
+**LOCATION RULE - MANDATORY**
+{location}
 
 SYSTEM FACTS (AUTHORITATIVE):
 {common_facts}
@@ -1040,19 +1131,12 @@ CRITICAL RULES:
 - Be helpful and conversational but concise
 
 [CRITICAL][CRITICAL][CRITICAL] HANDLING GENERAL VS SPECIFIC INFORMATION [CRITICAL][CRITICAL][CRITICAL]:
-- **CRITICAL: If user asks about specific details "for each cottage", "in each cottage", or "for Cottage X, Y, Z"**:
-  - **FIRST: Check if context contains ANY information about the topic (even if general/overall)**
-  - **IF context has ANY information about the topic (general or specific):**
-    - **[CRITICAL] ABSOLUTE PROHIBITION: DO NOT say "I couldn't find", "I was unable to find", "I don't have", "unfortunately", "I recommend checking", "please contact", "check the official website", "reach out to", "contact the establishment", or ANY phrase indicating information is unavailable**
-    - **[CRITICAL] ABSOLUTE PROHIBITION: DO NOT say "I don't have enough information to give a definitive answer"**
-    - **[CRITICAL] ABSOLUTE PROHIBITION: DO NOT say "I would expect" or "it's likely to include" - if context has information, state it directly**
-    - **INSTEAD: IMMEDIATELY provide the information from context (even if it's general)**
-    - **State that this information applies to ALL cottages (Cottage 7, Cottage 9, and Cottage 11) when relevant**
-    - **Use phrases like "All cottages have...", "The cottages include...", or "Each cottage features..."**
-    - **Example: If context has general kitchen info and user asks "kitchen facilities in each cottage", respond with the general kitchen information and state it applies to all cottages**
-    - **If context mentions the topic in general terms, extract and provide that information - do not say you couldn't find specific details**
-  - **ONLY if context has ABSOLUTELY NO information about the topic at all, then you may say information is unavailable**
-- **[CRITICAL] CRITICAL RULE: If context contains ANY mention of the topic, you MUST provide that information - never say "I couldn't find"**
+{general_info}
+
+Context information is below.
+---------------------
+{context}
+---------------------
 
 Question: {question}
 Answer:"""
@@ -1068,20 +1152,7 @@ def get_intent_prompt_template(intent: str) -> str:
     Returns:
         Prompt template string
     """
-    intent_lower = intent.lower() if intent else ""
-    
-    intent_to_template = {
-        "pricing": PRICING_PROMPT_TEMPLATE,
-        "availability": AVAILABILITY_PROMPT_TEMPLATE,
-        "safety": SAFETY_PROMPT_TEMPLATE,
-        "rooms": ROOMS_PROMPT_TEMPLATE,
-        "facilities": FACILITIES_PROMPT_TEMPLATE,
-        "location": LOCATION_PROMPT_TEMPLATE,
-        "booking": AVAILABILITY_PROMPT_TEMPLATE,  # Booking uses availability template
-        "faq_question": GENERAL_PROMPT_TEMPLATE,  # General questions use general template
-    }
-    
-    return intent_to_template.get(intent_lower, GENERAL_PROMPT_TEMPLATE)
+    return _find_intent_template(intent) or GENERAL_PROMPT_TEMPLATE
 
 
 def generate_intent_ctx_prompt(intent: str, question: str = "", context: str = "") -> str:
@@ -1091,11 +1162,67 @@ def generate_intent_ctx_prompt(intent: str, question: str = "", context: str = "
     Args:
         intent: Intent string
         question: The question to be included in the prompt
-        context: Additional context information
+        context: Additional context information, cut to MAX_CTX_TOKENS
         
     Returns:
         The generated prompt
     """
     template = get_intent_prompt_template(intent)
-    prompt = template.format(context=context, question=question, common_facts=COMMON_SYSTEM_FACTS)
-    return prompt
+    context = _truncate(context, MAX_CTX_TOKENS)
+    return _render_ctx(template, context, question)
+
+
+# Every request re-sends these templates, so they are compacted once at import, after filling in the shared
+# rule slots. COMMON_SYSTEM_FACTS never changes at runtime, so it is baked into the templates here as well,
+# leaving only the request-specific fields to substitute per request. The results are interned so callers
+# importing a template by name and the renderer registry below share one object, and template lookups
+# short-circuit on identity instead of comparing kilobytes of text.
+COMMON_SYSTEM_FACTS = sys.intern(_compact(_expand_rules(COMMON_SYSTEM_FACTS)))
+for _name, _value in list(globals().items()):
+    if _name.endswith("_TEMPLATE") and isinstance(_value, str):
+        _value = _compact(_expand_rules(_value)).replace("{common_facts}", COMMON_SYSTEM_FACTS)
+        globals()[_name] = sys.intern(_value)
+del _name, _value
+
+# Intent-specific templates by intent, built after compaction so they are the compacted, pre-compiled templates
+_INTENT_TEMPLATES: dict[str, str] = {
+    "pricing": PRICING_PROMPT_TEMPLATE,
+    "availability": AVAILABILITY_PROMPT_TEMPLATE,
+    "safety": SAFETY_PROMPT_TEMPLATE,
+    "rooms": ROOMS_PROMPT_TEMPLATE,
+    "facilities": FACILITIES_PROMPT_TEMPLATE,
+    "location": LOCATION_PROMPT_TEMPLATE,
+    "booking": AVAILABILITY_PROMPT_TEMPLATE,  # Booking uses availability template
+    "faq_question": GENERAL_PROMPT_TEMPLATE,  # General questions use general template
+}
+
+# Default context templates, indexed by use_simple_prompt
+_CTX_TEMPLATES = (CTX_PROMPT_TEMPLATE, SIMPLE_CTX_PROMPT_TEMPLATE)
+_REFINED_CTX_TEMPLATES = (REFINED_CTX_PROMPT_TEMPLATE, SIMPLE_REFINED_CTX_PROMPT_TEMPLATE)
+
+# Renderers for every template in this module, keyed by the template text
+_COMPILED_TEMPLATES: dict[str, Callable[..., str]] = {
+    value: _compile_template(value)
+    for name, value in list(globals().items())
+    if name.endswith("_TEMPLATE") and isinstance(value, str)
+}
+
+# The context and intent templates only take the context and question once the common facts are baked in, so
+# they are rendered by joining the text around those two fields
+_CTX_TEMPLATE_PARTS: dict[str, tuple[str, str, str]] = {
+    template: parts for template in _COMPILED_TEMPLATES if (parts := _split_ctx_template(template)) is not None
+}
+
+# Static prefixes of the context and conversation prompts, by module name (e.g. "pricing"). These templates keep
+# every rule ahead of their dynamic fields, so each prompt built from one starts with its module and a
+# self-hosted model can prefill the modules once and reuse their attention state for the context, chat history
+# and question.
+PROMPT_MODULES: dict[str, str] = {
+    name.removesuffix("_PROMPT_TEMPLATE").lower(): value[
+        : _static_prefix_length(value, ("context", "chat_history", "question", "existing_answer"))
+    ]
+    for name, value in list(globals().items())
+    if name.endswith("_PROMPT_TEMPLATE")
+    and isinstance(value, str)
+    and ("{context}" in value or "{chat_history}" in value)
+}
@@ -1,43 +1,89 @@
-class ChatHistory(list):
-    def __init__(self, messages: list | None = None, total_length: int = -1):
+from collections import deque
+
+
+class ChatHistory(deque):
+    def __init__(self, turns: list[tuple[str, str]] | None = None, total_length: int = -1):
         """Initialise the queue with a fixed total length.
 
+        The history is a bounded deque of (question, answer) turns, so appending to a full history drops the
+        oldest turn in O(1). Turns are only rendered to text when a prompt or a text-based consumer needs it.
+
         Args:
-            messages (list | None): A list of initial messages
-            total_length (int): The maximum number of messages the chat history can hold.
+            turns (list[tuple[str, str]] | None): A list of initial (question, answer) turns
+            total_length (int): The maximum number of turns the chat history can hold (-1 for no limit).
         """
-        if messages is None:
-            messages = []
+        if turns is None:
+            turns = []
 
-        super().__init__(messages)
+        super().__init__(turns, maxlen=total_length if total_length >= 0 else None)
         self.total_length = total_length
 
-    def append(self, msg: str):
+    @staticmethod
+    def format_turn(question: str, answer: str) -> str:
         """
-        Append a message that contains a question and an answer to the chat history.
+        Format a single turn the way it appears in prompts.
 
         Args:
-            msg (str): The message to be added to the chat history.
+            question (str): The user question.
+            answer (str): The assistant answer.
+
+        Returns:
+            str: The formatted turn.
         """
-        if len(self) == self.total_length:
-            self.pop(0)
-        super().append(msg)
+        return f"question: {question}, answer: {answer}"
 
-    def __str__(self):
+    def messages(self) -> list[str]:
+        """
+        Get the chat history as a list of formatted turns.
+
+        Returns:
+            list[str]: One formatted string per turn, oldest first.
+        """
+        return [self.format_turn(question, answer) for question, answer in self]
+
+    def chat_messages(self) -> list[dict]:
+        """
+        Get the chat history as alternating user/assistant chat messages.
+
+        Sent between the system message and the new prompt, the turns stay byte-identical from one request to
+        the next, so providers with prompt caching can reuse them as a prefix. Clearing the history resets
+        that prefix.
+
+        Returns:
+            list[dict]: A user and an assistant message per turn, oldest first.
+        """
+        return [
+            message
+            for question, answer in self
+            for message in ({"role": "user", "content": question}, {"role": "assistant", "content": answer})
+        ]
+
+    def render(self) -> str:
         """
         Get the chat history as a single string.
 
         Returns:
-            str: The chat history concatenated into a single string, with each message separated by a newline.
+            str: The formatted turns concatenated into a single string, separated by newlines.
         """
-        chat_history = "\n".join([msg for msg in self])
-        return chat_history
-    
+        return "\n".join(self.messages())
+
+    def __str__(self):
+        return self.render()
+
     def get_last_message(self) -> str | None:
         """
-        Get the last message from chat history.
-        
+        Get the last turn from chat history, formatted as text.
+
+        Returns:
+            Last formatted turn or None if history is empty
+        """
+        return self.format_turn(*self[-1]) if len(self) > 0 else None
+
+    def get_last_question(self) -> str | None:
+        """
+        Get the question of the last turn from chat history.
+
         Returns:
-            Last message string or None if history is empty
+            Last question or None if history is empty
         """
-        return self[-1] if len(self) > 0 else None
\ No newline at end of file
+        return self[-1][0] if len(self) > 0 else None
@@ -16,18 +16,33 @@ from helpers.log import get_logger
 
 from bot.conversation.chat_history import ChatHistory
 from bot.conversation.ctx_strategy import AsyncTreeSummarizationStrategy, BaseSynthesisStrategy
+from bot.conversation.rephrase import rephrase_followup
 
 if TYPE_CHECKING:
     from bot.client.lama_cpp_client import LamaCppClient
     from bot.client.groq_client import GroqClient
+    from bot.memory.semantic_cache import SemanticCache
 
 logger = get_logger(__name__)
 
+# Markers of context computed for this request's dates/guests (see pricing_handler); answers built on
+# them are specific to the request and must not be shared through the semantic cache.
+_CALCULATED_CONTEXT_MARKERS = ("STRUCTURED PRICING ANALYSIS", "TOTAL COST FOR", "ESTIMATED TOTAL")
+
+
+def _has_calculated_context(retrieved_contents: list[Document]) -> bool:
+    return any(
+        marker in doc.page_content for doc in retrieved_contents for marker in _CALCULATED_CONTEXT_MARKERS
+    )
+
 
 def refine_question(llm: Union["LamaCppClient", "GroqClient", Any], question: str, chat_history: ChatHistory, max_new_tokens: int = 128) -> str:
     """
     Refines the given question based on the chat history.
 
+    Follow-ups that name their cottage or refer back to the single cottage discussed last are rephrased by
+    rules; the LLM is only asked to rephrase the rest.
+
     Args:
         llm (LlmClient): The language model client for conversation-related tasks.
         question (str): The original question.
@@ -41,6 +56,11 @@ def refine_question(llm: Union["LamaCppClient", "GroqClient", Any], question: st
     """
 
     if chat_history:
+        rephrased_question = rephrase_followup(question, chat_history)
+        if rephrased_question is not None:
+            logger.info(f"--- Refined Question (rule-based): {rephrased_question} ---")
+            return rephrased_question
+
         logger.info("--- Refining the question based on the chat history... ---")
 
         conversation_awareness_prompt = llm.generate_refined_question_conversation_awareness_prompt(
@@ -105,6 +125,15 @@ def answer(llm: Union["LamaCppClient", "GroqClient", Any], question: str, chat_h
         return streamer
 
 
+def _iterate_async_streamer(loop: asyncio.AbstractEventLoop, streamer):
+    """Yield the tokens of an async answer streamer from synchronous code, one loop step per token."""
+    while True:
+        try:
+            yield loop.run_until_complete(streamer.__anext__())
+        except StopAsyncIteration:
+            return
+
+
 def answer_with_context(
     llm: Union["LamaCppClient", "GroqClient", Any],
     ctx_synthesis_strategy: BaseSynthesisStrategy,
@@ -114,6 +143,7 @@ def answer_with_context(
     max_new_tokens: int = 512,
     use_simple_prompt: bool = False,
     intent: str = None,
+    semantic_cache: "SemanticCache | None" = None,
 ):
     """
     Generates an answer to the given question using a context synthesis strategy and retrieved contents.
@@ -127,6 +157,10 @@ def answer_with_context(
         history as tuples of questions and answers.
         retrieved_contents (list[Document]): A list of documents retrieved for context.
         max_new_tokens (int, optional): The maximum number of tokens to generate in the answer. Defaults to 512.
+        semantic_cache (SemanticCache | None, optional): If given, a cached answer to a near-identical question
+            with the same intent is returned without building a prompt or calling the LLM, and new answers are
+            cached once fully streamed. The cache is bypassed when the conversation has history or the context
+            carries a calculated total, since those answers depend on more than the question and intent.
 
     Returns:
         tuple: A tuple containing the answer streamer and formatted prompts.
@@ -139,6 +173,15 @@ def answer_with_context(
             yield ""
         return empty_streamer(), []
 
+    if chat_history or _has_calculated_context(retrieved_contents):
+        semantic_cache = None
+
+    if semantic_cache is not None:
+        cached_answer = semantic_cache.lookup(question, intent)
+        if cached_answer is not None:
+            logger.info("Answering from the semantic cache")
+            return iter([cached_answer]), []
+
     if isinstance(ctx_synthesis_strategy, AsyncTreeSummarizationStrategy):
         # Handle async strategy - try to use existing loop or create new one
         logger.warning("Using async-tree-summarization strategy - this is very slow! Consider using 'create-and-refine' instead.")
@@ -195,6 +238,12 @@ def answer_with_context(
                 # If it's just a streamer, wrap it
                 streamer = result
                 fmt_prompts = []
+            if hasattr(streamer, "__aiter__"):
+                try:
+                    asyncio.get_running_loop()
+                except RuntimeError:
+                    # Sync callers can't `async for`; drive the async streamer on the loop the strategy ran on
+                    streamer = _iterate_async_streamer(loop, streamer)
         except RuntimeError as e:
             # Re-raise RuntimeError with our message
             raise
@@ -213,14 +262,15 @@ def answer_with_context(
             # Check if strategy supports use_simple_prompt parameter
             import inspect
             sig = inspect.signature(ctx_synthesis_strategy.generate_response)
+            kwargs = {}
             if 'use_simple_prompt' in sig.parameters:
-                result = ctx_synthesis_strategy.generate_response(
-                    retrieved_contents, question, max_new_tokens=max_new_tokens, use_simple_prompt=use_simple_prompt
-                )
-            else:
-                result = ctx_synthesis_strategy.generate_response(
-                    retrieved_contents, question, max_new_tokens=max_new_tokens
-                )
+                kwargs["use_simple_prompt"] = use_simple_prompt
+            if 'history' in sig.parameters and chat_history:
+                # Earlier turns go as chat messages ahead of the prompt, a prefix providers can cache across turns
+                kwargs["history"] = chat_history.chat_messages()
+            result = ctx_synthesis_strategy.generate_response(
+                retrieved_contents, question, max_new_tokens=max_new_tokens, **kwargs
+            )
             # Ensure result is a tuple
             if isinstance(result, tuple):
                 streamer, fmt_prompts = result
@@ -231,7 +281,11 @@ def answer_with_context(
         except Exception as e:
             logger.error(f"Error with synthesis strategy: {e}", exc_info=True)
             raise RuntimeError(f"Strategy failed: {e}") from e
-    
+
+    if semantic_cache is not None:
+        # The async tree strategy returns an async streamer when it runs on the caller's event loop
+        wrap = semantic_cache.async_wrap_streamer if hasattr(streamer, "__aiter__") else semantic_cache.wrap_streamer
+        streamer = wrap(question, streamer, llm.parse_token, intent)
     return streamer, fmt_prompts
 
 
@@ -1,11 +1,15 @@
 import asyncio
+import itertools
+import os
 from enum import Enum
-from typing import Any, TYPE_CHECKING, Union
+from typing import Any, Sequence, TYPE_CHECKING, Union
 
 import nest_asyncio
 from entities.document import Document
 from helpers.log import get_logger
 
+from bot.client.prompt import batch_generate_ctx_prompts, generate_intent_ctx_prompt
+
 if TYPE_CHECKING:
     from bot.client.lama_cpp_client import LamaCppClient
     from bot.client.groq_client import GroqClient
@@ -88,7 +92,13 @@ class CreateAndRefineStrategy(BaseSynthesisStrategy):
         super().__init__(llm)
 
     def generate_response(
-        self, retrieved_contents: list[Document], question: str, max_new_tokens: int = 512, use_simple_prompt: bool = False, intent: str = None
+        self,
+        retrieved_contents: list[Document],
+        question: str,
+        max_new_tokens: int = 512,
+        use_simple_prompt: bool = False,
+        intent: str = None,
+        history: Sequence[dict] = (),
     ) -> str | Any:
         """
         Generate a response using create and refine strategy.
@@ -104,6 +114,8 @@ class CreateAndRefineStrategy(BaseSynthesisStrategy):
             retrieved_contents (List[Document]): List of retrieved contents.
             question (str): The question or input prompt.
             max_new_tokens (int, optional): Maximum number of tokens for the generated response. Default is 512.
+            history (Sequence[dict], optional): Earlier conversation turns as chat messages, sent ahead of the
+                final (streamed) prompt. Default is none.
 
         Returns:
             Any: A response generator.
@@ -113,6 +125,8 @@ class CreateAndRefineStrategy(BaseSynthesisStrategy):
         fmt_prompts = []
 
         num_of_contents = len(retrieved_contents)
+        # Decide once whether the intent-specific template applies, so only the selected prompt is ever built
+        use_intent_prompt = bool(intent) and os.getenv("USE_INTENT_FILTERING", "true").lower() == "true"
 
         for idx, node in enumerate(retrieved_contents, start=1):
             logger.info(f"--- Generating an answer for the chunk {idx} ... ---")
@@ -123,43 +137,25 @@ class CreateAndRefineStrategy(BaseSynthesisStrategy):
             logger.debug(f"--- Context: '{context[:200]}...' ... ---")
             if idx == 1:  # First chunk uses contextual prompt
                 # Use intent-specific prompt if intent is provided and intent filtering is enabled
-                if intent:
-                    import os
-                    use_intent_filtering = os.getenv("USE_INTENT_FILTERING", "true").lower() == "true"
-                    if use_intent_filtering:
-                        from bot.client.prompt import generate_intent_ctx_prompt
-                        fmt_prompt = generate_intent_ctx_prompt(intent=intent, question=question, context=context)
-                    else:
-                        fmt_prompt = self.llm.generate_ctx_prompt(question=question, context=context, use_simple_prompt=use_simple_prompt)
+                if use_intent_prompt:
+                    fmt_prompt = generate_intent_ctx_prompt(intent=intent, question=question, context=context)
                 else:
                     fmt_prompt = self.llm.generate_ctx_prompt(question=question, context=context, use_simple_prompt=use_simple_prompt)
             else:
                 # For refinement, use intent-specific constraints if available
-                if intent:
-                    import os
-                    use_intent_filtering = os.getenv("USE_INTENT_FILTERING", "true").lower() == "true"
-                    if use_intent_filtering:
-                        # Use intent-specific prompt for refinement
-                        from bot.client.prompt import generate_intent_ctx_prompt
-                        # For refinement, we add the existing answer context
-                        existing_answer = str(cur_response) if cur_response else ""
-                        # Generate base intent prompt
-                        base_prompt = generate_intent_ctx_prompt(intent=intent, question=question, context=context)
-                        # Modify for refinement
-                        fmt_prompt = base_prompt.replace(
-                            "Context information is below.",
-                            f"Previous answer: {existing_answer}\n\nAdditional context information is below."
-                        ).replace(
-                            "Answer:",
-                            "Refined Answer:"
-                        )
-                    else:
-                        fmt_prompt = self.llm.generate_refined_ctx_prompt(
-                            question=question,
-                            context=context,
-                            existing_answer=str(cur_response) if cur_response else "",
-                            use_simple_prompt=use_simple_prompt,
-                        )
+                if use_intent_prompt:
+                    # For refinement, we add the existing answer context
+                    existing_answer = str(cur_response) if cur_response else ""
+                    # Generate base intent prompt
+                    base_prompt = generate_intent_ctx_prompt(intent=intent, question=question, context=context)
+                    # Modify for refinement
+                    fmt_prompt = base_prompt.replace(
+                        "Context information is below.",
+                        f"Previous answer: {existing_answer}\n\nAdditional context information is below."
+                    ).replace(
+                        "Answer:",
+                        "Refined Answer:"
+                    )
                 else:
                     fmt_prompt = self.llm.generate_refined_ctx_prompt(
                         question=question,
@@ -169,7 +165,9 @@ class CreateAndRefineStrategy(BaseSynthesisStrategy):
                     )
 
             if idx == num_of_contents:
-                cur_response = self.llm.start_answer_iterator_streamer(fmt_prompt, max_new_tokens=max_new_tokens)
+                cur_response = self.llm.start_answer_iterator_streamer(
+                    fmt_prompt, max_new_tokens=max_new_tokens, history=history
+                )
 
             else:
                 cur_response = self.llm.generate_answer(fmt_prompt, max_new_tokens=max_new_tokens)
@@ -303,13 +301,10 @@ class AsyncTreeSummarizationStrategy(BaseSynthesisStrategy):
         Returns:
             Any: A response generator.
         """
-        fmt_prompts = []
-
-        for idx, content in enumerate(retrieved_contents, start=1):
-            context = content.page_content
-            logger.info(f"--- Generating a response for the chunk {idx} ... ---")
-            fmt_qa_prompt = self.llm.generate_ctx_prompt(question=question, context=context)
-            fmt_prompts.append(fmt_qa_prompt)
+        logger.info(f"--- Generating responses for {len(retrieved_contents)} chunks ... ---")
+        fmt_prompts = batch_generate_ctx_prompts(
+            itertools.repeat(question), [content.page_content for content in retrieved_contents]
+        )
 
         tasks = [self.llm.async_generate_answer(p, max_new_tokens=max_new_tokens) for p in fmt_prompts]
         node_responses = await asyncio.gather(*tasks)
@@ -345,13 +340,11 @@ class AsyncTreeSummarizationStrategy(BaseSynthesisStrategy):
         Returns:
             Any: A response generator.
         """
-        fmt_prompts = []
-        for idx in range(0, len(texts), num_children):
-            logger.info(f"--- Creating prompts in batches of size {num_children} ... ---")
-            text_batch = texts[idx : idx + num_children]
-            context = "\n\n".join([t for t in text_batch])
-            fmt_qa_prompt = self.llm.generate_ctx_prompt(question=question, context=context)
-            fmt_prompts.append(fmt_qa_prompt)
+        logger.info(f"--- Creating prompts in batches of size {num_children} ... ---")
+        fmt_prompts = batch_generate_ctx_prompts(
+            itertools.repeat(question),
+            ["\n\n".join(texts[idx : idx + num_children]) for idx in range(0, len(texts), num_children)],
+        )
 
         if len(fmt_prompts) == 1:
             logger.info("--- Generating final response ... ---")
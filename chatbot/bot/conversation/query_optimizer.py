@@ -13,6 +13,97 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+# Fixed expansions from QUERY_OPTIMIZATION_PROMPT_TEMPLATE, applied without an LLM call. Keys are lowercase phrases;
+# where keys overlap the longest phrase wins.
+_SYNONYM_MAP: Dict[str, str] = {
+    "price": "pricing rates weekday weekend peak season",
+    "prices": "pricing rates weekday weekend peak season",
+    "tell me the pricing": "cottage pricing rates per night weekday weekend PKR cost",
+    "capacity": "accommodation capacity guests members",
+    "tell me about cottages": "Swiss Cottages properties accommodation features amenities bedrooms facilities",
+    "about cottages": "cottage properties spaces features amenities accommodation",
+    "which cottages are available": "cottage availability available dates booking vacancies year-round",
+    "tell me about the availability": "cottage availability available dates booking vacancies year-round",
+    "available": "availability available dates booking vacancies year-round",
+    "which cottages": "cottage availability available cottages booking options",
+    "one day": "pricing per night one night rate weekday weekend",
+    "one day pricing": "pricing per night one night rate weekday weekend",
+    "price for one day": "pricing per night one night rate weekday weekend",
+    "how can i book": "booking process reservation how to book contact Airbnb website",
+    "advance payment": "advance payment partial payment booking confirmation required",
+    "is advance payment required": "advance payment required booking confirmation partial payment",
+    "are pets allowed": "pets allowed pet-friendly permission approval",
+    "pet": "pets pet-friendly allowed permission",
+    "pets": "pets pet-friendly allowed permission",
+    "is it safe": "safety security secure gated community security guards guest safety",
+    "is it safe for": "safety security secure gated community security guards guest safety",
+    "safe for us": "safety security secure gated community security guards guest safety",
+    "safety": "safety security secure gated community security guards",
+}
+_SYNONYM_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(key) for key in sorted(_SYNONYM_MAP, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE,
+)
+# Expansions that carry a number from the query
+_NUMERIC_EXPANSIONS = (
+    (
+        re.compile(r"\b(?:stay\s+)?(\d+)\s+nights?\b", re.IGNORECASE),
+        "pricing total cost {} nights calculation weekday weekend rates",
+    ),
+    (
+        re.compile(r"\b(\d+)\s+(?:people|guests|members|persons)\b", re.IGNORECASE),
+        "{} guests group size accommodation capacity",
+    ),
+    (
+        re.compile(r"\bcottage\s*(7|9|11)\b", re.IGNORECASE),
+        "cottage {} properties features amenities accommodation details",
+    ),
+)
+# Minimum share of the query's content words the rules have to match for their rewrite to be used instead of
+# the LLM's, so a single generic word (e.g. "available" in "is wifi available?") doesn't decide the expansion
+_MIN_RULE_COVERAGE = 0.6
+_WORD_RE = re.compile(r"\w+")
+_STOP_WORDS = frozenset(
+    "a an the is are am be it its i me my we us our you your can could do does for in of to on at with and or "
+    "what which how when there any this that these those about please tell".split()
+)
+
+
+def expand_query_synonyms(query: str) -> Optional[str]:
+    """
+    Rewrite a query for retrieval by appending the fixed domain expansions of the phrases it contains.
+
+    Args:
+        query: The original query.
+
+    Returns:
+        The query followed by the expansion terms it doesn't already contain, or None if the matched phrases
+        cover too little of the query for the rules to be trusted.
+    """
+    expansions = []
+    spans = []
+    for match in _SYNONYM_RE.finditer(query):
+        expansions.append(_SYNONYM_MAP[match.group(0).lower()])
+        spans.append(match.span())
+    for pattern, expansion in _NUMERIC_EXPANSIONS:
+        for match in pattern.finditer(query):
+            expansions.append(expansion.format(match.group(1)))
+            spans.append(match.span())
+    if not expansions:
+        return None
+    content_words = [word for word in _WORD_RE.finditer(query) if word.group(0).lower() not in _STOP_WORDS]
+    covered = sum(any(start <= word.start() < end for start, end in spans) for word in content_words)
+    if covered < _MIN_RULE_COVERAGE * len(content_words):
+        return None
+
+    seen = set(query.lower().split())
+    terms = []
+    for term in " ".join(expansions).split():
+        if term.lower() not in seen:
+            seen.add(term.lower())
+            terms.append(term)
+    return f"{query} {' '.join(terms)}" if terms else query
+
 
 def optimize_query_for_rag(
     llm: Union["LamaCppClient", "GroqClient", Any],
@@ -23,7 +114,8 @@ def optimize_query_for_rag(
     """
     Optimize user query for better RAG retrieval.
     
-    This function enhances queries by:
+    Queries made up mostly of known domain phrases are rewritten by `expand_query_synonyms` without an LLM
+    call; the LLM is only used for the rest. This function enhances queries by:
     - Disambiguating numbers (e.g., "4 people" vs "cottage 4")
     - Expanding domain terms (e.g., "price" → "pricing rates weekday weekend")
     - Adding relevant keywords for better semantic matching
@@ -42,6 +134,11 @@ def optimize_query_for_rag(
         logger.warning("Empty query provided, returning as-is")
         return query
     
+    expanded_query = expand_query_synonyms(query)
+    if expanded_query is not None:
+        logger.info(f"Query optimized by rules: '{query}' → '{expanded_query}'")
+        return expanded_query
+
     try:
         start_time = time.time()
         
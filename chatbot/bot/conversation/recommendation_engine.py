@@ -729,7 +729,7 @@ class RecommendationEngine:
             history_summary = ""
             if chat_history:
                 # Take last 5 messages for context
-                recent_history = chat_history[-5:] if len(chat_history) > 5 else chat_history
+                recent_history = list(chat_history)[-5:]
                 history_summary = "\n".join([f"- {msg}" for msg in recent_history])
             else:
                 history_summary = "No previous conversation"
@@ -169,18 +169,8 @@ class RefinementDetector:
         if not chat_history or len(chat_history) == 0:
             return ""
         
-        # Chat history format: "question: {question}, answer: {answer}"
-        # Get the last entry
-        last_entry = chat_history[-1]
-        
-        # Extract question from format "question: {question}, answer: {answer}"
-        if "question:" in last_entry:
-            parts = last_entry.split("question:", 1)
-            if len(parts) > 1:
-                question_part = parts[1].split(", answer:", 1)[0].strip()
-                return question_part
-        
-        return ""
+        # Chat history stores (question, answer) turns, so the last question needs no parsing
+        return (chat_history.get_last_question() or "").strip()
 
 
 # Global instance for easy access
@@ -0,0 +1,68 @@
+"""Rule-based rephrasing of follow-up questions, so the common cases skip the LLM rephrasing call."""
+
+import functools
+import re
+from typing import Iterable
+
+_COTTAGE_RE = re.compile(r"\bcottage\s*(?:no\.?\s*|number\s*|#\s*)?(7|9|11)\b", re.IGNORECASE)
+# Explicit references to "the cottage we were talking about", rewritten to the cottage found in the chat history.
+# "it" and "the one" are left to the LLM, since they are often not references at all ("is it possible to...",
+# "how much does it cost to hire a cook?", "which is the one with a terrace?").
+_COTTAGE_REFERENCE_RE = re.compile(r"\b(?:this|that) (?:cottage|one)\b", re.IGNORECASE)
+# Pronouns that may point back at an earlier turn; a question naming a cottage is only standalone without them
+_PRONOUN_RE = re.compile(r"\b(?:it|its)\b", re.IGNORECASE)
+# References the rules can't resolve: plural pronouns, location questions (which refer to the property, not a
+# cottage) and follow-ups that only add a modifier to the previous question
+_AMBIGUOUS_RE = re.compile(
+    r"\b(?:they|them|their|these|those|where|location|located|address)\b"
+    r"|^\s*(?:and|also|but|what about|how about|for|just|only)\b",
+    re.IGNORECASE,
+)
+
+
+def _last_mentioned_cottage(turns: Iterable[tuple[str, str]]) -> str | None:
+    """
+    Get the cottage the most recent turn mentioning a cottage is about.
+
+    Returns None if that turn mentions more than one cottage, since the reference is then ambiguous.
+    """
+    for question, answer in reversed(list(turns)):
+        for text in (question, answer):
+            cottages = set(_COTTAGE_RE.findall(text))
+            if len(cottages) == 1:
+                return cottages.pop()
+            if cottages:
+                return None
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _rephrase(question: str, turns: tuple[tuple[str, str], ...]) -> str | None:
+    if _AMBIGUOUS_RE.search(question):
+        return None
+    if _COTTAGE_RE.search(question):
+        # An explicitly named cottage takes priority over the one in the chat history, unless the question
+        # still refers to something else ("is cottage 7 bigger than that one?")
+        if _COTTAGE_REFERENCE_RE.search(question) or _PRONOUN_RE.search(question):
+            return None
+        return question
+    if not _COTTAGE_REFERENCE_RE.search(question):
+        return None
+    cottage = _last_mentioned_cottage(turns)
+    if cottage is None:
+        return None
+    return _COTTAGE_REFERENCE_RE.sub(f"cottage {cottage}", question)
+
+
+def rephrase_followup(question: str, chat_history: Iterable[tuple[str, str]]) -> str | None:
+    """
+    Rephrase a follow-up question into a standalone question using deterministic rules.
+
+    Args:
+        question (str): The follow-up question.
+        chat_history (Iterable[tuple[str, str]]): The (question, answer) turns of the conversation, oldest first.
+
+    Returns:
+        str | None: The standalone question, or None if the rules don't apply and the LLM should rephrase it.
+    """
+    return _rephrase(question.strip(), tuple(chat_history))
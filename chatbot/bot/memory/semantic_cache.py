@@ -0,0 +1,185 @@
+import re
+import threading
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterator
+
+import numpy as np
+from helpers.log import get_logger
+
+logger = get_logger(__name__)
+
+_NUMBER_WORDS = {
+    word: str(value)
+    for value, word in enumerate(
+        ("one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten", "eleven", "twelve"), 1
+    )
+}
+_NUMBER_RE = re.compile(r"\d+|\b(?:" + "|".join(_NUMBER_WORDS) + r")\b", re.IGNORECASE)
+
+
+class SemanticCache:
+    def __init__(
+        self,
+        embed: Callable[[str], list[float]],
+        threshold: float = 0.92,
+        max_entries: int = 512,
+        path: Path | str | None = None,
+    ):
+        """
+        Initialize an in-process cache of answers keyed by the embedding of the question they answer.
+
+        Embeddings are kept L2-normalized in a single (N, d) matrix, so a lookup is one matrix-vector product.
+        When the cache is full the oldest entry is overwritten. Questions that differ only in a number (cottage,
+        guests, nights, dates) embed almost identically, so a hit also requires the same numbers in both.
+
+        Args:
+            embed (Callable[[str], list[float]]): The function used to embed questions (e.g. `Embedder.embed_query`).
+            threshold (float): The minimum cosine similarity for a cached answer to be returned.
+            max_entries (int): The maximum number of cached answers.
+            path (Path | str | None): Optional `.npz` file the cache is loaded from and saved to.
+        """
+        self.embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.path = Path(path) if path is not None else None
+        self._embeddings: np.ndarray | None = None
+        self._answers: list[str] = []
+        self._intents: list[str] = []
+        self._entities: list[str] = []
+        self._next = 0
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    @staticmethod
+    def _intent_key(intent) -> str:
+        # Accept both IntentType members and their string values
+        return str(getattr(intent, "value", intent) or "")
+
+    @staticmethod
+    def _entity_key(question: str) -> str:
+        # The numbers in a question (cottage ids, guest counts, nights, dates), order-insensitive
+        numbers = [_NUMBER_WORDS.get(match.lower(), match.lstrip("0") or "0") for match in _NUMBER_RE.findall(question)]
+        return " ".join(sorted(numbers))
+
+    def _embed(self, question: str) -> np.ndarray:
+        vector = np.asarray(self.embed(question), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def lookup(self, question: str, intent: str | None = None) -> str | None:
+        """
+        Get the cached answer of the most similar question asked with the same intent and numbers.
+
+        Args:
+            question (str): The incoming question.
+            intent (str | None): The intent the question was routed to.
+
+        Returns:
+            str | None: The cached answer, or None if no cached question is similar enough.
+        """
+        if not self._answers:
+            return None
+        query = self._embed(question)
+        intent = self._intent_key(intent)
+        entities = self._entity_key(question)
+        with self._lock:
+            scores = self._embeddings[: len(self._answers)] @ query
+            for index in np.argsort(scores)[::-1]:
+                if scores[index] < self.threshold:
+                    break
+                if self._intents[index] == intent and self._entities[index] == entities:
+                    logger.debug(f"Semantic cache hit (score={scores[index]:.3f})")
+                    return self._answers[index]
+        return None
+
+    def store(self, question: str, answer: str, intent: str | None = None) -> None:
+        """
+        Cache the answer to a question.
+
+        Args:
+            question (str): The question that was answered.
+            answer (str): The generated answer.
+            intent (str | None): The intent the question was routed to.
+        """
+        if not answer or self.max_entries <= 0:
+            return
+        vector = self._embed(question)
+        with self._lock:
+            if self._embeddings is None:
+                self._embeddings = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+            index = self._next
+            self._embeddings[index] = vector
+            if index < len(self._answers):
+                self._answers[index] = answer
+                self._intents[index] = self._intent_key(intent)
+                self._entities[index] = self._entity_key(question)
+            else:
+                self._answers.append(answer)
+                self._intents.append(self._intent_key(intent))
+                self._entities.append(self._entity_key(question))
+            self._next = (index + 1) % self.max_entries
+
+    def wrap_streamer(self, question: str, streamer: Iterator, parse_token: Callable, intent: str | None = None):
+        """
+        Pass the tokens of an answer streamer through and cache the full answer once the stream is exhausted.
+
+        Args:
+            question (str): The question being answered.
+            streamer (Iterator): The LLM answer streamer.
+            parse_token (Callable): The client's `parse_token`, used to rebuild the answer text.
+            intent (str | None): The intent the question was routed to.
+        """
+        parts = []
+        for token in streamer:
+            parts.append(parse_token(token))
+            yield token
+        self.store(question, "".join(parts), intent)
+
+    async def async_wrap_streamer(
+        self, question: str, streamer: AsyncIterator, parse_token: Callable, intent: str | None = None
+    ):
+        """Async counterpart of wrap_streamer, for answer streamers read with `async for`."""
+        parts = []
+        async for token in streamer:
+            parts.append(parse_token(token))
+            yield token
+        self.store(question, "".join(parts), intent)
+
+    def save(self) -> None:
+        """Persist the cache to its `.npz` file."""
+        if self.path is None or not self._answers:
+            return
+        with self._lock:
+            np.savez(
+                self.path,
+                embeddings=self._embeddings[: len(self._answers)],
+                answers=np.array(self._answers, dtype=object),
+                intents=np.array(self._intents, dtype=object),
+                entities=np.array(self._entities, dtype=object),
+            )
+
+    def load(self) -> None:
+        """Load the cache from its `.npz` file, keeping at most `max_entries` of the stored answers."""
+        try:
+            data = np.load(self.path, allow_pickle=True)
+            embeddings = data["embeddings"][: self.max_entries]
+            answers = [str(answer) for answer in data["answers"][: self.max_entries]]
+            intents = [str(intent) for intent in data["intents"][: self.max_entries]]
+            entities = [str(entity) for entity in data["entities"][: self.max_entries]]
+        except Exception as e:
+            logger.warning(f"Could not load semantic cache from {self.path}: {e}")
+            return
+        if not answers:
+            return
+        with self._lock:
+            self._embeddings = np.zeros((self.max_entries, embeddings.shape[1]), dtype=np.float32)
+            self._embeddings[: len(answers)] = embeddings
+            self._answers = answers
+            self._intents = intents
+            self._entities = entities
+            self._next = len(answers) % self.max_entries
+        logger.info(f"Loaded {len(answers)} semantic cache entries from {self.path}")
@@ -151,7 +151,7 @@ def main(parameters) -> None:
 
         message_placeholder.markdown(final_answer)
         # Add assistant response to chat history
-        chat_history.append(f"question: {user_input}, answer: {final_answer}")
+        chat_history.append((user_input, final_answer))
         st.session_state.messages.append({"role": "assistant", "content": final_answer})
 
         took = time.time() - start_time
@@ -108,15 +108,14 @@ def loop(llm, chat_history, synthesis_strategy, index, parameters) -> None:
             retrieved_contents=retrieved_contents,
             max_new_tokens=parameters.max_new_tokens,
         )
-        answer = ""
+        tokens = []
         for token in streamer:
             parsed_token = llm.parse_token(token)
-            answer += parsed_token
+            tokens.append(parsed_token)
             print(parsed_token, end="", flush=True)
+        answer = "".join(tokens)
 
-        chat_history.append(
-            f"question: {refined_question}, answer: {answer}",
-        )
+        chat_history.append((refined_question, answer))
 
         console.print("\n[bold magenta]Formatted Answer:[/bold magenta]")
         if answer:
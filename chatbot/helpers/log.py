@@ -26,3 +26,25 @@ def experimental(func):
         return func(*args, **kwargs)
 
     return wrapper
+
+
+class SampledTracebackFilter(logging.Filter):
+    """
+    Keeps the traceback on only one in `rate` records that carry one.
+
+    Error storms (e.g. upstream rate limits) log the same failure many times; dropping most tracebacks
+    avoids formatting them while the message itself is always logged.
+    """
+
+    def __init__(self, rate: int = 100):
+        super().__init__()
+        self.rate = rate
+        self._seen = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.exc_info:
+            # Keep the first traceback, then every `rate`-th one
+            if self._seen % self.rate:
+                record.exc_info = None
+            self._seen += 1
+        return True
@@ -945,7 +945,7 @@ def main(parameters) -> None:
                                         display_cottage_images(cottage_numbers, root_folder)
 
                                     # Update chat history
-                                    chat_history.append(f"question: {refined_user_input}, answer: {answer_text}")
+                                    chat_history.append((refined_user_input, answer_text))
                                 except Exception as e:
                                     logger.error(f"Error generating answer: {e}", exc_info=True)
                                     error_msg = str(e).lower()
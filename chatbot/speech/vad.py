@@ -8,6 +8,7 @@ with speech enhancement, RMS-based loudest speaker detection
 for chatbot voice agents.
 """
 
+from functools import lru_cache
 from typing import Tuple, List
 import numpy as np
 import logging
@@ -38,6 +39,30 @@ except ImportError:
     logger.warning("scipy not available")
 
 
+@lru_cache(maxsize=None)
+def _load_silero_model():
+    """
+    Load the Silero VAD model once per process.
+
+    Detectors keep per-connection state (RMS history), so each connection builds its own, but they all share
+    the loaded model instead of reloading it.
+    """
+    logger.info("Loading Silero VAD model...")
+    model, utils = torch.hub.load(
+        repo_or_dir="snakers4/silero-vad",
+        model="silero_vad",
+        force_reload=False,
+        onnx=False,
+        verbose=False,
+    )
+    (get_speech_timestamps, _, _, _, _) = utils
+
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    model = model.to(device).eval()
+    logger.info(f"Silero VAD loaded on {device}")
+    return model, device, get_speech_timestamps
+
+
 class VoiceActivityDetector:
     """
     Voice Activity Detector for multiple humans.
@@ -89,20 +114,7 @@ class VoiceActivityDetector:
 
     # -------------------- Model Loading --------------------
     def _load_silero(self):
-        logger.info("Loading Silero VAD model...")
-        model, utils = torch.hub.load(
-            repo_or_dir="snakers4/silero-vad",
-            model="silero_vad",
-            force_reload=False,
-            onnx=False,
-            verbose=False,
-        )
-        (get_speech_timestamps, _, _, _, _) = utils
-
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model = model.to(self.device).eval()
-        self.get_speech_timestamps = get_speech_timestamps
-        logger.info(f"Silero VAD loaded on {self.device}")
+        self.model, self.device, self.get_speech_timestamps = _load_silero_model()
 
     # -------------------- Frequency Filtering --------------------
     def filter_voice_frequencies(self, audio: np.ndarray, sr: int) -> np.ndarray:
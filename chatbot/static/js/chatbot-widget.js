@@ -26,6 +26,8 @@
             this.isProcessingAudio = false;
             this.isWaitingForResponse = false; // Track if we're waiting for LLM response
             this.isPlayingTTS = false; // Track if TTS audio is currently playing
+            this.ttsPlayback = Promise.resolve(); // Chain of queued TTS audio chunks, played in order
+            this.expectedAudioBytes = null; // Size announced by 'answer_chunk' for the next binary frame
             this.mediaRecorder = null;
             this.audioChunks = [];
             this.websocket = null;
@@ -2890,10 +2892,15 @@
 
                 this.websocket.onmessage = async (event) => {
                     if (event.data instanceof Blob) {
-                        // Binary audio data (TTS response)
-                        const audioUrl = URL.createObjectURL(event.data);
+                        // Binary audio data (TTS response), announced by the preceding 'answer_chunk' message
                         // playAudio() will set isPlayingTTS flag to prevent listening to own voice
-                        await this.playAudio(audioUrl);
+                        const expectedBytes = this.expectedAudioBytes;
+                        this.expectedAudioBytes = null;
+                        if (expectedBytes !== null && event.data.size !== expectedBytes) {
+                            console.warn('Skipping TTS chunk: expected', expectedBytes, 'bytes, got', event.data.size);
+                        } else {
+                            this.queueAudioChunk(event.data);
+                        }
                     } else {
                         // JSON message
                         try {
@@ -2910,6 +2917,11 @@
                                 }));
                             } else if (data.type === 'answer') {
                                 this.handleVoiceResponse(data);
+                            } else if (data.type === 'answer_chunk') {
+                                // The audio itself follows as the next binary frame
+                                this.expectedAudioBytes = data.audio_bytes;
+                            } else if (data.type === 'answer_end') {
+                                this.ttsPlayback.then(() => this.restartRecordingAfterResponse());
                             } else if (data.type === 'error') {
                                 console.error('WebSocket error:', data.message);
                                 this.isProcessingAudio = false;
@@ -2965,7 +2977,10 @@
                 this.addMessage('assistant', data.text);
             }
 
-            if (data.audio) {
+            if (data.audio_streaming) {
+                // Audio arrives separately as binary frames; recording restarts on 'answer_end'
+                this.ttsPlayback = Promise.resolve();
+            } else if (data.audio) {
                 // Decode base64 audio (now using wav format from Groq)
                 const audioBytes = Uint8Array.from(atob(data.audio), c => c.charCodeAt(0));
                 const audioBlob = new Blob([audioBytes], { type: 'audio/wav' });
@@ -2995,6 +3010,22 @@
             }
         }
 
+        queueAudioChunk(audioBlob) {
+            // Play a binary audio frame (wav format from Groq) after any chunks already queued
+            const audioUrl = URL.createObjectURL(new Blob([audioBlob], { type: 'audio/wav' }));
+            this.ttsPlayback = this.ttsPlayback
+                .then(() => this.playAudio(audioUrl))
+                .catch(error => console.error('Error playing TTS chunk:', error));
+        }
+
+        restartRecordingAfterResponse() {
+            // After all audio finishes, restart recording if still in recording mode
+            if (this.isRecording && !this.isWaitingForResponse && !this.isPlayingTTS) {
+                console.log('✅ TTS finished, restarting recording for next question');
+                this.restartRecording();
+            }
+        }
+
         async playAudio(audioUrl) {
             return new Promise((resolve, reject) => {
                 // Mark that TTS is playing - microphone stays connected but won't collect audio
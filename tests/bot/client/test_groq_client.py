@@ -0,0 +1,109 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from bot.client import groq_client
+from bot.client.groq_client import GroqClient, GroqRateLimiter, GroqThrottledError, _truncate_at_stop
+
+
+def test_truncate_at_stop_cuts_before_stop_sequence():
+    assert _truncate_at_stop("", "answer\n\n\nmore") == ("answer", True)
+    assert _truncate_at_stop("", "no stop here") == ("no stop here", False)
+
+
+def test_truncate_at_stop_catches_sequence_split_across_batches():
+    assert _truncate_at_stop("a#", "#b") == ("", True)
+
+
+def test_rate_limiter_waits_once_request_quota_is_spent():
+    limiter = GroqRateLimiter(rpm=60)
+    assert [limiter._reserve(1) > 0 for _ in range(61)] == [False] * 60 + [True]
+
+
+def test_rate_limiter_caps_oversized_requests_at_token_quota():
+    limiter = GroqRateLimiter(tpm=1000)
+    assert limiter._reserve(5000) == 0
+    assert limiter._reserve(1) > 0
+
+
+def test_rate_limiter_fails_fast_instead_of_sleeping_on_the_event_loop():
+    limiter = GroqRateLimiter(rpm=1)
+
+    async def acquire_twice():
+        limiter.acquire(1)
+        with pytest.raises(GroqThrottledError):
+            limiter.acquire(1)
+
+    asyncio.run(acquire_twice())
+    # The failed request's reservation was given back
+    assert limiter._requests == pytest.approx(0, abs=0.01)
+
+
+def test_throttled_sync_call_from_an_async_caller_raises_the_rate_limit_message(monkeypatch):
+    monkeypatch.setattr(groq_client, "_RATE_LIMITER", GroqRateLimiter(rpm=1))
+    client = GroqClient.__new__(GroqClient)
+    client.model_name = "model"
+    client._system_message = {"role": "system", "content": "system"}
+    client._create = lambda **kwargs: SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="answer"))]
+    )
+
+    async def handler():
+        assert client.generate_answer("first") == "answer"
+        with pytest.raises(GroqThrottledError) as excinfo:
+            client.generate_answer("second")
+        return excinfo.value
+
+    error = asyncio.run(handler())
+    assert error.retry_after == 60
+    assert str(error).startswith("Rate limit error:") and "Please retry in 60 seconds." in str(error)
+
+
+def test_build_messages_puts_history_between_system_message_and_prompt():
+    client = GroqClient.__new__(GroqClient)
+    client._system_message = {"role": "system", "content": "system"}
+    history = [{"role": "user", "content": "q1"}, {"role": "assistant", "content": "a1"}]
+    assert client._build_messages("q2", history) == [
+        {"role": "system", "content": "system"},
+        *history,
+        {"role": "user", "content": "q2"},
+    ]
+
+
+def test_async_streamer_reads_the_async_groq_stream_and_stops_at_stop_sequences():
+    class FakeAsyncStream:
+        closed = False
+
+        def __init__(self, contents):
+            self.chunks = [
+                SimpleNamespace(choices=[SimpleNamespace(finish_reason=None, delta=SimpleNamespace(content=c))])
+                for c in contents
+            ]
+
+        async def __aiter__(self):
+            for chunk in self.chunks:
+                yield chunk
+
+        async def close(self):
+            FakeAsyncStream.closed = True
+
+    async def create(**kwargs):
+        return FakeAsyncStream(["Cottage ", "9 has ", "3 bedrooms.", "\n\n\n", "junk"])
+
+    client = GroqClient.__new__(GroqClient)
+    client.model_name = "model"
+    client.model_settings = SimpleNamespace(reasoning=False)
+    client._system_message = {"role": "system", "content": "system"}
+    client._async_create = create
+
+    async def collect():
+        streamer = await client.async_start_answer_iterator_streamer("prompt")
+        return [token async for token in streamer]
+
+    assert "".join(asyncio.run(collect())) == "Cottage 9 has 3 bedrooms."
+    assert FakeAsyncStream.closed
+
+
+def test_parse_token_accepts_text_and_chunk_dicts():
+    assert GroqClient.parse_token("hello") == "hello"
+    assert GroqClient.parse_token({"choices": [{"delta": {"content": "hello"}}]}) == "hello"
@@ -0,0 +1,95 @@
+from bot.client import prompt
+from bot.client.prompt import (
+    _GUARDRAIL_RULES,
+    _INTENT_TEMPLATES,
+    _RULES,
+    PROMPT_MODULES,
+    REFINED_ANSWER_CONVERSATION_AWARENESS_PROMPT_TEMPLATE,
+    REFINED_QUESTION_CONVERSATION_AWARENESS_PROMPT_TEMPLATE,
+    _format_slots,
+    _truncate,
+    batch_generate_ctx_prompts,
+    generate_conversation_awareness_prompt,
+    generate_ctx_prompt,
+    generate_intent_ctx_prompt,
+    generate_refined_ctx_prompt,
+)
+
+
+def test_compiled_templates_render_like_str_format():
+    for template in prompt._COMPILED_TEMPLATES:
+        fields = {field for _, field, _, _ in prompt.string.Formatter().parse(template) if field}
+        values = {field: f"<{field}>" for field in fields}
+        assert prompt._render(template, **values) == template.format(**values)
+
+
+def test_split_ctx_templates_render_like_str_format():
+    assert prompt._CTX_TEMPLATE_PARTS
+    for template in prompt._CTX_TEMPLATE_PARTS:
+        assert prompt._render_ctx(template, "<context>", "<question>") == template.format(
+            context="<context>", question="<question>"
+        )
+
+
+def test_format_slots_skips_empty_slots_and_handles_unhashable_values():
+    assert _format_slots({"guests": 4, "dates": None}) == "guests: 4"
+    assert _format_slots({"dates": None}) == "None"
+    assert _format_slots({"cottages": [7, 9]}) == "cottages: [7, 9]"
+
+
+def test_context_prompts_start_with_their_prompt_module():
+    assert generate_ctx_prompt(question="Q", context="C").startswith(PROMPT_MODULES["ctx"])
+    assert generate_intent_ctx_prompt("pricing", question="Q", context="C").startswith(PROMPT_MODULES["pricing"])
+
+
+def test_conversation_prompts_start_with_their_prompt_module():
+    composed = generate_conversation_awareness_prompt(
+        template=REFINED_QUESTION_CONVERSATION_AWARENESS_PROMPT_TEMPLATE, question="Q", chat_history="<history>"
+    )
+    module = PROMPT_MODULES["refined_question_conversation_awareness"]
+    assert composed.startswith(module)
+    assert "<history>" not in module and composed.endswith("Follow Up Question: Q\nStandalone question:\n")
+
+
+def test_guardrail_rules_appear_once_per_composed_prompt():
+    prompts = [
+        generate_ctx_prompt(question="Q", context="C"),
+        generate_refined_ctx_prompt(question="Q", context="C", existing_answer="A"),
+        generate_intent_ctx_prompt("pricing", question="Q", context="C"),
+        generate_conversation_awareness_prompt(
+            template=REFINED_ANSWER_CONVERSATION_AWARENESS_PROMPT_TEMPLATE, question="Q", chat_history="H"
+        ),
+    ]
+    for composed in prompts:
+        for rule in _GUARDRAIL_RULES:
+            assert composed.count(rule) == 1
+
+
+def test_intent_templates_have_their_rule_slots_filled():
+    for template in _INTENT_TEMPLATES.values():
+        for name in [*_RULES, "common_facts"]:
+            assert "{" + name + "}" not in template
+
+
+def test_generate_ctx_prompt_selects_template_by_intent():
+    assert generate_ctx_prompt(question="Q", context="C", intent="Pricing") == generate_intent_ctx_prompt(
+        "pricing", question="Q", context="C"
+    )
+    assert generate_ctx_prompt(question="Q", context="C", intent="unknown") == generate_ctx_prompt(
+        question="Q", context="C"
+    )
+
+
+def test_truncate_caps_text_at_word_boundaries():
+    text = "one two three four five"
+    assert _truncate(text, 100) == text
+    assert _truncate(text, 2) == "one two"
+    assert _truncate(text, 2, keep_end=True) == "five"
+
+
+def test_batch_generate_ctx_prompts_matches_single_prompts():
+    pairs = [("Q1", "C1"), ("Q2", "C2")]
+    for use_simple_prompt in (False, True):
+        assert batch_generate_ctx_prompts(
+            [q for q, _ in pairs], [c for _, c in pairs], use_simple_prompt=use_simple_prompt
+        ) == [generate_ctx_prompt(question=q, context=c, use_simple_prompt=use_simple_prompt) for q, c in pairs]
@@ -0,0 +1,39 @@
+from bot.conversation.chat_history import ChatHistory
+
+
+def test_append_drops_oldest_turn_when_full():
+    chat_history = ChatHistory(total_length=2)
+    for turn in [("q1", "a1"), ("q2", "a2"), ("q3", "a3")]:
+        chat_history.append(turn)
+    assert list(chat_history) == [("q2", "a2"), ("q3", "a3")]
+
+
+def test_unbounded_history_keeps_all_turns():
+    chat_history = ChatHistory([("q1", "a1")])
+    chat_history.append(("q2", "a2"))
+    assert list(chat_history) == [("q1", "a1"), ("q2", "a2")]
+
+
+def test_render_formats_turns_with_newlines():
+    chat_history = ChatHistory([("q1", "a1"), ("q2", "a2")], total_length=2)
+    assert chat_history.render() == "question: q1, answer: a1\nquestion: q2, answer: a2"
+    assert str(chat_history) == chat_history.render()
+
+
+def test_get_last_message_and_question():
+    chat_history = ChatHistory(total_length=2)
+    assert chat_history.get_last_message() is None
+    assert chat_history.get_last_question() is None
+    chat_history.append(("q1", "a1"))
+    assert chat_history.get_last_message() == "question: q1, answer: a1"
+    assert chat_history.get_last_question() == "q1"
+
+
+def test_chat_messages_alternate_user_and_assistant():
+    chat_history = ChatHistory([("q1", "a1"), ("q2", "a2")], total_length=2)
+    assert chat_history.chat_messages() == [
+        {"role": "user", "content": "q1"},
+        {"role": "assistant", "content": "a1"},
+        {"role": "user", "content": "q2"},
+        {"role": "assistant", "content": "a2"},
+    ]
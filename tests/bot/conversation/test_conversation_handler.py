@@ -1,4 +1,14 @@
-from bot.conversation.conversation_handler import extract_content_after_reasoning
+import asyncio
+
+from bot.conversation.chat_history import ChatHistory
+from bot.conversation.conversation_handler import (
+    _has_calculated_context,
+    _iterate_async_streamer,
+    answer_with_context,
+    extract_content_after_reasoning,
+)
+from bot.conversation.ctx_strategy import CreateAndRefineStrategy
+from entities.document import Document
 
 
 def test_extract_content_after_reasoning():
@@ -35,3 +45,38 @@ def test_extract_content_after_reasoning_multiple_tags():
     response = "<reasoning>Some reasoning here.</reasoning> The capital of Italy is Rome. </reasoning> It is a city."
     extracted_content = extract_content_after_reasoning(response, "</reasoning>")
     assert extracted_content.lower() == "the capital of italy is rome. </reasoning> it is a city."
+
+
+def test_has_calculated_context_flags_request_specific_totals():
+    assert _has_calculated_context([Document(page_content="TOTAL COST FOR 3 NIGHTS: PKR 90,000")])
+    assert not _has_calculated_context([Document(page_content="Cottage 9 has 3 bedrooms.")])
+
+
+def test_answer_with_context_sends_earlier_turns_as_chat_messages():
+    class RecordingLlm:
+        def generate_ctx_prompt(self, question, context, use_simple_prompt=False):
+            return f"{context}\n{question}"
+
+        def start_answer_iterator_streamer(self, prompt, max_new_tokens=512, history=()):
+            self.history = history
+            return iter([prompt])
+
+    llm = RecordingLlm()
+    chat_history = ChatHistory([("q1", "a1")], total_length=2)
+    streamer, _ = answer_with_context(
+        llm, CreateAndRefineStrategy(llm), "q2", chat_history, [Document(page_content="ctx")]
+    )
+    assert list(streamer) == ["ctx\nq2"]
+    assert llm.history == chat_history.chat_messages()
+
+
+def test_async_streamer_is_iterated_from_sync_code():
+    async def streamer():
+        yield "a"
+        yield "b"
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert list(_iterate_async_streamer(loop, streamer())) == ["a", "b"]
+    finally:
+        loop.close()
@@ -0,0 +1,25 @@
+from bot.conversation.query_optimizer import expand_query_synonyms, optimize_query_for_rag
+
+
+def test_expand_query_synonyms_appends_missing_domain_terms():
+    assert expand_query_synonyms("is it safe?") == (
+        "is it safe? safety security secure gated community guards guest"
+    )
+    assert expand_query_synonyms("stay 3 nights") == (
+        "stay 3 nights pricing total cost calculation weekday weekend rates"
+    )
+
+
+def test_expand_query_synonyms_defers_unmatched_queries():
+    assert expand_query_synonyms("what are the best things to do nearby in winter") is None
+    # A generic word alone doesn't cover the query's other content words
+    assert expand_query_synonyms("is wifi available?") is None
+    assert expand_query_synonyms("is heating available in winter") is None
+
+
+def test_optimize_query_for_rag_skips_llm_when_rules_match():
+    class FailingLlm:
+        def generate_answer(self, prompt, max_new_tokens=128):
+            raise AssertionError("LLM should not be called")
+
+    assert optimize_query_for_rag(FailingLlm(), "how can I book").startswith("how can I book booking process")
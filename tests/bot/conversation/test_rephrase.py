@@ -0,0 +1,32 @@
+from bot.conversation.rephrase import rephrase_followup
+
+HISTORY = [
+    ("what are the prices?", "Cottages 7, 9 and 11 start at PKR 30,000."),
+    ("tell me about cottage 9", "Cottage 9 has 3 bedrooms."),
+]
+
+
+def test_explicit_cottage_is_kept():
+    assert rephrase_followup("cottage 7 pricing", HISTORY) == "cottage 7 pricing"
+
+
+def test_named_cottage_with_an_unresolved_reference_is_left_to_the_llm():
+    assert rephrase_followup("is cottage 7 bigger than that one?", HISTORY) is None
+    assert rephrase_followup("does cottage 11 have it too?", HISTORY) is None
+    assert rephrase_followup("is that cottage near cottage 7?", HISTORY) is None
+
+
+def test_reference_is_expanded_to_last_mentioned_cottage():
+    assert rephrase_followup("is that one available?", HISTORY) == "is cottage 9 available?"
+    assert rephrase_followup("tell me more about this cottage", HISTORY) == "tell me more about cottage 9"
+
+
+def test_ambiguous_follow_ups_are_left_to_the_llm():
+    assert rephrase_followup("where is it?", HISTORY) is None
+    assert rephrase_followup("and what on weekends?", HISTORY) is None
+    assert rephrase_followup("is this cottage available?", HISTORY[:1]) is None
+    # Dummy "it" and "the one" are not references to the last cottage
+    assert rephrase_followup("is it possible to get a discount?", HISTORY) is None
+    assert rephrase_followup("how much does it cost to hire a cook?", HISTORY) is None
+    assert rephrase_followup("which is the one with a terrace?", HISTORY) is None
+    assert rephrase_followup("how do I book?", HISTORY) is None
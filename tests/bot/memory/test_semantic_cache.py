@@ -0,0 +1,43 @@
+from bot.memory.semantic_cache import SemanticCache
+
+EMBEDDINGS = {
+    "how to book": [1.0, 0.0, 0.0],
+    "how do I book": [0.98, 0.2, 0.0],
+    "cottage 9 pricing": [0.0, 0.0, 1.0],
+    "is cottage 7 available for 4 guests": [0.0, 1.0, 0.0],
+    "is cottage 9 available for 6 guests": [0.0, 0.99, 0.1],
+    "is cottage 7 available for four guests": [0.0, 0.99, 0.1],
+}
+
+
+def test_lookup_returns_answer_of_similar_question_with_same_intent():
+    cache = SemanticCache(EMBEDDINGS.__getitem__, threshold=0.92)
+    cache.store("how to book", "Book on the website.", intent="booking")
+    assert cache.lookup("how do I book", intent="booking") == "Book on the website."
+    assert cache.lookup("how do I book", intent="faq_question") is None
+    assert cache.lookup("cottage 9 pricing", intent="booking") is None
+
+
+def test_lookup_requires_the_same_cottage_and_counts():
+    cache = SemanticCache(EMBEDDINGS.__getitem__, threshold=0.92)
+    cache.store("is cottage 7 available for 4 guests", "Cottage 7 is available.", intent="availability")
+    assert cache.lookup("is cottage 9 available for 6 guests", intent="availability") is None
+    assert cache.lookup("is cottage 7 available for four guests", intent="availability") == "Cottage 7 is available."
+
+
+def test_store_overwrites_oldest_entry_when_full():
+    cache = SemanticCache(EMBEDDINGS.__getitem__, max_entries=1)
+    cache.store("how to book", "Book on the website.")
+    cache.store("cottage 9 pricing", "PKR 30,000 per night.")
+    assert len(cache) == 1
+    assert cache.lookup("how to book") is None
+    assert cache.lookup("cottage 9 pricing") == "PKR 30,000 per night."
+
+
+def test_cache_is_persisted_to_npz(tmp_path):
+    path = tmp_path / "semantic_cache.npz"
+    cache = SemanticCache(EMBEDDINGS.__getitem__, path=path)
+    cache.store("how to book", "Book on the website.", intent="booking")
+    cache.save()
+    reloaded = SemanticCache(EMBEDDINGS.__getitem__, path=path)
+    assert reloaded.lookup("how to book", intent="booking") == "Book on the website."